@@ -0,0 +1,41 @@
+"""Add content_versions table for cross-worker cache coherence
+
+Revision ID: 014_add_content_versions
+Revises: 013_guest_inv_rsvp
+Create Date: 2025-03-01 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "014_add_content_versions"
+down_revision = "013_guest_inv_rsvp"
+branch_labels = None
+depends_on = None
+
+TRACKED_TABLES = [
+    "*",
+    "home_content",
+    "story_sections",
+    "story_images",
+    "wedding_info_sections",
+    "timeline_events",
+    "gallery_images",
+    "gift_items",
+]
+
+
+def upgrade() -> None:
+    content_versions = op.create_table(
+        "content_versions",
+        sa.Column("table_name", sa.String(length=100), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("(CURRENT_TIMESTAMP)"), nullable=True),
+        sa.PrimaryKeyConstraint("table_name"),
+    )
+    op.bulk_insert(content_versions, [{"table_name": name, "version": 0} for name in TRACKED_TABLES])
+
+
+def downgrade() -> None:
+    op.drop_table("content_versions")
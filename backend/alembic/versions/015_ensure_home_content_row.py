@@ -0,0 +1,40 @@
+"""Ensure the home_content singleton row exists
+
+Revision ID: 015_ensure_home_content_row
+Revises: 014_add_content_versions
+Create Date: 2025-03-02 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.models.home_content import HomeContent
+
+
+revision = "015_ensure_home_content_row"
+down_revision = "014_add_content_versions"
+branch_labels = None
+depends_on = None
+
+# Columns of home_content at this revision that have defaults
+COLUMNS = [
+    "hero_text", "subtitle", "text_color", "navbar_color", "navbar_text_color",
+    "logo_text_color", "accent_color", "body_bg_color", "body_heading_color",
+    "body_text_color", "footer_bg_color", "footer_text_color",
+    "card_bg_timeline", "card_bg_info", "card_bg_rsvp",
+]
+
+
+def upgrade() -> None:
+    # The row gets the HomeContent model's defaults; a single INSERT ... SELECT
+    # so the migration also renders with --sql
+    defaults = [sa.literal(HomeContent.__table__.c[name].default.arg).label(name) for name in COLUMNS]
+    home_content = sa.table("home_content", *(sa.column(name) for name in COLUMNS))
+    op.execute(home_content.insert().from_select(
+        COLUMNS,
+        sa.select(*defaults).where(~sa.exists().select_from(home_content)),
+    ))
+
+
+def downgrade() -> None:
+    # The row holds user content; leave it in place
+    pass
@@ -0,0 +1,37 @@
+"""Add uploaded_files index for content-addressed upload deduplication
+
+Revision ID: 016_add_uploaded_files
+Revises: 015_ensure_home_content_row
+Create Date: 2025-03-03 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "016_add_uploaded_files"
+down_revision = "015_ensure_home_content_row"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "uploaded_files",
+        sa.Column("sha256", sa.String(length=64), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("url", sa.String(), nullable=False),
+        sa.Column("content_type", sa.String(length=50), nullable=True),
+        sa.Column("size", sa.Integer(), nullable=True),
+        sa.Column("width", sa.Integer(), nullable=True),
+        sa.Column("height", sa.Integer(), nullable=True),
+        sa.Column("variants", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("(CURRENT_TIMESTAMP)"), nullable=True),
+        sa.PrimaryKeyConstraint("sha256"),
+    )
+    op.create_index("ix_uploaded_files_name", "uploaded_files", ["name"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_uploaded_files_name", table_name="uploaded_files")
+    op.drop_table("uploaded_files")
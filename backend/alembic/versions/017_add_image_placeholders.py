@@ -0,0 +1,31 @@
+"""Add placeholder previews and dominant colours to image records
+
+Revision ID: 017_add_image_placeholders
+Revises: 016_add_uploaded_files
+Create Date: 2025-03-04 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "017_add_image_placeholders"
+down_revision = "016_add_uploaded_files"
+branch_labels = None
+depends_on = None
+
+IMAGE_TABLES = ["gallery_images", "story_images", "timeline_events", "uploaded_files"]
+
+
+def upgrade() -> None:
+    for table in IMAGE_TABLES:
+        op.add_column(table, sa.Column("placeholder", sa.Text(), nullable=True))
+        op.add_column(table, sa.Column("dominant_color", sa.String(length=7), nullable=True))
+    op.add_column("wedding_info_sections", sa.Column("image_placeholders", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("wedding_info_sections", "image_placeholders")
+    for table in reversed(IMAGE_TABLES):
+        op.drop_column(table, "dominant_color")
+        op.drop_column(table, "placeholder")
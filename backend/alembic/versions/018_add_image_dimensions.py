@@ -0,0 +1,35 @@
+"""Add pixel dimensions to image records
+
+Revision ID: 018_add_image_dimensions
+Revises: 017_add_image_placeholders
+Create Date: 2025-03-05 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "018_add_image_dimensions"
+down_revision = "017_add_image_placeholders"
+branch_labels = None
+depends_on = None
+
+IMAGE_TABLES = ["gallery_images", "story_images", "timeline_events"]
+
+
+def upgrade() -> None:
+    for table in IMAGE_TABLES:
+        op.add_column(table, sa.Column("width", sa.Integer(), nullable=True))
+        op.add_column(table, sa.Column("height", sa.Integer(), nullable=True))
+    op.add_column("home_content", sa.Column("hero_image_width", sa.Integer(), nullable=True))
+    op.add_column("home_content", sa.Column("hero_image_height", sa.Integer(), nullable=True))
+    op.add_column("wedding_info_sections", sa.Column("image_sizes", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("wedding_info_sections", "image_sizes")
+    op.drop_column("home_content", "hero_image_height")
+    op.drop_column("home_content", "hero_image_width")
+    for table in reversed(IMAGE_TABLES):
+        op.drop_column(table, "height")
+        op.drop_column(table, "width")
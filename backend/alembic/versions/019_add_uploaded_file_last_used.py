@@ -0,0 +1,23 @@
+"""Record when an indexed upload was last handed out
+
+Revision ID: 019_add_uploaded_file_last_used
+Revises: 018_add_image_dimensions
+Create Date: 2025-03-06 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "019_add_uploaded_file_last_used"
+down_revision = "018_add_image_dimensions"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("uploaded_files", sa.Column("last_used_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("uploaded_files", "last_used_at")
@@ -1,19 +1,34 @@
-"""Azure Blob Storage integration"""
-from azure.storage.blob import BlobServiceClient, BlobClient, ContainerClient, ContentSettings
+"""
+Azure Blob Storage integration.
+
+One BlobServiceClient is kept for the process so its HTTP connection pool is
+reused, and the container is checked (and created if needed) only the first
+time it is used. Public blob URLs are built from a base URL parsed once from
+the connection string.
+"""
+from azure.storage.blob import BlobServiceClient, ContainerClient, ContentSettings
 from app.core.config import settings
-import os
-from typing import Optional
+from datetime import datetime
+from functools import lru_cache
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
 import uuid
 from pathlib import Path
 import sys
 
+_service: Optional[BlobServiceClient] = None
+_container: Optional[ContainerClient] = None
+# (connection string, container) the clients above were built for
+_configured_for: Optional[Tuple[str, str]] = None
+_lock = threading.Lock()
+
 
 def get_blob_service_client() -> Optional[BlobServiceClient]:
     """Get Azure Blob Service Client"""
     if not settings.AZURE_STORAGE_CONNECTION_STRING:
         print("Azure Storage Connection String is not configured.", file=sys.stderr)
         return None
-    
+
     try:
         client = BlobServiceClient.from_connection_string(
             settings.AZURE_STORAGE_CONNECTION_STRING
@@ -28,54 +43,107 @@ def get_blob_service_client() -> Optional[BlobServiceClient]:
 
 
 def get_container_client() -> Optional[ContainerClient]:
-    """Get Azure Container Client"""
+    """The process-wide container client (None if Azure is not configured or reachable)"""
+    global _service, _container, _configured_for
     if not settings.AZURE_STORAGE_CONNECTION_STRING:
         print("Azure Storage Connection String is not configured.", file=sys.stderr)
         return None
-    
+
     if not settings.AZURE_STORAGE_CONTAINER:
         print("Azure Storage Container Name is not configured.", file=sys.stderr)
         return None
-    
-    blob_service = get_blob_service_client()
-    if not blob_service:
-        print("Failed to get blob service client.", file=sys.stderr)
-        return None
-    
-    try:
-        container_client = blob_service.get_container_client(
-            settings.AZURE_STORAGE_CONTAINER
-        )
-        # Create container if it doesn't exist
-        if not container_client.exists():
-            print(f"Creating Azure Blob Storage container: {settings.AZURE_STORAGE_CONTAINER}", file=sys.stdout)
-            container_client.create_container()
-        else:
-            print(f"Azure Blob Storage container '{settings.AZURE_STORAGE_CONTAINER}' already exists.", file=sys.stdout)
-        return container_client
-    except Exception as e:
-        print(f"Error getting container client: {e}", file=sys.stderr)
-        import traceback
-        traceback.print_exc()
-        return None
+
+    key = (settings.AZURE_STORAGE_CONNECTION_STRING, settings.AZURE_STORAGE_CONTAINER)
+    if _configured_for == key and _container is not None:
+        return _container
+
+    with _lock:
+        if _configured_for == key and _container is not None:
+            return _container
+
+        blob_service = get_blob_service_client()
+        if not blob_service:
+            print("Failed to get blob service client.", file=sys.stderr)
+            return None
+
+        try:
+            container_client = blob_service.get_container_client(
+                settings.AZURE_STORAGE_CONTAINER
+            )
+            # Create container if it doesn't exist (once per process)
+            if not container_client.exists():
+                print(f"Creating Azure Blob Storage container: {settings.AZURE_STORAGE_CONTAINER}", file=sys.stdout)
+                container_client.create_container()
+            else:
+                print(f"Azure Blob Storage container '{settings.AZURE_STORAGE_CONTAINER}' already exists.", file=sys.stdout)
+        except Exception as e:
+            print(f"Error getting container client: {e}", file=sys.stderr)
+            import traceback
+            traceback.print_exc()
+            blob_service.close()
+            return None
+
+        if _service is not None:
+            _service.close()
+        _service, _container, _configured_for = blob_service, container_client, key
+        return _container
+
+
+def close() -> None:
+    """Close the process-wide client (app shutdown)"""
+    global _service, _container, _configured_for
+    with _lock:
+        if _service is not None:
+            _service.close()
+        _service, _container, _configured_for = None, None, None
+
+
+def _parse_connection_string(connection_string: str) -> Dict[str, str]:
+    parts = {}
+    for part in connection_string.split(";"):
+        if "=" in part:
+            name, value = part.split("=", 1)
+            parts[name.strip()] = value.strip()
+    return parts
 
 
-def upload_to_blob(file_content: bytes, filename: str, content_type: str = "image/jpeg") -> Optional[str]:
-    """Upload file to Azure Blob Storage and return public URL"""
-    print(f"Attempting to upload {filename} to Azure Blob Storage...", file=sys.stdout)
-    
+@lru_cache(maxsize=8)
+def _container_base_url(connection_string: str, container: str) -> Optional[str]:
+    parts = _parse_connection_string(connection_string)
+    endpoint = parts.get("BlobEndpoint")
+    if not endpoint:
+        account_name = parts.get("AccountName")
+        if not account_name:
+            return None
+        protocol = parts.get("DefaultEndpointsProtocol", "https")
+        suffix = parts.get("EndpointSuffix", "core.windows.net")
+        endpoint = f"{protocol}://{account_name}.blob.{suffix}"
+    return f"{endpoint.rstrip('/')}/{container}"
+
+
+def public_blob_url(blob_name: str) -> Optional[str]:
+    """Public URL of a blob in the configured container (None if Azure is not configured)"""
+    base = _container_base_url(settings.AZURE_STORAGE_CONNECTION_STRING, settings.AZURE_STORAGE_CONTAINER)
+    return f"{base}/{blob_name}" if base else None
+
+
+def upload_to_blob(
+    file_content: bytes,
+    filename: str,
+    content_type: str = "image/jpeg",
+    blob_name: Optional[str] = None,
+) -> Optional[str]:
+    """Upload file to Azure Blob Storage and return public URL (blob_name defaults to a new UUID)"""
     container_client = get_container_client()
     if not container_client:
         print("Container client is None, cannot upload to Azure.", file=sys.stderr)
         return None
-    
+
     try:
         # Generate unique filename
         file_ext = Path(filename).suffix.lower()
-        unique_filename = f"{uuid.uuid4()}{file_ext}"
-        
-        print(f"Uploading blob with name: {unique_filename}, size: {len(file_content)} bytes", file=sys.stdout)
-        
+        unique_filename = blob_name or f"{uuid.uuid4()}{file_ext}"
+
         # Upload blob
         blob_client = container_client.get_blob_client(unique_filename)
         content_settings = ContentSettings(content_type=content_type)
@@ -84,26 +152,9 @@ def upload_to_blob(file_content: bytes, filename: str, content_type: str = "imag
             overwrite=True,
             content_settings=content_settings
         )
-        
-        print(f"Blob uploaded successfully: {unique_filename}", file=sys.stdout)
-        
-        # Return public URL
-        # Extract account name from connection string
-        account_name = None
-        for part in settings.AZURE_STORAGE_CONNECTION_STRING.split(";"):
-            if part.startswith("AccountName="):
-                account_name = part.split("AccountName=")[1]
-                break
-        
-        if account_name:
-            blob_url = f"https://{account_name}.blob.core.windows.net/{settings.AZURE_STORAGE_CONTAINER}/{unique_filename}"
-            print(f"Generated Azure Blob URL: {blob_url}", file=sys.stdout)
-            return blob_url
-        else:
-            # Fallback: try to get from blob_client
-            blob_url = blob_client.url
-            print(f"Using blob_client.url: {blob_url}", file=sys.stdout)
-            return blob_url
+
+        print(f"Blob uploaded successfully: {unique_filename} ({len(file_content)} bytes)", file=sys.stdout)
+        return public_blob_url(unique_filename) or blob_client.url
     except Exception as e:
         print(f"Error uploading to blob: {e}", file=sys.stderr)
         import traceback
@@ -116,12 +167,12 @@ def delete_from_blob(filename: str) -> bool:
     container_client = get_container_client()
     if not container_client:
         return False
-    
+
     try:
         # Extract filename from URL if full URL is provided
-        if "blob.core.windows.net" in filename:
+        if "://" in filename:
             filename = filename.split("/")[-1]
-        
+
         blob_client = container_client.get_blob_client(filename)
         blob_client.delete_blob()
         return True
@@ -129,3 +180,33 @@ def delete_from_blob(filename: str) -> bool:
         print(f"Error deleting from blob: {e}")
         return False
 
+
+# Most blobs one batch request can delete
+DELETE_BATCH_LIMIT = 256
+
+
+def list_blob_pages(page_size: int = 1000) -> Iterator[List[Tuple[str, int, datetime]]]:
+    """The container listing one page (one round trip) at a time, as (name, size, last modified)"""
+    container_client = get_container_client()
+    if not container_client:
+        return
+    for page in container_client.list_blobs(results_per_page=page_size).by_page():
+        yield [(blob.name, blob.size, blob.last_modified) for blob in page]
+
+
+def delete_blobs(names: List[str]) -> int:
+    """Delete blobs with batch requests (one by one where batches fail); returns how many are gone"""
+    container_client = get_container_client()
+    if not container_client:
+        return 0
+
+    deleted = 0
+    for start in range(0, len(names), DELETE_BATCH_LIMIT):
+        chunk = names[start:start + DELETE_BATCH_LIMIT]
+        try:
+            responses = container_client.delete_blobs(*chunk, raise_on_any_failure=False)
+            deleted += sum(1 for response in responses if response.status_code in (200, 202, 404))
+        except Exception as e:
+            print(f"Batch delete failed, deleting one by one: {e}", file=sys.stderr)
+            deleted += sum(1 for name in chunk if delete_from_blob(name))
+    return deleted
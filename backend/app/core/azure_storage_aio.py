@@ -0,0 +1,151 @@
+"""
+Azure Blob Storage integration for async routes.
+
+Uses the aio SDK with one long-lived client per event loop, so uploads and
+deletes never block the loop and connections are reused across requests.
+The container is checked (and created if needed) once, when the client is
+first used.
+"""
+import asyncio
+import base64
+import sys
+import uuid
+from pathlib import Path
+from typing import List, Optional
+from azure.core.exceptions import ResourceNotFoundError
+from azure.storage.blob import BlobBlock, ContentSettings
+from azure.storage.blob.aio import BlobServiceClient, ContainerClient
+from app.core.azure_storage import public_blob_url
+from app.core.config import settings
+
+_service: Optional[BlobServiceClient] = None
+_container: Optional[ContainerClient] = None
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_lock: Optional[asyncio.Lock] = None
+
+
+async def get_container_client() -> Optional[ContainerClient]:
+    """The process-wide container client (None if Azure is not configured or reachable)"""
+    global _service, _container, _loop, _lock
+    if not settings.AZURE_STORAGE_CONNECTION_STRING or not settings.AZURE_STORAGE_CONTAINER:
+        return None
+
+    loop = asyncio.get_running_loop()
+    if _loop is not loop:
+        # aiohttp sessions are bound to the loop that created them
+        _service, _container, _loop, _lock = None, None, loop, asyncio.Lock()
+    if _container is not None:
+        return _container
+
+    async with _lock:
+        if _container is not None:
+            return _container
+        service = None
+        try:
+            service = BlobServiceClient.from_connection_string(settings.AZURE_STORAGE_CONNECTION_STRING)
+            container = service.get_container_client(settings.AZURE_STORAGE_CONTAINER)
+            if not await container.exists():
+                print(f"Creating Azure Blob Storage container: {settings.AZURE_STORAGE_CONTAINER}", file=sys.stdout)
+                await container.create_container()
+            _service, _container = service, container
+            print("Azure Blob Storage async client ready.", file=sys.stdout)
+            return _container
+        except Exception as e:
+            print(f"Error getting async container client: {e}", file=sys.stderr)
+            if service is not None:
+                await service.close()
+            return None
+
+
+async def close() -> None:
+    """Close the long-lived client (app shutdown)"""
+    global _service, _container
+    if _service is not None:
+        await _service.close()
+    _service, _container = None, None
+
+
+async def upload_to_blob(
+    file_content: bytes,
+    filename: str,
+    content_type: str = "image/jpeg",
+    blob_name: Optional[str] = None,
+) -> Optional[str]:
+    """Upload file to Azure Blob Storage and return public URL (blob_name defaults to a new UUID)"""
+    container_client = await get_container_client()
+    if not container_client:
+        return None
+
+    try:
+        unique_filename = blob_name or f"{uuid.uuid4()}{Path(filename).suffix.lower()}"
+        blob_client = container_client.get_blob_client(unique_filename)
+        await blob_client.upload_blob(
+            file_content,
+            overwrite=True,
+            content_settings=ContentSettings(content_type=content_type),
+        )
+        return public_blob_url(unique_filename) or blob_client.url
+    except Exception as e:
+        print(f"Error uploading to blob: {e}", file=sys.stderr)
+        return None
+
+
+class StagedBlobUpload:
+    """A blob uploaded block by block; invisible until commit()"""
+
+    def __init__(self, blob_client, blob_name: str):
+        self.blob_client = blob_client
+        self.blob_name = blob_name
+        self.block_ids: List[str] = []
+
+    async def stage(self, data: bytes) -> None:
+        block_id = base64.b64encode(f"{len(self.block_ids):08d}".encode()).decode()
+        await self.blob_client.stage_block(block_id, data)
+        self.block_ids.append(block_id)
+
+    async def commit(self, content_type: str) -> str:
+        await self.blob_client.commit_block_list(
+            [BlobBlock(block_id=block_id) for block_id in self.block_ids],
+            content_settings=ContentSettings(content_type=content_type),
+        )
+        print(f"Blob uploaded successfully: {self.blob_name} ({len(self.block_ids)} blocks)", file=sys.stdout)
+        return public_blob_url(self.blob_name) or self.blob_client.url
+
+
+async def start_staged_upload(blob_name: str) -> Optional[StagedBlobUpload]:
+    """Begin a block upload to Azure (None if Azure is not available)"""
+    container_client = await get_container_client()
+    if not container_client:
+        return None
+    return StagedBlobUpload(container_client.get_blob_client(blob_name), blob_name)
+
+
+async def list_blob_names(prefix: str) -> List[str]:
+    """Names of the blobs starting with prefix (empty if Azure is unavailable)"""
+    container_client = await get_container_client()
+    if not container_client:
+        return []
+    try:
+        return [blob.name async for blob in container_client.list_blobs(name_starts_with=prefix)]
+    except Exception as e:
+        print(f"Error listing blobs: {e}", file=sys.stderr)
+        return []
+
+
+async def delete_from_blob(filename: str) -> bool:
+    """Delete file from Azure Blob Storage"""
+    container_client = await get_container_client()
+    if not container_client:
+        return False
+
+    try:
+        # Extract filename from URL if full URL is provided
+        if "://" in filename:
+            filename = filename.split("/")[-1]
+        await container_client.get_blob_client(filename).delete_blob()
+        return True
+    except ResourceNotFoundError:
+        return False
+    except Exception as e:
+        print(f"Error deleting from blob: {e}", file=sys.stderr)
+        return False
@@ -0,0 +1,239 @@
+"""Read-through cache for public content handlers.
+
+Handlers opt in with ``@cached(Model, ...)``, naming the models their output
+depends on. Each decorated handler gets its own bounded cache (LRU by size,
+plus a TTL). SQLAlchemy session hooks record which model classes a
+transaction touched and, once it commits, drop the caches keyed on those
+classes and bump their content versions - so any router that writes through
+a Session invalidates correctly without extra calls. With shared content
+versions enabled, the bump is written inside the committing transaction and
+other workers drop their copies on their next version sync.
+"""
+import functools
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple, Union
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.core import content_versions
+from app.core.config import settings
+
+_MISSING = object()
+_CHANGED_MODELS_KEY = "cache_changed_models"
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after ttl seconds"""
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value, or _MISSING"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return _MISSING
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return _MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, generation: int) -> None:
+        """Store value unless the cache was cleared since generation was read"""
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+_registry_lock = threading.Lock()
+_caches: Dict[str, TTLCache] = {}
+_caches_by_model: Dict[type, List[TTLCache]] = {}
+
+
+def _make_key(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Hashable:
+    # The request's Session is never part of the key
+    positional = tuple(value for value in args if not isinstance(value, Session))
+    named = tuple(sorted(
+        (name, value) for name, value in kwargs.items() if not isinstance(value, Session)
+    ))
+    return positional, named
+
+
+def cached(*models: type, maxsize: Optional[int] = None, ttl: Optional[float] = None) -> Callable:
+    """Cache a read handler's result until one of models changes.
+
+    The handler must return data that is safe to share between requests
+    (schemas or plain values, not ORM instances bound to its session).
+    Async routes call ``await handler.run_async(db, ...)`` with the session
+    from get_public_db: same cache, and on a miss the handler runs without
+    blocking the event loop (on an AsyncSession's connection, or in the
+    threadpool for a Session).
+    """
+    def decorator(func: Callable) -> Callable:
+        cache = TTLCache(
+            f"{func.__module__}.{func.__qualname__}",
+            maxsize if maxsize is not None else settings.CACHE_MAX_ENTRIES,
+            ttl if ttl is not None else settings.CACHE_TTL_SECONDS,
+        )
+        with _registry_lock:
+            _caches[cache.name] = cache
+            for model in models:
+                _caches_by_model.setdefault(model, []).append(cache)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            content_versions.sync()
+            key = _make_key(args, kwargs)
+            value = cache.get(key)
+            if value is _MISSING:
+                generation = cache.generation
+                value = func(*args, **kwargs)
+                cache.set(key, value, generation)
+            return value
+
+        async def run_async(db: Union[AsyncSession, Session], *args, **kwargs):
+            await content_versions.sync_async()
+            key = _make_key(args, kwargs)
+            value = cache.get(key)
+            if value is _MISSING:
+                generation = cache.generation
+                if isinstance(db, AsyncSession):
+                    value = await db.run_sync(lambda session: func(session, *args, **kwargs))
+                else:
+                    value = await run_in_threadpool(func, db, *args, **kwargs)
+                cache.set(key, value, generation)
+            return value
+
+        wrapper.cache = cache
+        wrapper.run_async = run_async
+        return wrapper
+    return decorator
+
+
+def _clear_caches(models: Iterable[type]) -> None:
+    with _registry_lock:
+        targets = {id(c): c for model in models for c in _caches_by_model.get(model, [])}
+    for cache in targets.values():
+        cache.clear()
+
+
+def _tables(models: Iterable[type]) -> List[str]:
+    return [model.__tablename__ for model in models if hasattr(model, "__tablename__")]
+
+
+def invalidate_models(models: Set[type]) -> None:
+    """Drop caches depending on any of models and bump their content versions"""
+    _clear_caches(models)
+    tables = _tables(models)
+    if content_versions.is_shared():
+        # The rows were bumped in the committed transaction; adopt them now
+        if content_versions.tracks(tables):
+            content_versions.sync(force=True)
+    elif tables:
+        content_versions.bump(*tables)
+
+
+def _clear_tables(tables: Set[str]) -> None:
+    """Listener for versions changed by other workers"""
+    with _registry_lock:
+        models = [model for model in _caches_by_model if getattr(model, "__tablename__", None) in tables]
+    _clear_caches(models)
+
+
+content_versions.add_listener(_clear_tables)
+
+
+def tracked_tables() -> List[str]:
+    """Tables that some cached handler depends on"""
+    with _registry_lock:
+        return _tables(_caches_by_model)
+
+
+def stats() -> Dict[str, Dict[str, Any]]:
+    with _registry_lock:
+        caches = list(_caches.values())
+    return {cache.name: cache.stats() for cache in caches}
+
+
+# Session hooks: collect changed model classes per transaction, act on commit
+
+def _changed_models(session: Session) -> Set[type]:
+    return session.info.setdefault(_CHANGED_MODELS_KEY, set())
+
+
+@event.listens_for(Session, "after_flush")
+def _record_flush(session, flush_context):
+    changed = _changed_models(session)
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        changed.add(type(obj))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _record_bulk_statement(orm_execute_state):
+    # query(...).update()/.delete() and bulk insert() bypass the unit of work
+    state = orm_execute_state
+    if (state.is_update or state.is_delete or state.is_insert) and state.bind_mapper is not None:
+        _changed_models(state.session).add(state.bind_mapper.class_)
+
+
+@event.listens_for(Session, "before_commit")
+def _record_versions(session):
+    if not content_versions.is_shared():
+        return
+    session.flush()  # so the commit's own final flush is already recorded
+    changed = session.info.get(_CHANGED_MODELS_KEY)
+    if changed:
+        content_versions.record(session.connection(), _tables(changed))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session):
+    changed = session.info.pop(_CHANGED_MODELS_KEY, None)
+    if changed:
+        invalidate_models(changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop(_CHANGED_MODELS_KEY, None)
@@ -7,6 +7,26 @@ import os
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite:///./wedding.db"
+    # Connection pool per engine (sync and async): kept connections, extra
+    # connections under load, seconds to wait for one, seconds before a
+    # connection is replaced (-1 never)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    # Ping a connection on checkout once it has been idle this long (0 every
+    # checkout, -1 never)
+    DB_POOL_PRE_PING_IDLE_SECONDS: float = 30.0
+    # SQLite file databases: "production" (WAL, synchronous=NORMAL and the
+    # values below on every connection) or "default" (SQLite's own settings)
+    SQLITE_PROFILE: str = "production"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE_KB: int = 20 * 1024
+    # Public GETs and RSVP submission on the asyncio engine: "on" or "off"
+    # (empty: on for PostgreSQL, where asyncpg is used; aiosqlite is slower
+    # than the threadpool)
+    ASYNC_DB_ROUTES: str = ""
     
     # JWT
     JWT_SECRET: str = "your-secret-key-change-in-production"
@@ -26,10 +46,27 @@ class Settings(BaseSettings):
     # Static files
     STATIC_DIR: str = "static/uploads"
     
+    # Upload storage: "local", "azure" or "memory" (empty: azure when a
+    # connection string is set, local otherwise)
+    STORAGE_BACKEND: str = ""
+    
     # Azure Blob Storage
     AZURE_STORAGE_CONNECTION_STRING: str = ""
     AZURE_STORAGE_CONTAINER: str = "biancaswedding"
     
+    # Public content cache (entries per cached handler, seconds before expiry)
+    CACHE_MAX_ENTRIES: int = 128
+    CACHE_TTL_SECONDS: int = 300
+    # How often a worker checks content_versions for edits made by other workers
+    CONTENT_VERSION_POLL_SECONDS: float = 1.0
+    # Processes resizing uploads into responsive variants
+    IMAGE_WORKERS: int = 2
+    MAX_UPLOAD_BYTES: int = 25 * 1024 * 1024
+    # Batch uploads: files per request, whole body, files stored at once
+    MAX_BATCH_FILES: int = 200
+    MAX_BATCH_UPLOAD_BYTES: int = 1024 * 1024 * 1024
+    BATCH_UPLOAD_CONCURRENCY: int = 4
+    
     model_config = {
         "env_file": ".env",
         "case_sensitive": True,
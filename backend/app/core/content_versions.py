@@ -0,0 +1,284 @@
+"""Per-table content versions and conditional GET support.
+
+Versions are bumped for every table a committed transaction touched (see the
+session hooks in ``app.core.cache``). Public GET routes declare
+``conditional_get(...)`` for the tables they read, which sets ETag /
+Last-Modified and answers a matching If-None-Match with a 304 before any
+database work happens.
+
+Once ``start()`` has run, versions live in the ``content_versions`` table so
+every worker agrees on them: the commit hook increments the rows inside the
+committing transaction, and readers ``sync()`` at most once per
+CONTENT_VERSION_POLL_SECONDS by reading the single "*" row, fetching the
+other rows only when it moved. On Postgres a LISTEN/NOTIFY thread triggers
+the next sync immediately, and polling only remains as a backstop. If the
+database cannot be reached at start(), the rows are seeded by the first sync
+that succeeds; until then ETags stay process-local and that sync drops every
+cached entry.
+"""
+import select
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from fastapi import HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select as sa_select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection, Engine
+from app.core.config import settings
+from app.models.content_version import ContentVersion
+
+GLOBAL_ROW = "*"
+NOTIFY_CHANNEL = "content_versions"
+LISTEN_BACKSTOP_SECONDS = 30.0
+
+_lock = threading.Lock()
+_versions: Dict[str, int] = {}
+_modified: Dict[str, datetime] = {}
+_listeners: List[Callable[[Set[str]], None]] = []
+
+# Process-local versions restart at 0, so their ETags carry a per-process token
+_boot_id = uuid.uuid4().hex[:8]
+_etag_prefix = _boot_id
+_started_at = datetime.now(timezone.utc).replace(microsecond=0)
+
+# Shared (database-backed) mode, enabled by start()
+_engine: Optional[Engine] = None
+_tracked: Set[str] = set()
+_global_version: Optional[int] = None
+_seeded = False
+_next_sync_at = 0.0
+_sync_lock = threading.Lock()
+_listening = False
+_stop_listener = threading.Event()
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc).replace(microsecond=0)
+
+
+def add_listener(callback: Callable[[Set[str]], None]) -> None:
+    """Call callback(tables) when sync() sees tables changed by another worker"""
+    _listeners.append(callback)
+
+
+def is_shared() -> bool:
+    return _engine is not None
+
+
+def bump(*tables: str) -> None:
+    """Record locally that the given tables changed (process-local mode)"""
+    now = _now()
+    with _lock:
+        for table in tables:
+            _versions[table] = _versions.get(table, 0) + 1
+            _modified[table] = now
+
+
+def record(connection: Connection, tables: Iterable[str]) -> None:
+    """Increment the shared version rows inside the caller's transaction"""
+    if _engine is None:
+        return
+    names = sorted(set(tables) & _tracked)
+    if not names:
+        return
+    if not _seeded:
+        # start() could not seed the rows yet; without them this commit would go unseen
+        _seed_missing(connection)
+    connection.execute(
+        update(ContentVersion.__table__)
+        .where(ContentVersion.table_name.in_([GLOBAL_ROW, *names]))
+        .values(version=ContentVersion.version + 1, updated_at=_now())
+    )
+    if connection.dialect.name == "postgresql":
+        # Delivered to listeners only when the transaction commits
+        # Bound through SQLAlchemy so the paramstyle suits psycopg2 and asyncpg alike
+        connection.execute(text("SELECT pg_notify(:channel, '')"), {"channel": NOTIFY_CHANNEL})
+
+
+def tracks(tables: Iterable[str]) -> bool:
+    """Whether any of tables has a shared version row"""
+    return bool(_tracked & set(tables))
+
+
+def sync_due() -> bool:
+    """Whether sync() would read the database now (for async callers)"""
+    return _engine is not None and time.monotonic() >= _next_sync_at
+
+
+async def sync_async() -> None:
+    """sync() for the event loop: the database is only read, off the loop, when a sync is due"""
+    if sync_due():
+        await run_in_threadpool(sync)
+
+
+def sync(force: bool = False) -> None:
+    """Pick up versions written by other workers (rate-limited unless force)"""
+    global _global_version, _next_sync_at, _seeded, _etag_prefix
+    if _engine is None:
+        return
+    if not force and time.monotonic() < _next_sync_at:
+        return
+    if not _sync_lock.acquire(blocking=force):
+        return  # another thread is already syncing
+    try:
+        interval = LISTEN_BACKSTOP_SECONDS if _listening else settings.CONTENT_VERSION_POLL_SECONDS
+        _next_sync_at = time.monotonic() + interval
+        if not _seeded:
+            with _engine.begin() as conn:
+                _seed_missing(conn)
+            _seeded = True
+        with _engine.connect() as conn:
+            global_version = conn.execute(
+                sa_select(ContentVersion.version).where(ContentVersion.table_name == GLOBAL_ROW)
+            ).scalar()
+            if global_version == _global_version:
+                return
+            rows = conn.execute(
+                sa_select(ContentVersion.table_name, ContentVersion.version, ContentVersion.updated_at)
+                .where(ContentVersion.table_name != GLOBAL_ROW)
+            ).all()
+        with _lock:
+            if _global_version is None:
+                # First sync since start(): nothing cached before it can be trusted
+                changed = {name for name, _, _ in rows}
+            else:
+                changed = {name for name, version, _ in rows if _versions.get(name) != version}
+        # Drop stale cached data before publishing the versions used in ETags,
+        # so a new ETag is never paired with old content
+        if changed:
+            for callback in _listeners:
+                callback(changed)
+        with _lock:
+            for name, version, updated_at in rows:
+                _versions[name] = version
+                if updated_at is not None:
+                    if updated_at.tzinfo is None:
+                        updated_at = updated_at.replace(tzinfo=timezone.utc)
+                    _modified[name] = updated_at.replace(microsecond=0)
+        _global_version = global_version
+        _etag_prefix = "v"
+    except Exception as e:
+        print(f"Warning: content version sync failed: {e}", file=sys.stderr)
+    finally:
+        _sync_lock.release()
+
+
+def _seed(conn: Connection, names: List[str]) -> None:
+    """Insert version rows that do not exist yet, leaving rows another worker just inserted alone"""
+    rows = [{"table_name": name, "version": 0} for name in names]
+    if conn.dialect.name == "postgresql":
+        insert = postgresql.insert(ContentVersion.__table__)
+    elif conn.dialect.name == "sqlite":
+        insert = sqlite.insert(ContentVersion.__table__)
+    else:
+        conn.execute(ContentVersion.__table__.insert(), rows)
+        return
+    conn.execute(insert.on_conflict_do_nothing(index_elements=["table_name"]), rows)
+
+
+def _seed_missing(conn: Connection) -> None:
+    existing = set(conn.execute(sa_select(ContentVersion.table_name)).scalars())
+    missing = sorted(({GLOBAL_ROW} | _tracked) - existing)
+    if missing:
+        # Workers booting together all see the rows missing and seed them at once
+        _seed(conn, missing)
+
+
+def start(engine: Engine, tables: Iterable[str]) -> None:
+    """Switch to shared versions stored in the content_versions table (never raises:
+    a failed first sync is retried by the next one)"""
+    global _engine, _tracked, _global_version, _next_sync_at, _seeded
+    _engine = engine
+    _tracked = set(tables)
+    _seeded = False
+    _global_version = None
+    _next_sync_at = 0.0
+    sync(force=True)
+    if engine.dialect.name == "postgresql":
+        _stop_listener.clear()
+        threading.Thread(target=_listen, name="content-versions-listener", daemon=True).start()
+
+
+def stop() -> None:
+    """Return to process-local versions (used by tests)"""
+    global _engine, _tracked, _etag_prefix, _global_version, _seeded
+    _stop_listener.set()
+    _engine = None
+    _tracked = set()
+    _seeded = False
+    _etag_prefix = _boot_id
+    _global_version = None
+
+
+def _listen() -> None:
+    """Postgres LISTEN loop: schedule an immediate sync on every notification"""
+    global _listening, _next_sync_at
+    while not _stop_listener.is_set() and _engine is not None:
+        raw = None
+        try:
+            raw = _engine.raw_connection()
+            conn = raw.driver_connection
+            conn.autocommit = True
+            conn.cursor().execute(f"LISTEN {NOTIFY_CHANNEL}")
+            _listening = True
+            while not _stop_listener.is_set():
+                if select.select([conn], [], [], 5.0) == ([], [], []):
+                    continue
+                conn.poll()
+                if conn.notifies:
+                    conn.notifies.clear()
+                    _next_sync_at = 0.0
+        except Exception as e:
+            print(f"Warning: content version listener error: {e}", file=sys.stderr)
+            _stop_listener.wait(5.0)
+        finally:
+            _listening = False
+            if raw is not None:
+                try:
+                    raw.invalidate()
+                except Exception:
+                    pass
+
+
+def current(*tables: str) -> Tuple[int, ...]:
+    with _lock:
+        return tuple(_versions.get(table, 0) for table in tables)
+
+
+def etag(*tables: str) -> str:
+    """Strong ETag for the current contents of the given tables"""
+    return '"%s-%s"' % (_etag_prefix, ".".join(str(v) for v in current(*tables)))
+
+
+def last_modified(*tables: str) -> datetime:
+    with _lock:
+        return max((_modified.get(table, _started_at) for table in tables), default=_started_at)
+
+
+def etag_matches(if_none_match: Optional[str], tag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return tag in (candidate.strip() for candidate in if_none_match.split(","))
+
+
+def conditional_get(*tables: str):
+    """Dependency factory for public GET routes reading the given tables"""
+    async def dependency(request: Request, response: Response) -> None:
+        await sync_async()
+        tag = etag(*tables)
+        headers = {
+            "ETag": tag,
+            "Last-Modified": format_datetime(last_modified(*tables), usegmt=True),
+            "Cache-Control": "no-cache",
+        }
+        if etag_matches(request.headers.get("if-none-match"), tag):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+    return dependency
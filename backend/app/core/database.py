@@ -1,7 +1,12 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
+from app.core import db_pool, sqlite_profile
 from app.core.config import settings
+from typing import Any, AsyncIterator, Callable, Optional, Union
 import sys
 
 Base = declarative_base()
@@ -15,9 +20,11 @@ try:
     engine = create_engine(
         settings.DATABASE_URL,
         connect_args=connect_args,
-        pool_pre_ping=True,  # Verifica conexão antes de usar
-        echo=False
+        echo=False,
+        **db_pool.engine_options(settings.DATABASE_URL),
     )
+    db_pool.instrument(engine, "sync")
+    sqlite_profile.apply(engine)
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 except Exception as e:
     print(f"Error creating database engine: {e}", file=sys.stderr)
@@ -26,6 +33,55 @@ except Exception as e:
     SessionLocal = None
 
 
+def async_database_url(url: str) -> Optional[str]:
+    """The same database with an asyncio driver (asyncpg / aiosqlite), or None if there is none"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend in ("postgresql", "postgres"):
+        query = dict(parsed.query)
+        # asyncpg takes ssl=..., not libpq's sslmode=...
+        if "sslmode" in query:
+            query["ssl"] = query.pop("sslmode")
+        parsed = parsed.set(drivername="postgresql+asyncpg", query=query)
+    elif backend == "sqlite":
+        parsed = parsed.set(drivername="sqlite+aiosqlite")
+    else:
+        return None
+    return parsed.render_as_string(hide_password=False)
+
+
+def async_routes_enabled(url: str) -> bool:
+    """Whether the public routes use the asyncio engine (ASYNC_DB_ROUTES, or only with asyncpg)"""
+    choice = settings.ASYNC_DB_ROUTES.strip().lower()
+    if choice:
+        if choice not in ("on", "off"):
+            raise ValueError(f"ASYNC_DB_ROUTES must be on or off, not {settings.ASYNC_DB_ROUTES}")
+        return choice == "on"
+    async_url = async_database_url(url)
+    # aiosqlite runs each statement on a helper thread, which costs more than
+    # the threadpool it would save
+    return async_url is not None and make_url(async_url).drivername == "postgresql+asyncpg"
+
+
+# Async engine for routes that await the database instead of holding a
+# threadpool thread for the round trip
+async_engine = None
+AsyncSessionLocal = None
+try:
+    if async_routes_enabled(settings.DATABASE_URL):
+        async_url = async_database_url(settings.DATABASE_URL)
+        if async_url is None:
+            raise ValueError("no asyncio driver for this database")
+        async_engine = create_async_engine(async_url, echo=False, **db_pool.engine_options(async_url, is_async=True))
+        db_pool.instrument(async_engine.sync_engine, "async")
+        sqlite_profile.apply(async_engine.sync_engine)
+        AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+except Exception as e:
+    print(f"Error creating async database engine, public routes use the threadpool: {e}", file=sys.stderr)
+    async_engine = None
+    AsyncSessionLocal = None
+
+
 def get_db():
     if SessionLocal is None:
         raise Exception("Database not initialized")
@@ -35,3 +91,22 @@ def get_db():
     finally:
         db.close()
 
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    if AsyncSessionLocal is None:
+        raise Exception("Database not initialized")
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Session of the public GETs and RSVP submission: an AsyncSession when the
+# async engine is in use, a Session otherwise
+PublicSession = Union[AsyncSession, Session]
+get_public_db = get_async_db if AsyncSessionLocal is not None else get_db
+
+
+async def run_sync(db: PublicSession, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """fn(session, *args, **kwargs) without blocking the event loop, on either kind of public session"""
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
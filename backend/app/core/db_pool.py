@@ -0,0 +1,199 @@
+"""
+Connection pool policy and metrics for the database engines.
+
+engine_options() turns the DB_POOL_* settings into create_engine /
+create_async_engine arguments. Both engines get a QueuePool (in-memory
+SQLite keeps SQLAlchemy's single-connection pools), and neither uses
+pool_pre_ping: instrument() pings a connection on checkout only when it
+has sat idle in the pool for DB_POOL_PRE_PING_IDLE_SECONDS, so busy
+connections skip the extra round trip.
+
+instrument() also feeds PoolMetrics from the pool: how long checkouts
+waited (histogram), connections in use and in overflow, pool timeouts and
+invalidations. stats() is served at /debug/pool.
+"""
+import threading
+import time
+from typing import Any, Dict, Optional, Type
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+from app.core.config import settings
+
+# Checkout wait histogram bucket bounds, in milliseconds
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_CHECKED_IN_AT = "pool_checked_in_at"
+
+
+class PoolMetrics:
+    """Counters for one engine's pool (updated from any thread)"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.engine: Optional[Engine] = None
+        self.checkouts = 0
+        self.connects = 0
+        self.timeouts = 0
+        self.invalidations = 0
+        self.pre_pings = 0
+        self.pre_ping_failures = 0
+        self.peak_in_use = 0
+        self.peak_overflow = 0
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self.wait_count = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def observe_wait(self, seconds: float, in_use: int, overflow: int) -> None:
+        ms = seconds * 1000
+        index = next((i for i, bound in enumerate(WAIT_BUCKETS_MS) if ms <= bound), len(WAIT_BUCKETS_MS))
+        with self._lock:
+            self.wait_buckets[index] += 1
+            self.wait_count += 1
+            self.wait_total_ms += ms
+            self.wait_max_ms = max(self.wait_max_ms, ms)
+            self.peak_in_use = max(self.peak_in_use, in_use)
+            self.peak_overflow = max(self.peak_overflow, overflow)
+
+    def count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def stats(self) -> Dict[str, Any]:
+        pool = self.engine.pool if self.engine is not None else None
+        with self._lock:
+            result: Dict[str, Any] = {
+                "pool": type(pool).__name__ if pool is not None else None,
+                "checkouts": self.checkouts,
+                "connects": self.connects,
+                "timeouts": self.timeouts,
+                "invalidations": self.invalidations,
+                "pre_pings": self.pre_pings,
+                "pre_ping_failures": self.pre_ping_failures,
+            }
+            if isinstance(pool, QueuePool):
+                size = pool.size()
+                in_use = pool.checkedout()
+                bounds = [str(bound) for bound in WAIT_BUCKETS_MS] + ["+Inf"]
+                result.update({
+                    "size": size,
+                    "max_overflow": pool._max_overflow,
+                    "in_use": in_use,
+                    "overflow": max(in_use - size, 0),
+                    "peak_in_use": self.peak_in_use,
+                    "peak_overflow": self.peak_overflow,
+                    "wait_ms": {
+                        "count": self.wait_count,
+                        "mean": round(self.wait_total_ms / self.wait_count, 3) if self.wait_count else 0.0,
+                        "max": round(self.wait_max_ms, 3),
+                        "buckets": dict(zip(bounds, self.wait_buckets)),
+                    },
+                })
+            return result
+
+
+class _TimedCheckout:
+    """QueuePool mixin timing how long each checkout waits for a connection"""
+
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.count("timeouts")
+            raise
+        if self.metrics is not None:
+            in_use = self.checkedout()
+            self.metrics.observe_wait(time.perf_counter() - start, in_use, max(in_use - self.size(), 0))
+        return record
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep reporting into the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+_metrics: Dict[str, PoolMetrics] = {}
+
+
+def _pool_class(url: str, is_async: bool) -> Optional[Type[Pool]]:
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return None
+    return InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool
+
+
+def engine_options(url: str, is_async: bool = False) -> Dict[str, Any]:
+    """Pool arguments for an engine on url, from the DB_POOL_* settings"""
+    options: Dict[str, Any] = {"pool_pre_ping": False}
+    poolclass = _pool_class(url, is_async)
+    if poolclass is not None:
+        options.update(
+            poolclass=poolclass,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    return options
+
+
+def instrument(engine: Engine, name: str, pre_ping_idle: Optional[float] = None) -> PoolMetrics:
+    """Collect metrics for engine's pool and ping connections that sat idle (sync Engine; use .sync_engine)"""
+    if pre_ping_idle is None:
+        pre_ping_idle = settings.DB_POOL_PRE_PING_IDLE_SECONDS
+    metrics = PoolMetrics(name)
+    metrics.engine = engine
+    if isinstance(engine.pool, _TimedCheckout):
+        engine.pool.metrics = metrics
+    dialect = engine.dialect
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.count("connects")
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.count("checkouts")
+        checked_in_at = connection_record.info.get(_CHECKED_IN_AT)
+        if pre_ping_idle < 0 or checked_in_at is None:
+            return
+        if time.monotonic() - checked_in_at < pre_ping_idle:
+            return
+        metrics.count("pre_pings")
+        try:
+            dialect.do_ping(dbapi_connection)
+        except Exception:
+            metrics.count("pre_ping_failures")
+            # The pool invalidates this connection and retries with a new one
+            raise exc.DisconnectionError("connection failed its idle pre-ping")
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        if dbapi_connection is not None:
+            connection_record.info[_CHECKED_IN_AT] = time.monotonic()
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.count("invalidations")
+
+    _metrics[name] = metrics
+    return metrics
+
+
+def stats() -> Dict[str, Dict[str, Any]]:
+    return {name: metrics.stats() for name, metrics in list(_metrics.items())}
@@ -0,0 +1,11 @@
+"""Responses for payloads that were serialized ahead of time"""
+from fastapi import Response
+
+
+def json_bytes_response(body: bytes, response: Response) -> Response:
+    """Serve pre-serialized JSON as-is.
+
+    FastAPI does not merge headers set on the dependency-injected ``response``
+    into a Response returned by the handler, so carry them over (ETag etc.).
+    """
+    return Response(content=body, media_type="application/json", headers=dict(response.headers))
@@ -0,0 +1,63 @@
+"""
+Pragmas for serving the site from a SQLite file.
+
+With SQLITE_PROFILE=production (the default), every new connection to a
+SQLite file database runs:
+
+- busy_timeout: a writer waits this long for the lock instead of failing
+  with "database is locked"
+- journal_mode=WAL: readers keep reading while a write commits, and the
+  writer no longer waits for readers to finish
+- synchronous=NORMAL: fsync at checkpoints rather than on every commit (in
+  WAL mode a power cut can lose the last commits but not corrupt the file)
+- mmap_size and cache_size: read pages through a memory map and keep more
+  of them cached per connection
+
+SQLITE_PROFILE=default leaves SQLite's own settings. WAL is stored in the
+database file, so a file once opened with the production profile stays in
+WAL mode until it is switched back with PRAGMA journal_mode=DELETE.
+"""
+from typing import Any, List, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+
+PROFILES = ("production", "default")
+
+
+def pragmas() -> List[Tuple[str, Any]]:
+    """(name, value) pairs the configured profile sets on each connection"""
+    profile = settings.SQLITE_PROFILE.strip().lower()
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown SQLite profile: {settings.SQLITE_PROFILE}")
+    if profile == "default":
+        return []
+    return [
+        # First, so that switching to WAL already waits for the lock
+        ("busy_timeout", settings.SQLITE_BUSY_TIMEOUT_MS),
+        ("journal_mode", "WAL"),
+        ("synchronous", "NORMAL"),
+        ("mmap_size", settings.SQLITE_MMAP_SIZE),
+        # Negative: KiB instead of pages
+        ("cache_size", -settings.SQLITE_CACHE_SIZE_KB),
+    ]
+
+
+def apply(engine: Engine) -> bool:
+    """Run the profile's pragmas on every new connection of a SQLite file engine (sync Engine; use .sync_engine)"""
+    if engine.dialect.name != "sqlite" or engine.url.database in (None, "", ":memory:"):
+        return False
+    statements = [f"PRAGMA {name}={value}" for name, value in pragmas()]
+    if not statements:
+        return False
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+    return True
@@ -0,0 +1,256 @@
+"""Static file serving with cache headers suited to content-hashed names"""
+import anyio
+import gzip
+import mimetypes
+import os
+import re
+import sys
+from email.utils import formatdate
+from hashlib import md5
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse
+from starlette.types import Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+# Vite assets (index-BxK3v9aZ.js) and frozen content (site.3f9a0c1b2d4e.json)
+HASHED_NAME = re.compile(r"[.-][A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$")
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# Content-Encoding -> sibling suffix, in order of preference
+ENCODINGS = {"br": ".br", "gzip": ".gz"}
+COMPRESSIBLE = {".js", ".mjs", ".css", ".html", ".json", ".map", ".svg", ".txt", ".xml", ".ico", ".wasm"}
+MIN_COMPRESS_SIZE = 1024
+
+
+def compress(data: bytes) -> Dict[str, bytes]:
+    """Compress data with every available encoding, keeping only those that help"""
+    encoded = {}
+    if brotli is not None:
+        encoded["br"] = brotli.compress(data, quality=11)
+    encoded["gzip"] = gzip.compress(data, compresslevel=9, mtime=0)
+    return {enc: body for enc, body in encoded.items() if len(body) < len(data)}
+
+
+def write_compressed_siblings(path: Path) -> None:
+    """Write .br/.gz next to path (build-time precompression)"""
+    if path.suffix not in COMPRESSIBLE:
+        return
+    data = path.read_bytes()
+    if len(data) < MIN_COMPRESS_SIZE:
+        return
+    for encoding, body in compress(data).items():
+        sibling = path.with_name(path.name + ENCODINGS[encoding])
+        tmp_path = sibling.with_name(sibling.name + ".tmp")
+        tmp_path.write_bytes(body)
+        tmp_path.replace(sibling)
+
+
+def _accepted_encodings(accept_encoding: str) -> set:
+    accepted = set()
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        if token:
+            accepted.add(token)
+    return accepted
+
+
+def byte_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    (first, last) byte of a single-range Range header, or None to send the
+    whole file (no header, another unit, several ranges or a malformed one).
+    Raises ValueError when the range lies outside the file.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = (part.strip() for part in spec.partition("-"))
+    if not sep or not (first + last).isdigit():
+        return None
+    if not first:
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            raise ValueError("empty suffix range")
+        return max(size - suffix, 0), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise ValueError("range starts past the end of the file")
+    return start, min(int(last), size - 1) if last else size - 1
+
+
+class RangeFileResponse(FileResponse):
+    """
+    FileResponse that answers single byte-range requests (206, honouring
+    If-Range) and hands the file to the server to send when it offers the
+    ASGI zero-copy (sendfile) or pathsend extension, instead of reading it
+    through Python in chunks.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self.stat_result is None:
+            self.stat_result = await anyio.to_thread.run_sync(os.stat, self.path)
+            self.set_stat_headers(self.stat_result)
+        size = self.stat_result.st_size
+        request_headers = Headers(scope=scope)
+        self.headers["accept-ranges"] = "bytes"
+
+        start, end = 0, size - 1
+        range_header = request_headers.get("range")
+        if range_header and self.status_code == 200 and self._if_range_matches(request_headers.get("if-range")):
+            try:
+                span = byte_range(range_header, size)
+            except ValueError:
+                await self._send_unsatisfiable(send, size)
+                return
+            if span is not None:
+                start, end = span
+                self.status_code = 206
+                self.headers["content-range"] = f"bytes {start}-{end}/{size}"
+                self.headers["content-length"] = str(end - start + 1)
+
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if scope["method"].upper() == "HEAD" or size == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        else:
+            await self._send_file(scope, send, start, end - start + 1, size)
+        if self.background is not None:
+            await self.background()
+
+    def _if_range_matches(self, if_range: Optional[str]) -> bool:
+        return if_range is None or if_range.strip() in (self.headers.get("etag"), self.headers.get("last-modified"))
+
+    async def _send_unsatisfiable(self, send: Send, size: int) -> None:
+        response = Response(status_code=416, headers={"Content-Range": f"bytes */{size}", "Accept-Ranges": "bytes"})
+        await send({"type": "http.response.start", "status": 416, "headers": response.raw_headers})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    async def _send_file(self, scope: Scope, send: Send, offset: int, count: int, size: int) -> None:
+        extensions = scope.get("extensions") or {}
+        if "http.response.zerocopysend" in extensions:
+            with open(self.path, "rb") as file:
+                await send({"type": "http.response.zerocopysend", "file": file, "offset": offset, "count": count})
+            return
+        if "http.response.pathsend" in extensions and count == size:
+            await send({"type": "http.response.pathsend", "path": os.fspath(self.path)})
+            return
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(offset)
+            remaining = count
+            while remaining:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining:
+                # File shrank while being sent
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles that marks hashed files immutable and revalidates the rest.
+
+    Serves a .br/.gz sibling when one exists and the client accepts it. With
+    precompress=True, compressible files without siblings are compressed once
+    (at startup for everything already in the directory) and kept in memory.
+    """
+
+    def __init__(self, *args, precompress: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.precompress = precompress
+        # full_path -> (mtime, {encoding: sibling path or compressed bytes})
+        self._variants: Dict[str, Tuple[float, Dict[str, Union[str, bytes]]]] = {}
+        if precompress and self.directory is not None and os.path.isdir(self.directory):
+            self._warm()
+
+    def _warm(self) -> None:
+        count = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                full_path = os.path.join(root, name)
+                if not name.endswith(tuple(ENCODINGS.values())):
+                    count += bool(self.variants(full_path, os.stat(full_path)))
+        print(f"Precompressed {count} static files in {self.directory}", file=sys.stdout)
+
+    def variants(self, full_path: str, stat_result: os.stat_result) -> Dict[str, Union[str, bytes]]:
+        cached = self._variants.get(full_path)
+        if cached is not None and cached[0] == stat_result.st_mtime:
+            return cached[1]
+
+        variants: Dict[str, Union[str, bytes]] = {}
+        for encoding, suffix in ENCODINGS.items():
+            if os.path.isfile(full_path + suffix):
+                variants[encoding] = full_path + suffix
+        compressible = (
+            os.path.splitext(full_path)[1] in COMPRESSIBLE
+            and stat_result.st_size >= MIN_COMPRESS_SIZE
+        )
+        if self.precompress and compressible and len(variants) < len(ENCODINGS):
+            with open(full_path, "rb") as f:
+                data = f.read()
+            for encoding, body in compress(data).items():
+                variants.setdefault(encoding, body)
+        self._variants[full_path] = (stat_result.st_mtime, variants)
+        return variants
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        request_headers = Headers(scope=scope)
+        variants = self.variants(str(full_path), stat_result)
+        encoding = self._choose_encoding(request_headers.get("accept-encoding", ""), variants)
+
+        if encoding is None:
+            response = RangeFileResponse(full_path, status_code=status_code, stat_result=stat_result)
+        else:
+            response = self._encoded_response(full_path, stat_result, encoding, variants[encoding], status_code)
+
+        name = os.path.basename(full_path)
+        response.headers["Cache-Control"] = IMMUTABLE if HASHED_NAME.search(name) else REVALIDATE
+        if variants:
+            response.headers["Vary"] = "Accept-Encoding"
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    @staticmethod
+    def _choose_encoding(accept_encoding: str, variants: Dict) -> Optional[str]:
+        if not variants:
+            return None
+        accepted = _accepted_encodings(accept_encoding)
+        for encoding in ENCODINGS:
+            if encoding in variants and encoding in accepted:
+                return encoding
+        return None
+
+    @staticmethod
+    def _encoded_response(full_path, stat_result, encoding, variant, status_code) -> Response:
+        media_type = mimetypes.guess_type(str(full_path))[0] or "text/plain"
+        headers = {"Content-Encoding": encoding}
+        if isinstance(variant, str):
+            return FileResponse(variant, status_code=status_code, media_type=media_type, headers=headers)
+
+        # Same validators as the file itself, tagged with the encoding so
+        # caches never confuse the compressed and identity bodies
+        etag_base = f"{stat_result.st_mtime}-{stat_result.st_size}"
+        etag = md5(etag_base.encode(), usedforsecurity=False).hexdigest()
+        headers["ETag"] = f'"{etag}-{encoding}"'
+        headers["Last-Modified"] = formatdate(stat_result.st_mtime, usegmt=True)
+        return Response(content=variant, status_code=status_code, media_type=media_type, headers=headers)
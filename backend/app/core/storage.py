@@ -0,0 +1,266 @@
+"""
+Where uploaded files are stored.
+
+StorageBackend is what the upload routes and gc_uploads.py talk to; there is
+one for the local upload directory, one for Azure Blob Storage and an
+in-memory one for tests. STORAGE_BACKEND picks it ("local", "azure" or
+"memory"); left empty, Azure is used when a connection string is configured
+and the local directory otherwise. Uploads that a remote backend fails to
+store fall back to the local directory, so deletes look in both.
+
+File names are flat (a UUID stem plus variant suffixes). Upload and delete
+methods are async; the listing and batch delete used by maintenance jobs
+are synchronous, and default to running list_names/delete in a loop of
+their own, so they must be called from a thread with no event loop running
+(a script, or run_in_threadpool from async code).
+"""
+import asyncio
+import os
+from abc import ABC, abstractmethod
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from starlette.concurrency import run_in_threadpool
+from app.core import azure_storage, azure_storage_aio
+from app.core.config import settings
+
+LOCAL_URL_PREFIX = "/static/uploads/"
+
+# (name, size in bytes, last modified as an aware datetime)
+StoredObject = Tuple[str, int, datetime]
+
+
+def _run_sync(coroutine):
+    """Run a backend coroutine from synchronous code, refusing inside a running event loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    coroutine.close()
+    raise RuntimeError("Storage bulk operations are synchronous; call them with run_in_threadpool from async code")
+
+
+class StorageBackend(ABC):
+    name = ""
+    label = ""
+
+    @abstractmethod
+    def url(self, name: str) -> str:
+        ...
+
+    async def begin(self, name: str) -> Optional[Any]:
+        """Start receiving an upload as it arrives (a staged upload), or None if the backend cannot"""
+        return None
+
+    @abstractmethod
+    async def save_part(self, part_path: Path, name: str, content_type: str, staged: Optional[Any] = None) -> Optional[str]:
+        """Store a received upload under name and return its URL (None if it could not be stored)"""
+
+    @abstractmethod
+    async def put(self, name: str, data: bytes, content_type: str) -> Optional[str]:
+        """Store data under name and return its URL (None if it could not be stored)"""
+
+    @abstractmethod
+    async def delete(self, name: str) -> bool:
+        """Delete a file; False if there was none"""
+
+    @abstractmethod
+    async def list_names(self, prefix: str) -> List[str]:
+        ...
+
+    def list_pages(self, page_size: int) -> Iterator[List[StoredObject]]:
+        """
+        Every stored file, page_size at a time (sync-only). This default only
+        has names: sizes are 0 and every file counts as modified now, so
+        age-based cleanup keeps them all until a backend reports real times.
+        """
+        names = sorted(_run_sync(self.list_names("")))
+        now = datetime.now(timezone.utc)
+        for start in range(0, len(names), page_size):
+            yield [(name, 0, now) for name in names[start:start + page_size]]
+
+    def delete_many(self, names: List[str]) -> int:
+        """Delete files in bulk; returns how many are gone (sync-only)"""
+        async def delete_all() -> None:
+            await asyncio.gather(*(self.delete(name) for name in names))
+
+        _run_sync(delete_all())
+        return len(names)
+
+
+class LocalStorage(StorageBackend):
+    """Files in the upload directory, served by the app under /static/uploads"""
+
+    name = "local"
+    label = "local storage"
+
+    def __init__(self, directory: Optional[Path] = None):
+        self._directory = directory
+
+    @property
+    def directory(self) -> Path:
+        return Path(self._directory or settings.STATIC_DIR)
+
+    def url(self, name: str) -> str:
+        return f"{LOCAL_URL_PREFIX}{name}"
+
+    async def save_part(self, part_path: Path, name: str, content_type: str, staged: Optional[Any] = None) -> Optional[str]:
+        await run_in_threadpool(os.replace, part_path, self.directory / name)
+        return self.url(name)
+
+    def _write(self, name: str, data: bytes) -> None:
+        with open(self.directory / name, "wb") as buffer:
+            buffer.write(data)
+
+    async def put(self, name: str, data: bytes, content_type: str) -> Optional[str]:
+        await run_in_threadpool(self._write, name, data)
+        return self.url(name)
+
+    def _unlink(self, name: str) -> bool:
+        if name in ("", ".", ".."):
+            return False
+        try:
+            (self.directory / name).unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+    async def delete(self, name: str) -> bool:
+        return await run_in_threadpool(self._unlink, name)
+
+    def _names(self, prefix: str) -> List[str]:
+        with os.scandir(self.directory) as entries:
+            return [entry.name for entry in entries if entry.name.startswith(prefix) and entry.is_file()]
+
+    async def list_names(self, prefix: str) -> List[str]:
+        return await run_in_threadpool(self._names, prefix)
+
+    def list_pages(self, page_size: int) -> Iterator[List[StoredObject]]:
+        """Dotfiles are skipped apart from the .part files of uploads that never finished"""
+        page: List[StoredObject] = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.startswith(".") and not entry.name.endswith(".part"):
+                    continue
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                stat = entry.stat(follow_symlinks=False)
+                page.append((entry.name, stat.st_size, datetime.fromtimestamp(stat.st_mtime, timezone.utc)))
+                if len(page) >= page_size:
+                    yield page
+                    page = []
+        if page:
+            yield page
+
+    def delete_many(self, names: List[str]) -> int:
+        for name in names:
+            self._unlink(name)
+        return len(names)
+
+
+class AzureStorage(StorageBackend):
+    """Blobs in the configured container; uploads are staged as blocks while they arrive"""
+
+    name = "azure"
+    label = "Azure Blob Storage"
+
+    def url(self, name: str) -> str:
+        return azure_storage.public_blob_url(name)
+
+    async def begin(self, name: str) -> Optional[azure_storage_aio.StagedBlobUpload]:
+        return await azure_storage_aio.start_staged_upload(name)
+
+    async def save_part(self, part_path: Path, name: str, content_type: str, staged: Optional[Any] = None) -> Optional[str]:
+        if staged is None:
+            return None
+        try:
+            return await staged.commit(content_type)
+        except Exception as e:
+            print(f"Error committing blob {name}: {e}", file=sys.stderr)
+            return None
+
+    async def put(self, name: str, data: bytes, content_type: str) -> Optional[str]:
+        return await azure_storage_aio.upload_to_blob(data, name, content_type, blob_name=name)
+
+    async def delete(self, name: str) -> bool:
+        return await azure_storage_aio.delete_from_blob(name)
+
+    async def list_names(self, prefix: str) -> List[str]:
+        return await azure_storage_aio.list_blob_names(prefix)
+
+    def list_pages(self, page_size: int) -> Iterator[List[StoredObject]]:
+        return azure_storage.list_blob_pages(page_size)
+
+    def delete_many(self, names: List[str]) -> int:
+        return azure_storage.delete_blobs(names)
+
+
+class MemoryStorage(StorageBackend):
+    """Files kept in a dict, for tests"""
+
+    name = "memory"
+    label = "memory storage"
+
+    def __init__(self):
+        # name -> (data, content type, stored at)
+        self.files: Dict[str, Tuple[bytes, str, datetime]] = {}
+
+    def url(self, name: str) -> str:
+        return f"memory://{name}"
+
+    async def save_part(self, part_path: Path, name: str, content_type: str, staged: Optional[Any] = None) -> Optional[str]:
+        return await self.put(name, await run_in_threadpool(Path(part_path).read_bytes), content_type)
+
+    async def put(self, name: str, data: bytes, content_type: str) -> Optional[str]:
+        self.files[name] = (bytes(data), content_type, datetime.now(timezone.utc))
+        return self.url(name)
+
+    async def delete(self, name: str) -> bool:
+        return self.files.pop(name, None) is not None
+
+    async def list_names(self, prefix: str) -> List[str]:
+        return [name for name in self.files if name.startswith(prefix)]
+
+    def list_pages(self, page_size: int) -> Iterator[List[StoredObject]]:
+        objects = [(name, len(data), stored_at) for name, (data, _, stored_at) in sorted(self.files.items())]
+        for start in range(0, len(objects), page_size):
+            yield objects[start:start + page_size]
+
+    def delete_many(self, names: List[str]) -> int:
+        for name in names:
+            self.files.pop(name, None)
+        return len(names)
+
+
+BACKENDS = {"local": LocalStorage, "azure": AzureStorage, "memory": MemoryStorage}
+_backends: Dict[str, StorageBackend] = {}
+
+
+def backend_name() -> str:
+    """The configured backend name (STORAGE_BACKEND, or azure/local by connection string)"""
+    name = settings.STORAGE_BACKEND.strip().lower()
+    if name:
+        return name
+    return "azure" if settings.AZURE_STORAGE_CONNECTION_STRING else "local"
+
+
+def get_backend(name: str) -> StorageBackend:
+    """The process-wide instance of a backend"""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown storage backend: {name}")
+    if name not in _backends:
+        _backends[name] = BACKENDS[name]()
+    return _backends[name]
+
+
+def get_storage() -> StorageBackend:
+    """Where new uploads go"""
+    return get_backend(backend_name())
+
+
+def storage_chain() -> List[StorageBackend]:
+    """Where stored uploads may be: the configured backend, then the local fallback"""
+    storage = get_storage()
+    local = get_backend("local")
+    return [storage] if storage is local else [storage, local]
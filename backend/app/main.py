@@ -1,9 +1,7 @@
-from fastapi import FastAPI, Request, HTTPException
+from fastapi import FastAPI, Request, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import HTMLResponse
 from pathlib import Path
-import os
 import sys
 
 # Health check endpoint primeiro (antes de qualquer import que pode falhar)
@@ -84,6 +82,24 @@ def debug_azure():
     except Exception as e:
         return {"error": str(e), "type": type(e).__name__}
 
+@app.get("/debug/cache")
+def debug_cache():
+    """Hit/miss/eviction counters for the public content caches"""
+    try:
+        from app.core import cache
+        return cache.stats()
+    except Exception as e:
+        return {"error": str(e), "type": type(e).__name__}
+
+@app.get("/debug/pool")
+def debug_pool():
+    """Checkout waits, connections in use, timeouts and invalidations per database pool"""
+    try:
+        from app.core import db_pool
+        return db_pool.stats()
+    except Exception as e:
+        return {"error": str(e), "type": type(e).__name__}
+
 # Agora importa o resto
 try:
     from app.core.config import settings
@@ -113,11 +129,13 @@ try:
             allow_headers=["*"],
         )
     
-    # Static files for uploads
+    # Uploads kept in local storage (byte ranges, ETags, sendfile where the server offers it)
     try:
+        from app.core.static_files import CachedStaticFiles
+        from app.core.storage import LOCAL_URL_PREFIX
         static_dir = Path(settings.STATIC_DIR)
         static_dir.mkdir(parents=True, exist_ok=True)
-        app.mount("/static", StaticFiles(directory=static_dir), name="static")
+        app.mount(LOCAL_URL_PREFIX.rstrip("/"), CachedStaticFiles(directory=static_dir), name="static")
     except Exception as e:
         print(f"Warning: Could not mount static files: {e}", file=sys.stderr)
     
@@ -147,6 +165,8 @@ routers_to_load = [
     ('guest_invitations', 'guest_invitations'),
     ('upload', 'upload'),
     ('seed', 'seed'),
+    ('site', 'site'),
+    ('theme', 'theme'),
 ]
 
 for module_name, router_name in routers_to_load:
@@ -167,18 +187,40 @@ for module_name, router_name in routers_to_load:
 try:
     frontend_dist = Path(__file__).parent.parent / "frontend_dist"
     if frontend_dist.exists() and (frontend_dist / "index.html").exists():
+        from app.core.static_files import CachedStaticFiles
+        
+        # Hashed Vite bundles: immutable, served as br/gzip when accepted
         assets_dir = frontend_dist / "assets"
         if assets_dir.exists():
-            app.mount("/assets", StaticFiles(directory=assets_dir), name="assets")
+            app.mount("/assets", CachedStaticFiles(directory=assets_dir, precompress=True), name="assets")
+        
+        # Content exported by freeze.py (may be created after startup)
+        from app.services.static_export import content_files
+        app.mount("/content", content_files(frontend_dist), name="content")
+        
+        # index.html is read once and served with the public content inlined
+        from app.core import content_versions, database
+        from app.services.spa_shell import SpaShell
+        spa_shell = SpaShell(frontend_dist / "index.html")
         
         @app.get("/{full_path:path}")
-        async def serve_frontend(full_path: str, request: Request):
+        def serve_frontend(full_path: str, request: Request):
             if full_path.startswith(("api/", "auth/", "static/", "docs", "openapi.json", "redoc", "health")):
                 raise HTTPException(status_code=404, detail="Not found")
-            index_path = frontend_dist / "index.html"
-            if index_path.exists():
-                return FileResponse(index_path)
-            raise HTTPException(status_code=404, detail="Frontend not found")
+            content_versions.sync()
+            headers = {"ETag": spa_shell.etag(), "Cache-Control": "no-cache"}
+            if content_versions.etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+                return Response(status_code=304, headers=headers)
+            try:
+                db = database.SessionLocal()
+                try:
+                    body = spa_shell.render(db)
+                finally:
+                    db.close()
+            except Exception as e:
+                print(f"Warning: Could not inline site content: {e}", file=sys.stderr)
+                return HTMLResponse(spa_shell.render_plain(), headers={"Cache-Control": "no-cache"})
+            return HTMLResponse(body, headers=headers)
     else:
         @app.get("/")
         def root():
@@ -209,6 +251,31 @@ async def startup_event():
         import traceback
         traceback.print_exc()
     
+    # Guarantee the HomeContent singleton so GET /api/home never has to write
+    try:
+        from app.core.database import SessionLocal
+        from app.services.site_content import ensure_home_content
+        if SessionLocal is not None:
+            db = SessionLocal()
+            try:
+                ensure_home_content(db)
+                db.commit()
+            finally:
+                db.close()
+    except Exception as e:
+        print(f"Warning: Could not ensure home content: {e}", file=sys.stderr)
+    
+    # Keep cached content coherent across workers via the content_versions table
+    # (if the database is unreachable now, the next sync retries)
+    try:
+        from app.core.database import engine
+        from app.core import cache, content_versions
+        if engine is not None:
+            content_versions.start(engine, cache.tracked_tables())
+            print("Content versions shared via database", file=sys.stdout)
+    except Exception as e:
+        print(f"Warning: Could not share content versions via database: {e}", file=sys.stderr)
+    
     # Criar/Atualizar admin user
     try:
         from app.core.database import SessionLocal
@@ -263,3 +330,14 @@ async def startup_event():
     print("Startup completed", file=sys.stdout)
     print("=" * 50, file=sys.stdout)
 
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    from app.core import azure_storage, azure_storage_aio, database
+    from app.services import image_variants
+    image_variants.shutdown()
+    azure_storage.close()
+    await azure_storage_aio.close()
+    if database.async_engine is not None:
+        await database.async_engine.dispose()
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class ContentVersion(Base):
+    __tablename__ = "content_versions"
+
+    table_name = Column(String(100), primary_key=True)  # "*" row is bumped on every tracked change
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -8,6 +8,8 @@ class HomeContent(Base):
     id = Column(Integer, primary_key=True, index=True)
     hero_text = Column(String, default="Bianca & Joel")
     hero_image_url = Column(String, nullable=True)
+    hero_image_width = Column(Integer, nullable=True)  # Filled from the upload index
+    hero_image_height = Column(Integer, nullable=True)
     wedding_date = Column(Date, nullable=True)
     subtitle = Column(String, default="Join us for our special day")
     text_color = Column(String, nullable=True, default="#8B6F6D")  # Hero text / countdown
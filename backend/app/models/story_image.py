@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, ForeignKey
 from app.core.database import Base
 
 
@@ -10,4 +10,8 @@ class StoryImage(Base):
     image_url = Column(String)
     caption = Column(String, nullable=True)
     order = Column(Integer, default=0)
+    placeholder = Column(Text, nullable=True)  # Tiny data: URI preview, filled from the upload index
+    dominant_color = Column(String(7), nullable=True)  # #rrggbb
+    width = Column(Integer, nullable=True)  # Pixel size of the image, filled from the upload index
+    height = Column(Integer, nullable=True)
 
@@ -12,5 +12,9 @@ class TimelineEvent(Base):
     icon = Column(String, nullable=True)
     order = Column(Integer, default=0)
     image_url = Column(String, nullable=True)  # Image for modal
+    placeholder = Column(Text, nullable=True)  # Tiny data: URI preview, filled from the upload index
+    dominant_color = Column(String(7), nullable=True)  # #rrggbb
+    width = Column(Integer, nullable=True)  # Pixel size of the image, filled from the upload index
+    height = Column(Integer, nullable=True)
     additional_info = Column(Text, nullable=True)  # Additional details for modal
 
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class UploadedFile(Base):
+    __tablename__ = "uploaded_files"
+
+    sha256 = Column(String(64), primary_key=True)  # hex digest of the original upload
+    name = Column(String, nullable=False, index=True)  # stored file/blob name
+    url = Column(String, nullable=False)
+    content_type = Column(String(50))
+    size = Column(Integer)
+    width = Column(Integer)
+    height = Column(Integer)
+    variants = Column(Text, nullable=True)  # JSON array of {url, width, height, type}
+    placeholder = Column(Text, nullable=True)
+    dominant_color = Column(String(7), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_used_at = Column(DateTime(timezone=True), nullable=True)  # last handed out by a lookup or recorded
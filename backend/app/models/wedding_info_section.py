@@ -14,5 +14,7 @@ class WeddingInfoSection(Base):
     map_embed_url = Column(String, nullable=True)  # For Google Maps iframe
     image_url = Column(String, nullable=True)  # Legacy single image (kept for backward compat)
     gallery_urls = Column(Text, nullable=True)  # JSON array of image URLs for modal gallery
+    image_placeholders = Column(Text, nullable=True)  # JSON {url: {placeholder, dominant_color}} for image_url and gallery_urls
+    image_sizes = Column(Text, nullable=True)  # JSON {url: [width, height]} for image_url and gallery_urls
     additional_info = Column(Text, nullable=True)  # Additional details for modal
 
@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from typing import List
-from app.core.database import get_db
+from app.core.content_versions import conditional_get
+from app.core.database import PublicSession, get_db, get_public_db
 from app.core.dependencies import get_current_user
+from app.core.responses import json_bytes_response
 from app.models.gallery_image import GalleryImage
 from app.models.admin_user import AdminUser
 from app.schemas.gallery import (
@@ -10,13 +12,19 @@ from app.schemas.gallery import (
     GalleryImageCreate,
     GalleryImageUpdate
 )
+from app.services.reorder import reorder
+from app.services.site_content import gallery_images_json
 
 router = APIRouter(prefix="/api/gallery", tags=["gallery"])
 
 
-@router.get("", response_model=List[GalleryImageSchema])
-def get_gallery_images(db: Session = Depends(get_db)):
-    return db.query(GalleryImage).order_by(GalleryImage.order).all()
+@router.get(
+    "",
+    response_model=List[GalleryImageSchema],
+    dependencies=[Depends(conditional_get(GalleryImage.__tablename__))],
+)
+async def get_gallery_images(response: Response, db: PublicSession = Depends(get_public_db)):
+    return json_bytes_response(await gallery_images_json.run_async(db), response)
 
 
 @router.post("", response_model=GalleryImageSchema)
@@ -38,14 +46,10 @@ def reorder_gallery_images(
     db: Session = Depends(get_db),
     current_user: AdminUser = Depends(get_current_user)
 ):
-    images = db.query(GalleryImage).filter(GalleryImage.id.in_(image_ids)).all()
-    if len(images) != len(image_ids):
+    images = reorder(db, GalleryImage.order, image_ids)
+    if images is None:
         raise HTTPException(status_code=404, detail="Some gallery images not found")
-    for order, image_id in enumerate(image_ids):
-        image = next(img for img in images if img.id == image_id)
-        image.order = order
-    db.commit()
-    return db.query(GalleryImage).order_by(GalleryImage.order).all()
+    return images
 
 
 @router.put("/{image_id}", response_model=GalleryImageSchema)
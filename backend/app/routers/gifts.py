@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from typing import List
-from app.core.database import get_db
+from app.core.content_versions import conditional_get
+from app.core.database import PublicSession, get_db, get_public_db
 from app.core.dependencies import get_current_user
+from app.core.responses import json_bytes_response
 from app.models.gift_item import GiftItem
 from app.models.admin_user import AdminUser
 from app.schemas.gifts import (
@@ -10,13 +12,18 @@ from app.schemas.gifts import (
     GiftItemCreate,
     GiftItemUpdate
 )
+from app.services.site_content import gift_items_json
 
 router = APIRouter(prefix="/api/gifts", tags=["gifts"])
 
 
-@router.get("", response_model=List[GiftItemSchema])
-def get_gift_items(db: Session = Depends(get_db)):
-    return db.query(GiftItem).order_by(GiftItem.order).all()
+@router.get(
+    "",
+    response_model=List[GiftItemSchema],
+    dependencies=[Depends(conditional_get(GiftItem.__tablename__))],
+)
+async def get_gift_items(response: Response, db: PublicSession = Depends(get_public_db)):
+    return json_bytes_response(await gift_items_json.run_async(db), response)
 
 
 @router.post("", response_model=GiftItemSchema)
@@ -1,27 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
+from app.core.content_versions import conditional_get
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
+from app.core.responses import json_bytes_response
 from app.models.home_content import HomeContent
 from app.schemas.home_content import HomeContent as HomeContentSchema, HomeContentUpdate
 from app.models.admin_user import AdminUser
+from app.services import site_content
 
 router = APIRouter(prefix="/api/home", tags=["home"])
 
 
-@router.get("", response_model=HomeContentSchema)
-def get_home_content(db: Session = Depends(get_db)):
-    content = db.query(HomeContent).first()
-    if not content:
-        # Create default content
-        content = HomeContent(
-            hero_text="Bianca & Joel",
-            subtitle="Join us for our special day"
-        )
-        db.add(content)
-        db.commit()
-        db.refresh(content)
-    return content
+@router.get(
+    "",
+    response_model=HomeContentSchema,
+    dependencies=[Depends(conditional_get(HomeContent.__tablename__))],
+)
+async def get_home_content(response: Response):
+    # Read-only: the singleton row is created at startup / by migration 015.
+    # No session here: home_content_json opens one only on a cache miss
+    body = await site_content.home_content_json.run_async(None)
+    if body is None:
+        raise HTTPException(status_code=404, detail="Home content not initialized")
+    return json_bytes_response(body, response)
 
 
 @router.put("", response_model=HomeContentSchema)
@@ -30,14 +32,7 @@ def update_home_content(
     db: Session = Depends(get_db),
     current_user: AdminUser = Depends(get_current_user)
 ):
-    content = db.query(HomeContent).first()
-    if not content:
-        # Create default content with same defaults as get_home_content
-        content = HomeContent(
-            hero_text="Bianca & Joel",
-            subtitle="Join us for our special day"
-        )
-        db.add(content)
+    content = site_content.ensure_home_content(db)
     
     update_data = content_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
@@ -51,18 +46,10 @@ def update_home_content(
 @router.post("/reset-defaults")
 def reset_to_defaults(db: Session = Depends(get_db)):
     """Reset home content to default values (Bianca & Joel)"""
-    content = db.query(HomeContent).first()
-    if content:
-        content.hero_text = "Bianca & Joel"
-        content.subtitle = "Join us for our special day"
-    else:
-        content = HomeContent(
-            hero_text="Bianca & Joel",
-            subtitle="Join us for our special day"
-        )
-        db.add(content)
+    content = site_content.ensure_home_content(db)
+    for field, value in site_content.DEFAULT_HOME_CONTENT.items():
+        setattr(content, field, value)
     
     db.commit()
     db.refresh(content)
     return {"message": "Home content reset to defaults", "content": content}
-
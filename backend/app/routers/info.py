@@ -1,10 +1,12 @@
 import json
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from typing import List
-from app.core.database import get_db
+from app.core.content_versions import conditional_get
+from app.core.database import PublicSession, get_db, get_public_db
 from app.core.dependencies import get_current_user
+from app.core.responses import json_bytes_response
 from app.models.wedding_info_section import WeddingInfoSection
 from app.models.admin_user import AdminUser
 from app.schemas.wedding_info import (
@@ -12,6 +14,8 @@ from app.schemas.wedding_info import (
     WeddingInfoSectionCreate,
     WeddingInfoSectionUpdate
 )
+from app.services.reorder import reorder
+from app.services.site_content import info_sections_json
 
 router = APIRouter(prefix="/api/info", tags=["info"])
 
@@ -23,9 +27,13 @@ def _serialize_gallery_urls(data: dict) -> dict:
     return data
 
 
-@router.get("", response_model=List[WeddingInfoSectionSchema])
-def get_info_sections(db: Session = Depends(get_db)):
-    return db.query(WeddingInfoSection).order_by(WeddingInfoSection.sort_order.asc()).all()
+@router.get(
+    "",
+    response_model=List[WeddingInfoSectionSchema],
+    dependencies=[Depends(conditional_get(WeddingInfoSection.__tablename__))],
+)
+async def get_info_sections(response: Response, db: PublicSession = Depends(get_public_db)):
+    return json_bytes_response(await info_sections_json.run_async(db), response)
 
 
 @router.post("", response_model=WeddingInfoSectionSchema)
@@ -50,14 +58,10 @@ def reorder_info_sections(
     db: Session = Depends(get_db),
     current_user: AdminUser = Depends(get_current_user)
 ):
-    sections = db.query(WeddingInfoSection).filter(WeddingInfoSection.id.in_(section_ids)).all()
-    if len(sections) != len(section_ids):
+    sections = reorder(db, WeddingInfoSection.sort_order, section_ids)
+    if sections is None:
         raise HTTPException(status_code=404, detail="Some info sections not found")
-    for order, section_id in enumerate(section_ids):
-        section = next(s for s in sections if s.id == section_id)
-        section.sort_order = order
-    db.commit()
-    return db.query(WeddingInfoSection).order_by(WeddingInfoSection.sort_order.asc()).all()
+    return sections
 
 
 @router.put("/{section_id}", response_model=WeddingInfoSectionSchema)
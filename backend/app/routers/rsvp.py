@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.core.database import get_db
+from app.core.database import PublicSession, get_db, get_public_db, run_sync
 from app.core.dependencies import get_current_user
 from app.models.rsvp import RSVP
 from app.models.guest_invitation import GuestInvitation
@@ -43,8 +43,7 @@ def _validate_attendance(inv: GuestInvitation, attendance: list) -> None:
             )
 
 
-@router.post("", response_model=RSVPSchema)
-def create_rsvp(rsvp: RSVPCreate, db: Session = Depends(get_db)):
+def _save_rsvp(db: Session, rsvp: RSVPCreate) -> RSVP:
     try:
         rsvp_data = rsvp.model_dump()
 
@@ -58,7 +57,7 @@ def create_rsvp(rsvp: RSVPCreate, db: Session = Depends(get_db)):
         guest_invitation_id = rsvp_data.get("guest_invitation_id")
 
         if guest_invitation_id is not None:
-            inv = db.query(GuestInvitation).filter(GuestInvitation.id == guest_invitation_id).first()
+            inv = db.get(GuestInvitation, guest_invitation_id)
             if not inv:
                 raise HTTPException(status_code=404, detail="Invitation not found")
 
@@ -106,6 +105,11 @@ def create_rsvp(rsvp: RSVPCreate, db: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail=f"Error creating RSVP: {str(e)}")
 
 
+@router.post("", response_model=RSVPSchema)
+async def create_rsvp(rsvp: RSVPCreate, db: PublicSession = Depends(get_public_db)):
+    return await run_sync(db, _save_rsvp, rsvp)
+
+
 @router.get("", response_model=List[RSVPSchema])
 def get_rsvps(
     db: Session = Depends(get_db),
@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Depends, Response
+from app.core.content_versions import conditional_get
+from app.core.database import PublicSession, get_public_db
+from app.core.responses import json_bytes_response
+from app.schemas.site import SiteContent
+from app.services.site_content import PUBLIC_TABLES, site_content_json_async
+
+router = APIRouter(prefix="/api/site", tags=["site"])
+
+
+@router.get("", response_model=SiteContent, dependencies=[Depends(conditional_get(*PUBLIC_TABLES))])
+async def get_site_content(response: Response, db: PublicSession = Depends(get_public_db)):
+    """All public content in one response, served from the in-process cache"""
+    return json_bytes_response(await site_content_json_async(db), response)
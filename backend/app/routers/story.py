@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from typing import List
-from app.core.database import get_db
+from app.core.content_versions import conditional_get
+from app.core.database import PublicSession, get_db, get_public_db
 from app.core.dependencies import get_current_user
+from app.core.responses import json_bytes_response
 from app.models.story_section import StorySection
 from app.models.story_image import StoryImage
 from app.models.admin_user import AdminUser
@@ -14,14 +16,20 @@ from app.schemas.story import (
     StoryImageCreate,
     StoryImageUpdate
 )
+from app.services.reorder import reorder
+from app.services.site_content import story_sections_json, story_images_json
 
 router = APIRouter(prefix="/api/story", tags=["story"])
 
 
 # Story Sections
-@router.get("/sections", response_model=List[StorySectionSchema])
-def get_story_sections(db: Session = Depends(get_db)):
-    return db.query(StorySection).order_by(StorySection.order).all()
+@router.get(
+    "/sections",
+    response_model=List[StorySectionSchema],
+    dependencies=[Depends(conditional_get(StorySection.__tablename__))],
+)
+async def get_story_sections(response: Response, db: PublicSession = Depends(get_public_db)):
+    return json_bytes_response(await story_sections_json.run_async(db), response)
 
 
 @router.post("/sections", response_model=StorySectionSchema)
@@ -43,14 +51,10 @@ def reorder_story_sections(
     db: Session = Depends(get_db),
     current_user: AdminUser = Depends(get_current_user)
 ):
-    sections = db.query(StorySection).filter(StorySection.id.in_(section_ids)).all()
-    if len(sections) != len(section_ids):
+    sections = reorder(db, StorySection.order, section_ids)
+    if sections is None:
         raise HTTPException(status_code=404, detail="Some story sections not found")
-    for order, section_id in enumerate(section_ids):
-        section = next(s for s in sections if s.id == section_id)
-        section.order = order
-    db.commit()
-    return db.query(StorySection).order_by(StorySection.order).all()
+    return sections
 
 
 @router.put("/sections/{section_id}", response_model=StorySectionSchema)
@@ -88,9 +92,14 @@ def delete_story_section(
 
 
 # Story Images
-@router.get("/images", response_model=List[StoryImageSchema])
-def get_story_images(db: Session = Depends(get_db)):
-    return db.query(StoryImage).order_by(StoryImage.order).all()
+@router.get(
+    "/images",
+    response_model=List[StoryImageSchema],
+    # Deleting a section nulls its images' section_id, so images depend on both tables
+    dependencies=[Depends(conditional_get(StoryImage.__tablename__, StorySection.__tablename__))],
+)
+async def get_story_images(response: Response, db: PublicSession = Depends(get_public_db)):
+    return json_bytes_response(await story_images_json.run_async(db), response)
 
 
 @router.post("/images", response_model=StoryImageSchema)
@@ -112,14 +121,10 @@ def reorder_story_images(
     db: Session = Depends(get_db),
     current_user: AdminUser = Depends(get_current_user)
 ):
-    images = db.query(StoryImage).filter(StoryImage.id.in_(image_ids)).all()
-    if len(images) != len(image_ids):
+    images = reorder(db, StoryImage.order, image_ids)
+    if images is None:
         raise HTTPException(status_code=404, detail="Some story images not found")
-    for order, image_id in enumerate(image_ids):
-        image = next(img for img in images if img.id == image_id)
-        image.order = order
-    db.commit()
-    return db.query(StoryImage).order_by(StoryImage.order).all()
+    return images
 
 
 @router.put("/images/{image_id}", response_model=StoryImageSchema)
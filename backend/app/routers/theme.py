@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Request, Response
+from app.core.content_versions import etag_matches
+from app.core.static_files import IMMUTABLE, REVALIDATE
+from app.services.theme import theme_css
+
+router = APIRouter(tags=["theme"])
+
+
+def _stylesheet_response(request: Request, css: bytes, digest: str, immutable: bool) -> Response:
+    headers = {"ETag": f'"{digest}"', "Cache-Control": IMMUTABLE if immutable else REVALIDATE}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=css, media_type="text/css", headers=headers)
+
+
+@router.get("/theme.css")
+def get_theme_css(request: Request):
+    """Theme colours as CSS custom properties (revalidated via ETag)"""
+    css, digest = theme_css()
+    return _stylesheet_response(request, css, digest, immutable=False)
+
+
+@router.get("/theme.{digest}.css")
+def get_hashed_theme_css(digest: str, request: Request):
+    """Content-hash URL used by index.html; cacheable forever"""
+    css, current = theme_css()
+    # A page rendered before a colour change still gets the current colours, just not cached
+    return _stylesheet_response(request, css, current, immutable=digest == current)
@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from typing import List
-from app.core.database import get_db
+from app.core.content_versions import conditional_get
+from app.core.database import PublicSession, get_db, get_public_db
 from app.core.dependencies import get_current_user
+from app.core.responses import json_bytes_response
 from app.models.timeline_event import TimelineEvent
 from app.models.admin_user import AdminUser
 from app.schemas.timeline import (
@@ -10,13 +12,19 @@ from app.schemas.timeline import (
     TimelineEventCreate,
     TimelineEventUpdate
 )
+from app.services.reorder import reorder
+from app.services.site_content import timeline_events_json
 
 router = APIRouter(prefix="/api/timeline", tags=["timeline"])
 
 
-@router.get("", response_model=List[TimelineEventSchema])
-def get_timeline_events(db: Session = Depends(get_db)):
-    return db.query(TimelineEvent).order_by(TimelineEvent.order).all()
+@router.get(
+    "",
+    response_model=List[TimelineEventSchema],
+    dependencies=[Depends(conditional_get(TimelineEvent.__tablename__))],
+)
+async def get_timeline_events(response: Response, db: PublicSession = Depends(get_public_db)):
+    return json_bytes_response(await timeline_events_json.run_async(db), response)
 
 
 @router.post("", response_model=TimelineEventSchema)
@@ -32,6 +40,18 @@ def create_timeline_event(
     return db_event
 
 
+@router.put("/reorder", response_model=List[TimelineEventSchema])
+def reorder_timeline_events(
+    event_ids: List[int],
+    db: Session = Depends(get_db),
+    current_user: AdminUser = Depends(get_current_user)
+):
+    events = reorder(db, TimelineEvent.order, event_ids)
+    if events is None:
+        raise HTTPException(status_code=404, detail="Some events not found")
+    return events
+
+
 @router.put("/{event_id}", response_model=TimelineEventSchema)
 def update_timeline_event(
     event_id: int,
@@ -64,23 +84,3 @@ def delete_timeline_event(
     db.delete(db_event)
     db.commit()
     return {"message": "Timeline event deleted"}
-
-
-@router.put("/reorder", response_model=List[TimelineEventSchema])
-def reorder_timeline_events(
-    event_ids: List[int],
-    db: Session = Depends(get_db),
-    current_user: AdminUser = Depends(get_current_user)
-):
-    events = db.query(TimelineEvent).filter(TimelineEvent.id.in_(event_ids)).all()
-    if len(events) != len(event_ids):
-        raise HTTPException(status_code=404, detail="Some events not found")
-    
-    # Update order based on the provided list
-    for order, event_id in enumerate(event_ids):
-        event = next(e for e in events if e.id == event_id)
-        event.order = order
-    
-    db.commit()
-    return db.query(TimelineEvent).order_by(TimelineEvent.order).all()
-
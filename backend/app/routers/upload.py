@@ -1,73 +1,330 @@
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
-from fastapi.responses import FileResponse
-import os
-import shutil
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+import asyncio
+import re
+import sys
+import uuid
 from pathlib import Path
+from typing import Dict, List, Literal, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
 from app.core.config import settings
+from app.core.database import get_db
 from app.core.dependencies import get_current_user
 from app.models.admin_user import AdminUser
-from app.core.azure_storage import upload_to_blob, delete_from_blob
+from app.models.gallery_image import GalleryImage
+from app.models.story_image import StoryImage
+from app.models.story_section import StorySection
+from app.schemas.gallery import GalleryImage as GalleryImageSchema
+from app.schemas.story import StoryImage as StoryImageSchema
+from app.core import storage
+from app.services import blob_gc, image_variants, upload_index
+from app.services.upload_stream import (
+    KnownUpload, ReceivedImage, UploadRejected, UploadSink, receive_image, stream_images,
+)
 
 router = APIRouter(prefix="/api/upload", tags=["upload"])
 
-# Ensure upload directory exists (fallback for local storage)
+# Part files of uploads being received (and the local storage fallback)
 UPLOAD_DIR = Path(settings.STATIC_DIR)
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
 
-@router.post("")
+UPLOAD_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                    "required": ["file"],
+                }
+            }
+        },
+    }
+}
+
+BATCH_UPLOAD_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {
+                        "files": {"type": "array", "items": {"type": "string", "format": "binary"}},
+                        # Files the server already has (see POST /api/upload/sha256), by digest
+                        "sha256": {"type": "array", "items": {"type": "string"}},
+                    },
+                }
+            }
+        },
+    }
+}
+
+ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
+SHA256_HEX = re.compile(r"^[0-9a-fA-F]{64}$")
+
+
+# Digest -> task storing those bytes, so identical uploads arriving
+# together are stored once
+_publishing: Dict[str, "asyncio.Future[dict]"] = {}
+
+
+async def _publish(sink: UploadSink, received: ReceivedImage) -> dict:
+    """Store a received upload unless the same bytes are stored already; returns the srcset manifest"""
+    digest = sink.sha256.hexdigest()
+    pending = _publishing.get(digest)
+    if pending is None:
+        pending = asyncio.ensure_future(_publish_new(sink, received, digest))
+        _publishing[digest] = pending
+        pending.add_done_callback(lambda _: _publishing.pop(digest, None))
+    else:
+        sink.discard()
+    return await asyncio.shield(pending)
+
+
+async def _publish_new(sink: UploadSink, received: ReceivedImage, digest: str) -> dict:
+    """Resize a received upload into variants, store it all and return the srcset manifest"""
+    stem = sink.blob_stem
+    try:
+        existing = await run_in_threadpool(upload_index.lookup, digest)
+        if existing:
+            # Staged blocks are never committed and expire on their own
+            print(f"Upload {received.filename} is a duplicate of {existing['url']}", file=sys.stdout)
+            return existing
+
+        # Resize into responsive variants in the process pool
+        try:
+            image = await image_variants.generate_variants(str(sink.part_path))
+        except image_variants.InvalidImage as e:
+            print(f"Rejected upload {received.filename}: {e}", file=sys.stderr)
+            raise UploadRejected(400, "Invalid image file")
+
+        original_name = f"{stem}{received.extension}"
+        backend = sink.storage
+        url = await sink.commit(received.content_type)
+        if url is None:
+            # Fallback to local storage
+            print(f"Upload to {backend.label} failed, falling back to local storage", file=sys.stderr)
+            backend = storage.get_backend("local")
+            url = await backend.save_part(sink.part_path, original_name, received.content_type)
+        print(f"Stored upload in {backend.label}: {url}", file=sys.stdout)
+    finally:
+        sink.discard()
+
+    # Variants go next to the original, in parallel
+    variants = image["variants"]
+    urls = await asyncio.gather(*(
+        backend.put(
+            image_variants.variant_name(stem, variant["width"], variant["ext"]),
+            variant["data"],
+            variant["content_type"],
+        )
+        for variant in variants
+    ))
+    stored = [
+        {"url": variant_url, "width": variant["width"], "height": variant["height"], "type": variant["content_type"]}
+        for variant, variant_url in zip(variants, urls)
+        if variant_url
+    ]
+    manifest = image_variants.srcset_manifest(
+        url, image["width"], image["height"], stored, image.get("placeholder"), image.get("dominant_color")
+    )
+    return await run_in_threadpool(
+        upload_index.record, digest, original_name, received.content_type, received.size, manifest
+    )
+
+
+def _new_sink() -> UploadSink:
+    stem = str(uuid.uuid4())
+    return UploadSink(UPLOAD_DIR / f".{stem}.part", stem, storage.get_storage())
+
+
+@router.post("", openapi_extra=UPLOAD_REQUEST_BODY)
 async def upload_file(
-    file: UploadFile = File(...),
+    request: Request,
     current_user: AdminUser = Depends(get_current_user)
 ):
-    # Validate file type
-    allowed_extensions = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
-    file_ext = Path(file.filename).suffix.lower()
-    if file_ext not in allowed_extensions:
-        raise HTTPException(status_code=400, detail="Invalid file type")
-    
-    # Read file content
-    file_content = await file.read()
-    content_type = file.content_type or "image/jpeg"
-    
-    # Try Azure Blob Storage first
-    import sys
-    print(f"Attempting Azure upload for file: {file.filename}, size: {len(file_content)} bytes", file=sys.stdout)
-    blob_url = upload_to_blob(file_content, file.filename, content_type)
-    
-    if blob_url:
-        # Successfully uploaded to Azure
-        print(f"Successfully uploaded to Azure Blob Storage: {blob_url}", file=sys.stdout)
-        return {"url": blob_url}
-    
-    # Fallback to local storage
-    print("Azure upload failed, falling back to local storage", file=sys.stderr)
-    import uuid
-    unique_filename = f"{uuid.uuid4()}{file_ext}"
-    file_path = UPLOAD_DIR / unique_filename
-    
-    # Save file locally
-    with open(file_path, "wb") as buffer:
-        buffer.write(file_content)
-    
-    # Return URL
-    return {"url": f"/static/uploads/{unique_filename}"}
+    # Stream the body to a part file (and Azure blocks) instead of reading it
+    # into memory; size and type are checked before anything is stored
+    sink = _new_sink()
+    try:
+        received = await receive_image(request, sink, settings.MAX_UPLOAD_BYTES, ALLOWED_EXTENSIONS)
+        print(f"Received upload {received.filename}: {received.size} bytes, {received.content_type}", file=sys.stdout)
+        return await _publish(sink, received)
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    finally:
+        sink.discard()
+
+
+@router.get("/sha256/{digest}")
+def find_upload(
+    digest: str,
+    current_user: AdminUser = Depends(get_current_user)
+):
+    """Manifest of an already stored upload, so a client can skip sending bytes the server has"""
+    manifest = upload_index.lookup(digest)
+    if not manifest:
+        raise HTTPException(status_code=404, detail="File not found")
+    return manifest
+
+
+@router.post("/sha256")
+def find_uploads(
+    digests: List[str],
+    current_user: AdminUser = Depends(get_current_user)
+):
+    """Which of digests are stored already, so a batch can send those by digest instead of bytes"""
+    if len(digests) > settings.MAX_BATCH_FILES:
+        raise HTTPException(status_code=400, detail=f"At most {settings.MAX_BATCH_FILES} digests at a time")
+    return {"known": upload_index.known([digest for digest in digests if SHA256_HEX.match(digest)])}
+
+
+async def _reuse(digest: str) -> dict:
+    """Manifest of a batch entry sent by digest"""
+    if not SHA256_HEX.match(digest):
+        raise UploadRejected(400, "Invalid SHA-256 digest")
+    manifest = await run_in_threadpool(upload_index.lookup, digest)
+    if not manifest:
+        raise UploadRejected(404, "File not found; send it again")
+    return manifest
+
+
+def _check_section(db: Session, section_id: int) -> None:
+    if not db.query(StorySection.id).filter(StorySection.id == section_id).first():
+        raise HTTPException(status_code=404, detail="Story section not found")
+
+
+def _create_rows(db: Session, target: str, section_id: Optional[int], urls: List[str]) -> List[dict]:
+    """Gallery/story rows for urls, appended in one transaction with contiguous order values"""
+    if target == "story":
+        model, schema = StoryImage, StoryImageSchema
+        in_section = StoryImage.section_id.is_(None) if section_id is None else StoryImage.section_id == section_id
+        last = db.query(func.max(StoryImage.order)).filter(in_section).scalar()
+    else:
+        model, schema = GalleryImage, GalleryImageSchema
+        last = db.query(func.max(GalleryImage.order)).scalar()
+    first = 0 if last is None else last + 1
+    fields = {"section_id": section_id} if target == "story" else {}
+    rows = [model(image_url=url, order=first + i, **fields) for i, url in enumerate(urls)]
+    db.add_all(rows)
+    db.commit()
+    return [schema.model_validate(row).model_dump() for row in rows]
+
+
+@router.post("/batch", openapi_extra=BATCH_UPLOAD_REQUEST_BODY)
+async def upload_batch(
+    request: Request,
+    target: Literal["gallery", "story"] = "gallery",
+    section_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: AdminUser = Depends(get_current_user)
+):
+    """
+    Upload many images in one request and add them to the gallery (or to a
+    story section, with target=story). Files are stored as soon as each one
+    has arrived, a few at a time; results come back per file, in order.
+    Files the server already has can be sent as sha256 fields instead.
+    """
+    if target == "story" and section_id is not None:
+        await run_in_threadpool(_check_section, db, section_id)
+
+    limit = asyncio.Semaphore(settings.BATCH_UPLOAD_CONCURRENCY)
+
+    async def publish(sink: UploadSink, received: ReceivedImage) -> dict:
+        async with limit:
+            return await _publish(sink, received)
+
+    entries = []  # (filename, publish task or UploadRejected)
+    sinks = []
+
+    def new_sink() -> UploadSink:
+        sinks.append(_new_sink())
+        return sinks[-1]
+
+    try:
+        async for filename, sink, received in stream_images(
+            request,
+            new_sink,
+            settings.MAX_UPLOAD_BYTES,
+            ALLOWED_EXTENSIONS,
+            max_files=settings.MAX_BATCH_FILES,
+            max_body=settings.MAX_BATCH_UPLOAD_BYTES,
+            digest_field="sha256",
+        ):
+            if isinstance(received, KnownUpload):
+                entries.append((filename, asyncio.ensure_future(_reuse(received.sha256))))
+            elif isinstance(received, UploadRejected):
+                if sink is not None:
+                    sink.discard()
+                entries.append((filename, received))
+            else:
+                entries.append((filename, asyncio.ensure_future(publish(sink, received))))
+    except BaseException as e:
+        # The request failed as a whole; files already committed are left
+        # for the orphan cleanup
+        for _, entry in entries:
+            if isinstance(entry, asyncio.Future):
+                entry.cancel()
+        await asyncio.gather(*(entry for _, entry in entries if isinstance(entry, asyncio.Future)), return_exceptions=True)
+        for sink in sinks:
+            sink.discard()
+        if isinstance(e, UploadRejected):
+            raise HTTPException(status_code=e.status_code, detail=e.detail)
+        raise
+
+    outcomes = await asyncio.gather(
+        *(entry for _, entry in entries if isinstance(entry, asyncio.Future)),
+        return_exceptions=True,
+    )
+    outcomes = iter(outcomes)
+    results = []
+    for filename, entry in entries:
+        outcome = next(outcomes) if isinstance(entry, asyncio.Future) else entry
+        if isinstance(outcome, UploadRejected):
+            results.append({"filename": filename, "status_code": outcome.status_code, "detail": outcome.detail})
+        elif isinstance(outcome, BaseException):
+            print(f"Error storing {filename}: {outcome}", file=sys.stderr)
+            results.append({"filename": filename, "status_code": 500, "detail": "Error storing file"})
+        else:
+            results.append({"filename": filename, "status_code": 200, **outcome})
+
+    stored = [result for result in results if result["status_code"] == 200]
+    rows = await run_in_threadpool(_create_rows, db, target, section_id, [result["url"] for result in stored])
+    for result, row in zip(stored, rows):
+        result["item"] = row
+    return {"created": len(rows), "results": results}
+
+
+def _in_use(db: Session, name: str) -> bool:
+    return name in blob_gc.referenced_names(db)
 
 
 @router.delete("/{filename:path}")
-def delete_file(
+async def delete_file(
     filename: str,
+    db: Session = Depends(get_db),
     current_user: AdminUser = Depends(get_current_user)
 ):
-    # Try Azure Blob Storage first
-    if delete_from_blob(filename):
-        return {"message": "File deleted from Azure Blob Storage"}
-    
-    # Fallback to local storage
-    file_path = UPLOAD_DIR / filename
-    if not file_path.exists():
-        raise HTTPException(status_code=404, detail="File not found")
-    
-    file_path.unlink()
-    return {"message": "File deleted from local storage"}
+    name = filename.split("/")[-1]
+    stem = Path(name).stem
+    await run_in_threadpool(upload_index.forget, name)
+    # Deduplicated uploads share one file: while other rows still show it,
+    # only the index entry goes and the orphan cleanup reclaims the bytes later
+    if await run_in_threadpool(_in_use, db, name):
+        return {"message": "File is still in use and was kept"}
+
+    # The configured backend first, then the local fallback
+    for backend in storage.storage_chain():
+        if await backend.delete(name):
+            await asyncio.gather(*(
+                backend.delete(variant)
+                for variant in await backend.list_names(f"{stem}-")
+                if image_variants.is_variant_of(variant, stem)
+            ))
+            return {"message": f"File deleted from {backend.label}"}
+    raise HTTPException(status_code=404, detail="File not found")
 
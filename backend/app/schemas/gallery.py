@@ -20,6 +20,10 @@ class GalleryImageUpdate(BaseModel):
 
 class GalleryImage(GalleryImageBase):
     id: int
+    placeholder: Optional[str] = None
+    dominant_color: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
     
     class Config:
         from_attributes = True
@@ -25,6 +25,8 @@ class HomeContentBase(BaseModel):
 
 class HomeContent(HomeContentBase):
     id: int
+    hero_image_width: Optional[int] = None
+    hero_image_height: Optional[int] = None
     
     class Config:
         from_attributes = True
@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from app.schemas.home_content import HomeContent
+from app.schemas.story import StorySection, StoryImage
+from app.schemas.wedding_info import WeddingInfoSection
+from app.schemas.timeline import TimelineEvent
+from app.schemas.gallery import GalleryImage
+from app.schemas.gifts import GiftItem
+
+
+class SiteContent(BaseModel):
+    """Everything the public pages need, in one payload"""
+    home: Optional[HomeContent] = None
+    story_sections: List[StorySection]
+    story_images: List[StoryImage]
+    info_sections: List[WeddingInfoSection]
+    timeline_events: List[TimelineEvent]
+    gallery_images: List[GalleryImage]
+    gift_items: List[GiftItem]
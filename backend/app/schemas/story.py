@@ -45,6 +45,10 @@ class StoryImageUpdate(BaseModel):
 
 class StoryImage(StoryImageBase):
     id: int
+    placeholder: Optional[str] = None
+    dominant_color: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
     
     class Config:
         from_attributes = True
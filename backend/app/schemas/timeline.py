@@ -40,6 +40,10 @@ class TimelineEventUpdate(BaseModel):
 
 class TimelineEvent(TimelineEventBase):
     id: int
+    placeholder: Optional[str] = None
+    dominant_color: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
     
     class Config:
         from_attributes = True
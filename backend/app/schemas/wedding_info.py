@@ -1,6 +1,11 @@
 import json
 from pydantic import BaseModel, field_validator, model_validator
-from typing import Optional, List
+from typing import Dict, Optional, List
+
+
+class ImagePlaceholder(BaseModel):
+    placeholder: Optional[str] = None
+    dominant_color: Optional[str] = None
 
 
 class WeddingInfoSectionBase(BaseModel):
@@ -34,6 +39,8 @@ class WeddingInfoSectionUpdate(BaseModel):
 class WeddingInfoSection(WeddingInfoSectionBase):
     id: int
     sort_order: int = 0
+    image_placeholders: Optional[Dict[str, ImagePlaceholder]] = None
+    image_sizes: Optional[Dict[str, List[int]]] = None
 
     @field_validator('gallery_urls', mode='before')
     @classmethod
@@ -44,6 +51,13 @@ class WeddingInfoSection(WeddingInfoSectionBase):
             return json.loads(v) if v.strip() else []
         return v
 
+    @field_validator('image_placeholders', 'image_sizes', mode='before')
+    @classmethod
+    def parse_image_maps(cls, v):
+        if isinstance(v, str):
+            return json.loads(v) if v.strip() else None
+        return v
+
     @model_validator(mode='after')
     def fill_gallery_from_image_url(self):
         """Backward compat: if gallery_urls is empty but image_url exists, use it as single-image gallery."""
@@ -0,0 +1,129 @@
+"""
+Garbage collection of stored uploads.
+
+Deleting a gallery image, story image, timeline event or info section only
+deletes its row, so its file (and resized variants) stay in storage. collect()
+walks a storage listing one page at a time and deletes, in batches, every
+object that no content row refers to. Objects younger than min_age, and those
+indexed or handed out again by upload deduplication within min_age, are left
+alone so uploads whose row is not saved yet survive; each batch is checked
+against the database again just before it is deleted. With dry_run nothing is
+deleted and the report says what would be. gc_uploads.py runs it.
+"""
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from app.core.storage import StorageBackend, StoredObject
+from app.models.gallery_image import GalleryImage
+from app.models.gift_item import GiftItem
+from app.models.home_content import HomeContent
+from app.models.story_image import StoryImage
+from app.models.timeline_event import TimelineEvent
+from app.models.uploaded_file import UploadedFile
+from app.models.wedding_info_section import WeddingInfoSection
+from app.services.image_metadata import image_name, info_section_urls
+from app.services.image_variants import VARIANT_NAME
+
+# Columns holding a single image URL (info section gallery_urls are read separately)
+URL_COLUMNS = (
+    GalleryImage.image_url,
+    GiftItem.image_url,
+    HomeContent.hero_image_url,
+    StoryImage.image_url,
+    TimelineEvent.image_url,
+)
+
+DEFAULT_MIN_AGE = timedelta(hours=24)
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_PAGE_SIZE = 1000
+SAMPLE_SIZE = 20
+
+
+def referenced_names(db: Session) -> Set[str]:
+    """Stored file/blob name of every image URL a content row refers to"""
+    urls = [url for column in URL_COLUMNS for (url,) in db.query(column).filter(column.isnot(None)).distinct()]
+    for section in db.query(WeddingInfoSection).all():
+        urls.extend(info_section_urls(section))
+    return {name for name in map(image_name, urls) if name}
+
+
+def recently_used_names(db: Session, since: datetime) -> Set[str]:
+    """Stored names of uploads indexed or handed out by the upload index since a time"""
+    rows = db.query(UploadedFile.name).filter(or_(UploadedFile.created_at > since, UploadedFile.last_used_at > since))
+    return {name for (name,) in rows}
+
+
+class _References:
+    def __init__(self, names: Set[str]):
+        self.names = names
+        self.stems = {Path(name).stem for name in names}
+
+    def __contains__(self, name: str) -> bool:
+        if name in self.names:
+            return True
+        # Resized variants live as long as their original
+        match = VARIANT_NAME.match(name)
+        return bool(match) and match.group("stem") in self.stems
+
+
+def collect(
+    db: Session,
+    pages: Iterable[List[StoredObject]],
+    delete: Callable[[List[str]], int],
+    min_age: timedelta = DEFAULT_MIN_AGE,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    dry_run: bool = False,
+    now: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """Delete the unreferenced objects of one storage listing and report on them"""
+    cutoff = (now or datetime.now(timezone.utc)) - min_age
+    references = _References(referenced_names(db))
+    recent = _References(recently_used_names(db, cutoff))
+    report = {
+        "dry_run": dry_run,
+        "scanned": 0,
+        "orphaned": 0,
+        "orphaned_bytes": 0,
+        "too_recent": 0,
+        "deleted": 0,
+        "sample": [],
+    }
+    batch: List[str] = []
+
+    def flush() -> None:
+        # Rows saved, or URLs handed out, since the listing started may point at these objects now
+        live = _References(referenced_names(db) | recently_used_names(db, cutoff))
+        names = [name for name in batch if name not in live]
+        batch.clear()
+        if not names:
+            return
+        db.query(UploadedFile).filter(UploadedFile.name.in_(names)).delete(synchronize_session=False)
+        db.commit()
+        report["deleted"] += delete(names)
+
+    for page in pages:
+        for name, size, modified in page:
+            report["scanned"] += 1
+            if name in references:
+                continue
+            if modified > cutoff or name in recent:
+                report["too_recent"] += 1
+                continue
+            report["orphaned"] += 1
+            report["orphaned_bytes"] += size or 0
+            if len(report["sample"]) < SAMPLE_SIZE:
+                report["sample"].append(name)
+            if not dry_run:
+                batch.append(name)
+                if len(batch) >= batch_size:
+                    flush()
+    if batch:
+        flush()
+    return report
+
+
+def collect_storage(db: Session, backend: StorageBackend, page_size: int = DEFAULT_PAGE_SIZE, **options) -> Dict[str, Any]:
+    """collect() over everything in a storage backend"""
+    return collect(db, backend.list_pages(page_size), backend.delete_many, **options)
@@ -0,0 +1,90 @@
+"""
+Saving the admin's guest list as a diff against the stored invitations.
+
+Submitted rows are matched to stored ones by normalized label (case and
+whitespace ignored); when a label appears more than once, the n-th
+submitted row matches the n-th stored row with that label, oldest first.
+Matched rows keep their id and are only written when the label spelling or
+participants changed; the rest are inserted or deleted. Everything is done
+with bulk statements in one transaction.
+"""
+import json
+from typing import Dict, List, Sequence, Tuple
+from sqlalchemy import delete, insert, update
+from sqlalchemy.orm import Session
+from app.models.guest_invitation import GuestInvitation
+from app.models.rsvp import RSVP
+from app.schemas.guest_invitation import InvitationUpsert
+
+LABEL_MAX_LENGTH = 500
+# Ids per IN (...) list, well under SQLite's bound-parameter limit
+ID_CHUNK_SIZE = 500
+
+
+def normalize_label(label: str) -> str:
+    return " ".join(label.split()).casefold()
+
+
+def _keyed(labels: Sequence[str]) -> List[Tuple[str, int]]:
+    """(normalized label, occurrence) per label, so duplicates pair up in order"""
+    seen: Dict[str, int] = {}
+    keys = []
+    for label in labels:
+        normalized = normalize_label(label)
+        keys.append((normalized, seen.get(normalized, 0)))
+        seen[normalized] = seen.get(normalized, 0) + 1
+    return keys
+
+
+def _chunks(ids: List[int]):
+    for start in range(0, len(ids), ID_CHUNK_SIZE):
+        yield ids[start:start + ID_CHUNK_SIZE]
+
+
+def replace_invitations(db: Session, invitations: Sequence[InvitationUpsert]) -> Dict[str, int]:
+    """Make the stored invitations match invitations; returns what changed (commits)"""
+    stored = db.query(
+        GuestInvitation.id, GuestInvitation.display_label, GuestInvitation.participants
+    ).order_by(GuestInvitation.id).all()
+    stored_by_key = dict(zip(_keyed([row.display_label for row in stored]), stored))
+
+    labels = [inv.display_label[:LABEL_MAX_LENGTH] for inv in invitations]
+    inserts: List[Dict[str, str]] = []
+    updates: List[Dict[str, object]] = []
+    kept = set()
+    for key, label, inv in zip(_keyed(labels), labels, invitations):
+        values = {"display_label": label, "participants": json.dumps(inv.participants)}
+        row = stored_by_key.get(key)
+        if row is None:
+            inserts.append(values)
+            continue
+        kept.add(row.id)
+        if (row.display_label, row.participants) != (values["display_label"], values["participants"]):
+            updates.append({"id": row.id, **values})
+    deleted = [row.id for row in stored if row.id not in kept]
+
+    try:
+        for ids in _chunks(deleted):
+            # RSVPs are snapshots and no longer link by id; clear stale ones so Postgres allows the delete
+            db.execute(
+                update(RSVP).where(RSVP.guest_invitation_id.in_(ids)).values(guest_invitation_id=None),
+                execution_options={"synchronize_session": False},
+            )
+            db.execute(
+                delete(GuestInvitation).where(GuestInvitation.id.in_(ids)),
+                execution_options={"synchronize_session": False},
+            )
+        if updates:
+            db.execute(update(GuestInvitation), updates)
+        if inserts:
+            db.execute(insert(GuestInvitation), inserts)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return {
+        "inserted": len(inserts),
+        "updated": len(updates),
+        "deleted": len(deleted),
+        "unchanged": len(kept) - len(updates),
+    }
@@ -0,0 +1,155 @@
+"""
+Placeholder previews and dimensions on image records.
+
+Rows that show an uploaded image carry the tiny preview, dominant colour and
+pixel size recorded for it in the upload index. A before_flush hook copies
+them in whenever a row's image URL is set or changed, so every router gets
+them without extra code; backfill_placeholders.py and backfill_dimensions.py
+fill in older rows.
+"""
+import json
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.storage import LOCAL_URL_PREFIX
+from app.models.gallery_image import GalleryImage
+from app.models.home_content import HomeContent
+from app.models.story_image import StoryImage
+from app.models.timeline_event import TimelineEvent
+from app.models.uploaded_file import UploadedFile
+from app.models.wedding_info_section import WeddingInfoSection
+
+# Models with a single image_url and placeholder/dominant_color/width/height columns
+IMAGE_MODELS = (GalleryImage, StoryImage, TimelineEvent)
+IMAGE_FIELDS = ("placeholder", "dominant_color", "width", "height")
+
+LOCAL_PREFIX = LOCAL_URL_PREFIX
+
+# {"placeholder", "dominant_color", "width", "height"}, any of them None
+ImageInfo = Dict[str, Any]
+
+
+def image_name(url: Optional[str]) -> Optional[str]:
+    """Stored file/blob name of an image URL"""
+    if not url:
+        return None
+    return url.split("?")[0].rstrip("/").split("/")[-1] or None
+
+
+def fetch_image(url: str, max_bytes: Optional[int] = None) -> Union[str, bytes]:
+    """
+    A local path or the downloaded bytes of an image URL; with max_bytes,
+    only that much of the start of a remote file is requested.
+    """
+    if url.startswith(LOCAL_PREFIX):
+        return str(Path(settings.STATIC_DIR) / image_name(url))
+    if url.startswith(("http://", "https://")):
+        request = urllib.request.Request(url)
+        if max_bytes:
+            request.add_header("Range", f"bytes=0-{max_bytes - 1}")
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return response.read(max_bytes or settings.MAX_UPLOAD_BYTES + 1)
+    raise ValueError("unsupported URL")
+
+
+def info_section_urls(section: WeddingInfoSection) -> List[str]:
+    """Every image URL an info section shows (image_url and gallery_urls)"""
+    urls = [section.image_url] if section.image_url else []
+    try:
+        gallery = json.loads(section.gallery_urls) if section.gallery_urls else []
+    except ValueError:
+        gallery = []
+    return list(dict.fromkeys(urls + [url for url in gallery if isinstance(url, str) and url]))
+
+
+def indexed_images(session: Session, urls: Iterable[str]) -> Dict[str, ImageInfo]:
+    """{url: image info} for the urls found in the upload index"""
+    by_name: Dict[str, List[str]] = {}
+    for url in urls:
+        name = image_name(url)
+        if name:
+            by_name.setdefault(name, []).append(url)
+    if not by_name:
+        return {}
+    rows = (
+        session.query(UploadedFile.name, *(getattr(UploadedFile, field) for field in IMAGE_FIELDS))
+        .filter(UploadedFile.name.in_(list(by_name)))
+        .all()
+    )
+    return {url: dict(zip(IMAGE_FIELDS, values)) for name, *values in rows for url in by_name[name]}
+
+
+def _rebuild_map(current: Optional[str], urls: List[str], found: Dict[str, Any]) -> Optional[str]:
+    previous = json.loads(current) if current else {}
+    entries = {}
+    for url in urls:
+        if url in found:
+            entries[url] = found[url]
+        elif url in previous:
+            entries[url] = previous[url]
+    return json.dumps(entries) if entries else None
+
+
+def set_info_placeholders(section: WeddingInfoSection, found: Dict[str, ImageInfo]) -> None:
+    """Rebuild an info section's {url: placeholder} map, keeping entries it already has"""
+    placeholders = {
+        url: {"placeholder": info["placeholder"], "dominant_color": info["dominant_color"]}
+        for url, info in found.items()
+        if info.get("placeholder")
+    }
+    section.image_placeholders = _rebuild_map(section.image_placeholders, info_section_urls(section), placeholders)
+
+
+def set_info_sizes(section: WeddingInfoSection, found: Dict[str, ImageInfo]) -> None:
+    """Rebuild an info section's {url: [width, height]} map, keeping entries it already has"""
+    sizes = {url: [info["width"], info["height"]] for url, info in found.items() if info.get("width") and info.get("height")}
+    section.image_sizes = _rebuild_map(section.image_sizes, info_section_urls(section), sizes)
+
+
+def _url_fields(obj) -> tuple:
+    if isinstance(obj, WeddingInfoSection):
+        return ("image_url", "gallery_urls")
+    if isinstance(obj, HomeContent):
+        return ("hero_image_url",)
+    return ("image_url",)
+
+
+def _urls(obj) -> List[str]:
+    if isinstance(obj, WeddingInfoSection):
+        return info_section_urls(obj)
+    if isinstance(obj, HomeContent):
+        return [obj.hero_image_url] if obj.hero_image_url else []
+    return [obj.image_url] if obj.image_url else []
+
+
+def _urls_changed(obj) -> bool:
+    state = inspect(obj)
+    if state.pending:
+        return any(getattr(obj, name) for name in _url_fields(obj))
+    return any(state.attrs[name].history.has_changes() for name in _url_fields(obj))
+
+
+@event.listens_for(Session, "before_flush")
+def _fill_image_metadata(session, flush_context, instances):
+    changed = [
+        obj for obj in (*session.new, *session.dirty)
+        if isinstance(obj, (*IMAGE_MODELS, WeddingInfoSection, HomeContent)) and _urls_changed(obj)
+    ]
+    if not changed:
+        return
+    with session.no_autoflush:
+        found = indexed_images(session, {url for obj in changed for url in _urls(obj)})
+    for obj in changed:
+        if isinstance(obj, WeddingInfoSection):
+            set_info_placeholders(obj, found)
+            set_info_sizes(obj, found)
+        elif isinstance(obj, HomeContent):
+            info = found.get(obj.hero_image_url, {})
+            obj.hero_image_width, obj.hero_image_height = info.get("width"), info.get("height")
+        else:
+            info = found.get(obj.image_url, {})
+            for field in IMAGE_FIELDS:
+                setattr(obj, field, info.get(field))
@@ -0,0 +1,218 @@
+"""
+Responsive variants for uploaded images.
+
+An upload stored as <stem>.<ext> gets <stem>-<width>.webp and a
+<stem>-<width>.jpg fallback for each width in VARIANT_WIDTHS (capped at
+the original width). Decoding and encoding run in a process pool so
+neither the event loop nor the GIL is held while an upload is resized.
+"""
+import asyncio
+import base64
+import io
+import math
+import multiprocessing
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union
+from PIL import Image, ImageOps
+from app.core.config import settings
+
+VARIANT_WIDTHS = (320, 640, 1280, 1920)
+
+# extension -> (Pillow format, content type, save options)
+VARIANT_FORMATS = {
+    "webp": ("WEBP", "image/webp", {"quality": 80, "method": 4}),
+    "jpg": ("JPEG", "image/jpeg", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+VARIANT_NAME = re.compile(r"^(?P<stem>.+)-(?P<width>\d+)\.(?P<ext>webp|jpg)$")
+
+# Inline preview shown (blurred) while the real image loads
+PLACEHOLDER_SIZE = 20
+PLACEHOLDER_QUALITY = 40
+
+
+class InvalidImage(Exception):
+    pass
+
+
+def variant_name(stem: str, width: int, ext: str) -> str:
+    return f"{stem}-{width}.{ext}"
+
+
+def is_variant_of(name: str, stem: str) -> bool:
+    match = VARIANT_NAME.match(name)
+    return bool(match) and match.group("stem") == stem
+
+
+def _flatten(image: Image.Image) -> Image.Image:
+    """RGB copy with any transparency composited onto white (for JPEG)"""
+    if image.mode == "RGB":
+        return image
+    rgba = image.convert("RGBA")
+    background = Image.new("RGB", rgba.size, (255, 255, 255))
+    background.paste(rgba, mask=rgba.getchannel("A"))
+    return background
+
+
+def placeholder_for(image: Image.Image) -> Tuple[str, str]:
+    """(data URI of a tiny WebP preview, dominant colour as #rrggbb)"""
+    small = image.copy()
+    small.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE), Image.Resampling.BOX)
+    buffer = io.BytesIO()
+    small.save(buffer, "WEBP", quality=PLACEHOLDER_QUALITY)
+    data_uri = "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+    palette = _flatten(small).quantize(colors=5)
+    _, index = max(palette.getcolors())
+    r, g, b = palette.getpalette()[index * 3:index * 3 + 3]
+    return data_uri, f"#{r:02x}{g:02x}{b:02x}"
+
+
+def _open(source: Union[str, bytes]) -> Image.Image:
+    return Image.open(io.BytesIO(source) if isinstance(source, bytes) else source)
+
+
+def _orientation(image: Image.Image) -> int:
+    if image.format == "PNG":
+        # getexif() on a PNG decodes the whole file looking for a trailing eXIf
+        # chunk; one before the pixel data is already in info
+        if "exif" not in image.info:
+            return 1
+        exif = Image.Exif()
+        exif.load(image.info["exif"])
+        return exif.get(0x0112, 1)
+    return image.getexif().get(0x0112, 1)
+
+
+def _oriented_size(image: Image.Image) -> Tuple[int, int]:
+    """Size as displayed, after EXIF rotation"""
+    width, height = image.size
+    if _orientation(image) in (5, 6, 7, 8):
+        return height, width
+    return width, height
+
+
+def image_size(source: Union[str, bytes]) -> Tuple[int, int]:
+    """(width, height) as displayed, read from the file header without decoding pixels"""
+    try:
+        with _open(source) as image:
+            return _oriented_size(image)
+    except Exception as e:
+        raise InvalidImage(str(e)) from e
+
+
+def build_placeholder(source: Union[str, bytes]) -> Dict[str, Any]:
+    """{"width", "height", "placeholder", "dominant_color"} for an image (a file path or its bytes)"""
+    try:
+        image = _open(source)
+        width, height = _oriented_size(image)
+        if image.format == "JPEG":
+            image.draft("RGB", (PLACEHOLDER_SIZE * 8, PLACEHOLDER_SIZE * 8))
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA")
+        placeholder, color = placeholder_for(image)
+    except Exception as e:
+        raise InvalidImage(str(e)) from e
+    return {"width": width, "height": height, "placeholder": placeholder, "dominant_color": color}
+
+
+def build_variants(source: Union[str, bytes]) -> Dict[str, Any]:
+    """
+    Decode an upload (a file path or its bytes) and encode every variant
+    (runs in a worker process).
+
+    Returns {"width", "height", "placeholder", "dominant_color", "variants":
+    [{"width", "height", "ext", "content_type", "data"}]}; animated images
+    get no variants.
+    """
+    try:
+        image = _open(source)
+        image.verify()
+        image = _open(source)
+        width, height = _oriented_size(image)
+        result: Dict[str, Any] = {"width": width, "height": height, "variants": []}
+        if getattr(image, "is_animated", False):
+            image = ImageOps.exif_transpose(image.convert("RGBA"))
+            result["placeholder"], result["dominant_color"] = placeholder_for(image)
+            return result
+
+        widths = sorted({min(w, width) for w in VARIANT_WIDTHS})
+        if image.format == "JPEG":
+            # Let the decoder downscale by a power of two when the largest variant allows it
+            scale = widths[-1] / width
+            image.draft(image.mode, (math.ceil(image.size[0] * scale), math.ceil(image.size[1] * scale)))
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info or image.mode in ("LA", "PA") else "RGB")
+        result["placeholder"], result["dominant_color"] = placeholder_for(image)
+    except Exception as e:
+        raise InvalidImage(str(e)) from e
+
+    for target in reversed(widths):
+        target_height = max(1, round(height * target / width))
+        if image.size != (target, target_height):
+            image = image.resize((target, target_height), Image.Resampling.LANCZOS)
+        for ext, (fmt, content_type, options) in VARIANT_FORMATS.items():
+            buffer = io.BytesIO()
+            (image if fmt == "WEBP" else _flatten(image)).save(buffer, fmt, **options)
+            result["variants"].append({
+                "width": target,
+                "height": target_height,
+                "ext": ext,
+                "content_type": content_type,
+                "data": buffer.getvalue(),
+            })
+    result["variants"].reverse()
+    return result
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn: the server process has threads (DB pool, version listener)
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.IMAGE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+async def generate_variants(source: Union[str, bytes]) -> Dict[str, Any]:
+    """build_variants() in the process pool (pass a path to keep large uploads out of memory)"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_pool(), build_variants, source)
+
+
+def shutdown() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def srcset_manifest(
+    url: str,
+    width: int,
+    height: int,
+    variants: List[Dict[str, Any]],
+    placeholder: Optional[str] = None,
+    dominant_color: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Upload response: the original plus variants grouped into srcset strings"""
+    srcset: Dict[str, List[str]] = {}
+    for variant in variants:
+        srcset.setdefault(variant["type"], []).append(f"{variant['url']} {variant['width']}w")
+    return {
+        "url": url,
+        "width": width,
+        "height": height,
+        "placeholder": placeholder,
+        "dominant_color": dominant_color,
+        "variants": variants,
+        "srcset": {content_type: ", ".join(entries) for content_type, entries in srcset.items()},
+    }
@@ -0,0 +1,59 @@
+"""
+Saving a drag-and-drop reorder for any orderable content table.
+
+The submitted ids get positions 0..n-1 in the given order; rows that are
+not in the list keep theirs. Only rows whose position actually changed are
+written, with one UPDATE ... SET order = CASE id WHEN ... END statement,
+and the response is sorted in memory from the rows read up front, so a
+save costs one SELECT and at most one UPDATE however long the list is.
+"""
+from typing import Any, Dict, List, Optional, Sequence
+from sqlalchemy import case, update
+from sqlalchemy.orm import InstrumentedAttribute, Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+# Rows per UPDATE; each costs three bound parameters, which keeps a statement
+# well under SQLite's and Postgres' limits
+MAX_ROWS_PER_STATEMENT = 5000
+
+
+def _sort_key(name: str):
+    # NULL positions first, as SQLite sorts them; ties by id so the result is stable
+    def key(row) -> tuple:
+        value = getattr(row, name)
+        return (value is not None, value or 0, row.id)
+    return key
+
+
+def reorder(db: Session, column: InstrumentedAttribute, ids: Sequence[int]) -> Optional[List[Any]]:
+    """Set column to each id's position in ids; returns every row sorted by column,
+    or None when an id is unknown or repeated (commits)"""
+    model = column.class_
+    name = column.key
+    rows = db.query(model).all()
+    by_id = {row.id: row for row in rows}
+    if len(set(ids)) != len(ids) or any(row_id not in by_id for row_id in ids):
+        return None
+
+    changed: Dict[int, int] = {
+        row_id: position for position, row_id in enumerate(ids)
+        if getattr(by_id[row_id], name) != position
+    }
+    changed_ids = list(changed)
+    try:
+        for start in range(0, len(changed_ids), MAX_ROWS_PER_STATEMENT):
+            batch = {row_id: changed[row_id] for row_id in changed_ids[start:start + MAX_ROWS_PER_STATEMENT]}
+            db.execute(
+                update(model).where(model.id.in_(batch)).values({column: case(batch, value=model.id)}),
+                execution_options={"synchronize_session": False},
+            )
+        for row_id, position in changed.items():
+            set_committed_value(by_id[row_id], name, position)
+        # Detached rows are not expired by the commit, so serializing them needs no reload
+        for row in rows:
+            db.expunge(row)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return sorted(rows, key=_sort_key(name))
@@ -0,0 +1,170 @@
+"""
+Queries behind the public (guest-facing) content endpoints.
+Shared by the per-resource routers and the aggregated /api/site snapshot.
+
+The *_json functions serialize each payload once with a precompiled
+TypeAdapter and keep the bytes cached until the underlying tables change.
+Async routes call them through ``run_async`` with the session from get_public_db.
+"""
+from typing import Any, List, Optional
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session
+from app.core import database
+from app.core.cache import cached
+from app.models.home_content import HomeContent
+from app.models.story_section import StorySection
+from app.models.story_image import StoryImage
+from app.models.wedding_info_section import WeddingInfoSection
+from app.models.timeline_event import TimelineEvent
+from app.models.gallery_image import GalleryImage
+from app.models.gift_item import GiftItem
+from app.schemas.home_content import HomeContent as HomeContentSchema
+from app.schemas.story import StorySection as StorySectionSchema, StoryImage as StoryImageSchema
+from app.schemas.wedding_info import WeddingInfoSection as WeddingInfoSectionSchema
+from app.schemas.timeline import TimelineEvent as TimelineEventSchema
+from app.schemas.gallery import GalleryImage as GalleryImageSchema
+from app.schemas.gifts import GiftItem as GiftItemSchema
+from app.services import image_metadata  # noqa: F401  (fills placeholders and sizes on image rows)
+
+# Models whose contents make up the public site
+PUBLIC_MODELS = (
+    HomeContent,
+    StorySection,
+    StoryImage,
+    WeddingInfoSection,
+    TimelineEvent,
+    GalleryImage,
+    GiftItem,
+)
+PUBLIC_TABLES = tuple(model.__tablename__ for model in PUBLIC_MODELS)
+
+DEFAULT_HOME_CONTENT = {
+    "hero_text": "Bianca & Joel",
+    "subtitle": "Join us for our special day",
+}
+
+_home_adapter = TypeAdapter(HomeContentSchema)
+_story_sections_adapter = TypeAdapter(List[StorySectionSchema])
+_story_images_adapter = TypeAdapter(List[StoryImageSchema])
+_info_sections_adapter = TypeAdapter(List[WeddingInfoSectionSchema])
+_timeline_events_adapter = TypeAdapter(List[TimelineEventSchema])
+_gallery_images_adapter = TypeAdapter(List[GalleryImageSchema])
+_gift_items_adapter = TypeAdapter(List[GiftItemSchema])
+
+
+def _dump(adapter: TypeAdapter, rows: Any) -> bytes:
+    return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+
+def get_home_content(db: Session) -> Optional[HomeContent]:
+    return db.query(HomeContent).first()
+
+
+def ensure_home_content(db: Session) -> HomeContent:
+    """Return the HomeContent singleton, adding it with defaults if missing (caller commits)"""
+    content = get_home_content(db)
+    if not content:
+        content = HomeContent(**DEFAULT_HOME_CONTENT)
+        db.add(content)
+    return content
+
+
+def list_story_sections(db: Session) -> List[StorySection]:
+    return db.query(StorySection).order_by(StorySection.order).all()
+
+
+def list_story_images(db: Session) -> List[StoryImage]:
+    return db.query(StoryImage).order_by(StoryImage.order).all()
+
+
+def list_info_sections(db: Session) -> List[WeddingInfoSection]:
+    return db.query(WeddingInfoSection).order_by(WeddingInfoSection.sort_order.asc()).all()
+
+
+def list_timeline_events(db: Session) -> List[TimelineEvent]:
+    return db.query(TimelineEvent).order_by(TimelineEvent.order).all()
+
+
+def list_gallery_images(db: Session) -> List[GalleryImage]:
+    return db.query(GalleryImage).order_by(GalleryImage.order).all()
+
+
+def list_gift_items(db: Session) -> List[GiftItem]:
+    return db.query(GiftItem).order_by(GiftItem.order).all()
+
+
+def _home_json(db: Session) -> Optional[bytes]:
+    content = get_home_content(db)
+    return _dump(_home_adapter, content) if content else None
+
+
+@cached(HomeContent)
+def home_content_json(db: Optional[Session] = None) -> Optional[bytes]:
+    """Home is the most-hit payload: without db, a session is only opened on a cache miss"""
+    if db is not None:
+        return _home_json(db)
+    if database.SessionLocal is None:
+        raise Exception("Database not initialized")
+    db = database.SessionLocal()
+    try:
+        return _home_json(db)
+    finally:
+        db.close()
+
+
+@cached(StorySection)
+def story_sections_json(db: Session) -> bytes:
+    return _dump(_story_sections_adapter, list_story_sections(db))
+
+
+@cached(StoryImage, StorySection)
+def story_images_json(db: Session) -> bytes:
+    return _dump(_story_images_adapter, list_story_images(db))
+
+
+@cached(WeddingInfoSection)
+def info_sections_json(db: Session) -> bytes:
+    return _dump(_info_sections_adapter, list_info_sections(db))
+
+
+@cached(TimelineEvent)
+def timeline_events_json(db: Session) -> bytes:
+    return _dump(_timeline_events_adapter, list_timeline_events(db))
+
+
+@cached(GalleryImage)
+def gallery_images_json(db: Session) -> bytes:
+    return _dump(_gallery_images_adapter, list_gallery_images(db))
+
+
+@cached(GiftItem)
+def gift_items_json(db: Session) -> bytes:
+    return _dump(_gift_items_adapter, list_gift_items(db))
+
+
+SITE_SECTIONS = (
+    ("home", home_content_json),
+    ("story_sections", story_sections_json),
+    ("story_images", story_images_json),
+    ("info_sections", info_sections_json),
+    ("timeline_events", timeline_events_json),
+    ("gallery_images", gallery_images_json),
+    ("gift_items", gift_items_json),
+)
+
+
+def _stitch(parts: List[Optional[bytes]]) -> bytes:
+    body = b",".join(
+        b'"%s":%s' % (name.encode(), part or b"null") for (name, _), part in zip(SITE_SECTIONS, parts)
+    )
+    return b"{" + body + b"}"
+
+
+def site_content_json(db: Session) -> bytes:
+    """The /api/site payload, stitched together from the per-section bytes"""
+    return _stitch([section(db) for _, section in SITE_SECTIONS])
+
+
+async def site_content_json_async(db: database.PublicSession) -> bytes:
+    """site_content_json() for async routes (either kind of public session)"""
+    return _stitch([await section.run_async(db) for _, section in SITE_SECTIONS])
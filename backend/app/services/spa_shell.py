@@ -0,0 +1,50 @@
+"""
+The SPA shell: index.html held in memory with the public content inlined.
+
+The frontend reads <script id="site-bootstrap"> on load instead of calling
+the API for its first render, and the theme colours arrive as a cacheable
+stylesheet (/theme.<hash>.css) before any script runs.
+"""
+import hashlib
+from pathlib import Path
+from sqlalchemy.orm import Session
+from app.core import content_versions
+from app.core.cache import cached
+from app.services.site_content import PUBLIC_MODELS, PUBLIC_TABLES, site_content_json
+from app.services.theme import theme_url
+
+BOOTSTRAP_ID = "site-bootstrap"
+
+
+@cached(*PUBLIC_MODELS, maxsize=1)
+def bootstrap_script(db: Session) -> bytes:
+    """The /api/site payload as an inline JSON script tag"""
+    # "<" only appears inside JSON strings, where < is equivalent and
+    # keeps "</script>" in user content from closing the tag
+    body = site_content_json(db).replace(b"<", b"\\u003c")
+    return b'<script id="%s" type="application/json">%s</script>' % (BOOTSTRAP_ID.encode(), body)
+
+
+class SpaShell:
+    """index.html read once; rendered with the current bootstrap data"""
+
+    def __init__(self, index_path: Path):
+        html = index_path.read_bytes()
+        head, marker, tail = html.partition(b"</head>")
+        if not marker:
+            head, marker, tail = html.partition(b"</body>")
+        self._head = head
+        self._tail = marker + tail
+        self._hash = hashlib.sha256(html).hexdigest()[:12]
+
+    def etag(self) -> str:
+        """Changes with either the shell (new deploy) or the public content"""
+        return '"%s-%s"' % (self._hash, content_versions.etag(*PUBLIC_TABLES).strip('"'))
+
+    def render(self, db: Session) -> bytes:
+        theme_link = b'<link rel="stylesheet" href="%s">' % theme_url().encode()
+        return self._head + theme_link + bootstrap_script(db) + self._tail
+
+    def render_plain(self) -> bytes:
+        """The shell without bootstrap data (the frontend then calls the API)"""
+        return self._head + self._tail
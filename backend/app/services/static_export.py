@@ -0,0 +1,82 @@
+"""
+Freeze public content into static JSON files.
+
+Each payload is written as <name>.<content hash>.json so it can be cached
+forever; manifest.json (never cached) maps payload names to current files.
+The files of the previous version stay on disk (listed under "previous")
+so that clients still holding the old manifest can finish navigating.
+"""
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict
+from sqlalchemy.orm import Session
+from app.core.static_files import ENCODINGS, CachedStaticFiles, write_compressed_siblings
+from app.services import site_content
+
+CONTENT_DIRNAME = "content"
+MANIFEST_NAME = "manifest.json"
+
+PAYLOADS: Dict[str, Callable[[Session], bytes]] = {
+    "site": site_content.site_content_json,
+    "home": lambda db: site_content.home_content_json(db) or b"null",
+    "story_sections": site_content.story_sections_json,
+    "story_images": site_content.story_images_json,
+    "info_sections": site_content.info_sections_json,
+    "timeline_events": site_content.timeline_events_json,
+    "gallery_images": site_content.gallery_images_json,
+    "gift_items": site_content.gift_items_json,
+}
+
+
+def _read_manifest(path: Path) -> Dict[str, Any]:
+    try:
+        return json.loads(path.read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def content_files(dist_dir: Path) -> CachedStaticFiles:
+    """Static files app serving dist_dir/content; the directory is created so
+    requests before the first freeze get 404s rather than errors"""
+    out_dir = dist_dir / CONTENT_DIRNAME
+    out_dir.mkdir(parents=True, exist_ok=True)
+    return CachedStaticFiles(directory=out_dir)
+
+
+def freeze_site_content(db: Session, dist_dir: Path) -> Dict[str, Any]:
+    """Write every public payload under dist_dir/content and return the manifest"""
+    out_dir = dist_dir / CONTENT_DIRNAME
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    files = {}
+    for name, render in PAYLOADS.items():
+        body = render(db)
+        filename = f"{name}.{hashlib.sha256(body).hexdigest()[:12]}.json"
+        path = out_dir / filename
+        if not path.exists():
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_bytes(body)
+            tmp_path.replace(path)
+            write_compressed_siblings(path)
+        files[name] = f"/{CONTENT_DIRNAME}/{filename}"
+
+    # Version of the whole set, so clients can tell when anything changed
+    version = hashlib.sha256("".join(sorted(files.values())).encode()).hexdigest()[:12]
+    old = _read_manifest(out_dir / MANIFEST_NAME)
+    if old.get("version") == version:
+        previous = old.get("previous", [])
+    else:
+        previous = sorted(old.get("files", {}).values())
+    manifest = {"version": version, "files": files, "previous": previous}
+    tmp_manifest = out_dir / (MANIFEST_NAME + ".tmp")
+    tmp_manifest.write_text(json.dumps(manifest, indent=2))
+    tmp_manifest.replace(out_dir / MANIFEST_NAME)
+
+    # Drop files from older freezes that neither this nor the previous version references
+    current = {Path(url).name for url in [*files.values(), *previous]} | {MANIFEST_NAME}
+    current |= {name + suffix for name in current for suffix in ENCODINGS.values()}
+    for path in out_dir.iterdir():
+        if path.is_file() and path.name not in current:
+            path.unlink()
+    return manifest
@@ -0,0 +1,67 @@
+"""
+theme.css generated from the HomeContent colours.
+
+The stylesheet is cached with the home content and published under a
+content-hash URL, which only changes when a colour does.
+"""
+import hashlib
+import re
+from typing import Optional, Tuple
+from app.core import database
+from app.core.cache import cached
+from app.models.home_content import HomeContent
+from app.services.site_content import get_home_content
+
+# CSS custom property -> HomeContent column (same names ThemeContext sets)
+THEME_VARIABLES = (
+    ("--theme-hero-text", "text_color"),
+    ("--theme-navbar-bg", "navbar_color"),
+    ("--theme-navbar-text", "navbar_text_color"),
+    ("--theme-logo-text", "logo_text_color"),
+    ("--theme-accent", "accent_color"),
+    ("--theme-body-bg", "body_bg_color"),
+    ("--theme-body-heading", "body_heading_color"),
+    ("--theme-body-text", "body_text_color"),
+    ("--theme-footer-bg", "footer_bg_color"),
+    ("--theme-footer-text", "footer_text_color"),
+    ("--theme-card-bg-timeline", "card_bg_timeline"),
+    ("--theme-card-bg-info", "card_bg_info"),
+    ("--theme-card-bg-rsvp", "card_bg_rsvp"),
+)
+
+# Hex, rgb()/rgba()/hsl()/hsla() or a named colour; anything else could
+# break out of the declaration, so it falls back to the default
+SAFE_COLOR = re.compile(r"^(#[0-9A-Fa-f]{3,8}|(rgb|rgba|hsl|hsla)\([0-9.,%\s]+\)|[A-Za-z]+)$")
+
+
+def _default(column: str) -> str:
+    return HomeContent.__table__.c[column].default.arg
+
+
+def render_theme_css(content: Optional[HomeContent]) -> bytes:
+    lines = [":root {"]
+    for variable, column in THEME_VARIABLES:
+        value = getattr(content, column, None) if content else None
+        if not value or not SAFE_COLOR.match(value.strip()):
+            value = _default(column)
+        lines.append(f"  {variable}: {value.strip()};")
+    lines.append("}")
+    return ("\n".join(lines) + "\n").encode()
+
+
+@cached(HomeContent)
+def theme_css() -> Tuple[bytes, str]:
+    """(stylesheet, content hash); a session is only opened on a cache miss"""
+    if database.SessionLocal is None:
+        raise Exception("Database not initialized")
+    db = database.SessionLocal()
+    try:
+        css = render_theme_css(get_home_content(db))
+    finally:
+        db.close()
+    return css, hashlib.sha256(css).hexdigest()[:12]
+
+
+def theme_url() -> str:
+    """Content-hash URL of the current stylesheet (safe to cache forever)"""
+    return f"/theme.{theme_css()[1]}.css"
@@ -0,0 +1,109 @@
+"""
+Content-addressed index of stored uploads.
+
+Each stored original is recorded under the SHA-256 of its bytes with the
+manifest returned for it (URL, size, variants), so uploading the same photo
+again returns that manifest instead of storing another copy. Every lookup
+hit and record stamps last_used_at: a handed-out URL may be saved into a
+content row only later, and the orphan cleanup spares recently used files.
+Each call opens its own short session: lookups run concurrently from async
+routes.
+"""
+import json
+from typing import Any, Dict, List, Optional
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from app.core import database
+from app.models.uploaded_file import UploadedFile
+from app.services.image_variants import srcset_manifest
+
+
+def _session():
+    if database.SessionLocal is None:
+        raise Exception("Database not initialized")
+    return database.SessionLocal()
+
+
+def _manifest(row: UploadedFile) -> Dict[str, Any]:
+    return srcset_manifest(
+        row.url, row.width, row.height, json.loads(row.variants or "[]"), row.placeholder, row.dominant_color
+    )
+
+
+def lookup(sha256: str) -> Optional[Dict[str, Any]]:
+    """Manifest of the stored upload with this digest, or None"""
+    db = _session()
+    try:
+        row = db.get(UploadedFile, sha256.lower())
+        if row is None:
+            return None
+        manifest = _manifest(row)
+        row.last_used_at = func.now()
+        db.commit()
+        return manifest
+    finally:
+        db.close()
+
+
+def known(digests: List[str]) -> List[str]:
+    """Those of digests that are indexed, in the given order (stamped as used)"""
+    wanted = {digest.lower() for digest in digests}
+    if not wanted:
+        return []
+    db = _session()
+    try:
+        found = {sha256 for (sha256,) in db.query(UploadedFile.sha256).filter(UploadedFile.sha256.in_(wanted))}
+        if found:
+            db.query(UploadedFile).filter(UploadedFile.sha256.in_(found)).update(
+                {UploadedFile.last_used_at: func.now()}, synchronize_session=False
+            )
+            db.commit()
+        return [digest for digest in digests if digest.lower() in found]
+    finally:
+        db.close()
+
+
+def record(sha256: str, name: str, content_type: str, size: int, manifest: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Index a stored upload and return the manifest to use: this one, or the
+    one already indexed if the same bytes were stored concurrently.
+    """
+    db = _session()
+    try:
+        db.add(UploadedFile(
+            sha256=sha256,
+            name=name,
+            url=manifest["url"],
+            content_type=content_type,
+            size=size,
+            width=manifest["width"],
+            height=manifest["height"],
+            variants=json.dumps(manifest["variants"]),
+            placeholder=manifest.get("placeholder"),
+            dominant_color=manifest.get("dominant_color"),
+            last_used_at=func.now(),
+        ))
+        try:
+            db.commit()
+            return manifest
+        except IntegrityError:
+            db.rollback()
+            row = db.get(UploadedFile, sha256)
+            if row is None:
+                return manifest
+            winner = _manifest(row)
+            row.last_used_at = func.now()
+            db.commit()
+            return winner
+    finally:
+        db.close()
+
+
+def forget(name: str) -> None:
+    """Drop the index entry of a deleted file"""
+    db = _session()
+    try:
+        db.query(UploadedFile).filter(UploadedFile.name == name).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
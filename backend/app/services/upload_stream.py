@@ -0,0 +1,341 @@
+"""
+Streaming multipart image uploads.
+
+The request body is parsed as it arrives instead of being buffered: the
+size limit is enforced from Content-Length before anything is read (and
+again while reading, for chunked bodies), the file type is checked from
+its magic bytes on the first chunk, and file data is handed to a sink in
+chunks, so memory stays bounded whatever the upload size. Batches stream
+each file into its own sink, one after another, from a single body, and
+may name files the server already has by digest instead of sending them.
+"""
+import hashlib
+import os
+import sys
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Iterable, List, Optional, Tuple, Union
+import multipart
+import multipart.exceptions
+from multipart.multipart import parse_options_header
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from app.core.storage import StorageBackend
+
+# Multipart boundaries and part headers on top of the file itself
+MULTIPART_OVERHEAD = 64 * 1024
+# Azure block size; also the most a sink buffers per upload
+BLOCK_SIZE = 1024 * 1024
+SNIFF_BYTES = 12
+# Longest value read from a digest field (a SHA-256 is 64 hex digits)
+MAX_DIGEST_FIELD = 128
+
+# (magic bytes, content type, canonical extension)
+IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg", ".jpg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png", ".png"),
+    (b"GIF87a", "image/gif", ".gif"),
+    (b"GIF89a", "image/gif", ".gif"),
+)
+
+
+class UploadRejected(Exception):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def sniff_image_type(head: bytes) -> Optional[Tuple[str, str]]:
+    """(content type, extension) from the first bytes of a file, or None"""
+    for signature, content_type, extension in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return content_type, extension
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp", ".webp"
+    return None
+
+
+class ReceivedImage:
+    def __init__(self, filename: str, content_type: str, extension: str):
+        self.filename = filename
+        self.content_type = content_type
+        self.extension = extension
+        self.size = 0
+
+
+class KnownUpload:
+    """A batch entry naming, by SHA-256, a file the client did not send because the server has it"""
+
+    def __init__(self, sha256: str):
+        self.sha256 = sha256
+
+
+class UploadSink:
+    """
+    Writes an upload to a local part file and, when the storage backend can
+    (Azure), stages it there as blocks as it arrives. Nothing is visible
+    until commit(); staged blocks that are never committed expire on their
+    own. The SHA-256 of the file is computed on the way through.
+    """
+
+    def __init__(self, part_path: Path, blob_stem: str, storage: StorageBackend):
+        self.part_path = part_path
+        self.blob_stem = blob_stem
+        self.storage = storage
+        self.blob_name: Optional[str] = None
+        self.staged: Optional[Any] = None
+        self.sha256 = hashlib.sha256()
+        self._file = None
+        self._buffer = bytearray()
+
+    async def open(self, image: ReceivedImage) -> None:
+        self.blob_name = f"{self.blob_stem}{image.extension}"
+        self._file = await run_in_threadpool(open, self.part_path, "wb")
+        self.staged = await self.storage.begin(self.blob_name)
+
+    async def write(self, chunk: bytes) -> None:
+        self.sha256.update(chunk)
+        await run_in_threadpool(self._file.write, chunk)
+        if self.staged is not None:
+            self._buffer += chunk
+            if len(self._buffer) >= BLOCK_SIZE:
+                await self._stage()
+
+    async def _stage(self) -> None:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        try:
+            await self.staged.stage(data)
+        except Exception as e:
+            print(f"Error staging blob block, falling back to local storage: {e}", file=sys.stderr)
+            self.staged = None
+
+    async def finish(self) -> None:
+        if self.staged is not None and self._buffer:
+            await self._stage()
+        self.close()
+
+    async def commit(self, content_type: str) -> Optional[str]:
+        """Store the upload in the backend and return its URL (None if the backend failed)"""
+        return await self.storage.save_part(self.part_path, self.blob_name, content_type, self.staged)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def discard(self) -> None:
+        self.close()
+        if self.part_path.exists():
+            os.unlink(self.part_path)
+
+
+class _ImagePartParser:
+    """
+    Callbacks for multipart.MultipartParser that pick out the files in one
+    field, and the values of digest_field. The callbacks are sync, so they
+    queue events for the reader: ("file", filename), ("data", bytes),
+    ("end", None) and ("known", digest).
+    """
+
+    def __init__(self, field_name: str, max_files: int, digest_field: Optional[str] = None):
+        self.field_name = field_name
+        self.max_files = max_files
+        self.digest_field = digest_field
+        self.files = 0
+        self.events: List[Tuple[str, Any]] = []
+        self._header_name = b""
+        self._header_value = b""
+        self._disposition = b""
+        self._in_file = False
+        self._digest: Optional[bytes] = None
+
+    def on_part_begin(self) -> None:
+        self._disposition = b""
+        self._in_file = False
+        self._digest = None
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_name += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        if self._header_name.lower() == b"content-disposition":
+            self._disposition = self._header_value
+        self._header_name = b""
+        self._header_value = b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._disposition)
+        name = options.get(b"name", b"").decode("utf-8", "replace")
+        if b"filename" in options:
+            if name != self.field_name:
+                return
+            self._count()
+            self.events.append(("file", options[b"filename"].decode("utf-8", "replace")))
+            self._in_file = True
+        elif self.digest_field is not None and name == self.digest_field:
+            self._count()
+            self._digest = b""
+
+    def _count(self) -> None:
+        self.files += 1
+        if self.files > self.max_files:
+            if self.max_files == 1:
+                raise UploadRejected(400, "Only one file can be uploaded at a time")
+            raise UploadRejected(400, f"At most {self.max_files} files can be uploaded at a time")
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._in_file:
+            self.events.append(("data", data[start:end]))
+        elif self._digest is not None and len(self._digest) <= MAX_DIGEST_FIELD:
+            self._digest += data[start:end]
+
+    def on_part_end(self) -> None:
+        if self._in_file:
+            self._in_file = False
+            self.events.append(("end", None))
+        elif self._digest is not None:
+            self.events.append(("known", self._digest.decode("utf-8", "replace").strip()))
+            self._digest = None
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+        }
+
+
+class _IncomingFile:
+    """Reader state for the file part currently being received"""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.head = b""
+        self.image: Optional[ReceivedImage] = None
+        self.sink: Optional[UploadSink] = None
+        self.error: Optional[UploadRejected] = None
+
+
+def _too_large(max_bytes: int, what: str = "File") -> UploadRejected:
+    return UploadRejected(413, f"{what} too large (max {max_bytes // (1024 * 1024)} MB)")
+
+
+async def stream_images(
+    request: Request,
+    new_sink: Callable[[], UploadSink],
+    max_bytes: int,
+    allowed_extensions: Iterable[str],
+    field_name: str = "files",
+    max_files: int = 1,
+    max_body: Optional[int] = None,
+    digest_field: Optional[str] = None,
+) -> AsyncIterator[Tuple[str, Optional[UploadSink], Union[ReceivedImage, KnownUpload, UploadRejected]]]:
+    """
+    Stream every image in field_name of a multipart request into its own
+    sink (from new_sink()), yielding (filename, sink, image) as each file
+    completes so it can be processed while the rest of the body arrives.
+    Each digest_field value, in the same order, is yielded as
+    (digest, None, KnownUpload) and counts towards max_files.
+
+    A file that fails its checks is yielded with an UploadRejected instead
+    of an image (its sink, if one was opened, is the caller's to discard);
+    when max_files is 1 the error is raised instead. Problems with the
+    request as a whole are always raised.
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise UploadRejected(400, "Expected a multipart/form-data upload")
+
+    # Reject oversized uploads before reading a single byte
+    if max_body is None:
+        max_body = max_bytes * max_files + MULTIPART_OVERHEAD
+    declared = request.headers.get("content-length")
+    if declared is not None and declared.isdigit() and int(declared) > max_body:
+        raise _too_large(max_body - MULTIPART_OVERHEAD, "File" if max_files == 1 else "Upload")
+
+    allowed_extensions = set(allowed_extensions)
+    part = _ImagePartParser(field_name, max_files, digest_field)
+    parser = multipart.MultipartParser(params[b"boundary"], part.callbacks())
+    current: Optional[_IncomingFile] = None
+    received = 0
+
+    def reject(error: UploadRejected) -> None:
+        if max_files == 1:
+            raise error
+        current.error = error
+
+    async def take(data: bytes) -> None:
+        if current.image is None:
+            current.head += data
+            if len(current.head) < SNIFF_BYTES:
+                return
+            sniffed = sniff_image_type(current.head)
+            if sniffed is None:
+                return reject(UploadRejected(400, "File is not a supported image"))
+            current.image = ReceivedImage(current.filename, *sniffed)
+            current.sink = new_sink()
+            await current.sink.open(current.image)
+            data, current.head = current.head, b""
+        current.image.size += len(data)
+        if current.image.size > max_bytes:
+            return reject(_too_large(max_bytes))
+        await current.sink.write(data)
+
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > max_body:
+            raise _too_large(max_body - MULTIPART_OVERHEAD, "File" if max_files == 1 else "Upload")
+        try:
+            parser.write(chunk)
+        except multipart.exceptions.FormParserError:
+            raise UploadRejected(400, "Malformed multipart body")
+
+        events, part.events = part.events, []
+        for kind, value in events:
+            if kind == "known":
+                yield value, None, KnownUpload(value)
+            elif kind == "file":
+                current = _IncomingFile(value)
+                if Path(value).suffix.lower() not in allowed_extensions:
+                    reject(UploadRejected(400, "Invalid file type"))
+            elif kind == "data":
+                if current.error is None and value:
+                    await take(value)
+            else:
+                if current.error is None and current.image is None:
+                    # Shorter than SNIFF_BYTES
+                    reject(UploadRejected(400, "File is not a supported image" if current.head else "File is empty"))
+                if current.error is None:
+                    await current.sink.finish()
+                    yield current.filename, current.sink, current.image
+                else:
+                    yield current.filename, current.sink, current.error
+                current = None
+
+    parser.finalize()
+    if current is not None:
+        raise UploadRejected(400, "Malformed multipart body")
+    if part.files == 0:
+        raise UploadRejected(400, "No file uploaded")
+
+
+async def receive_image(
+    request: Request,
+    sink: UploadSink,
+    max_bytes: int,
+    allowed_extensions: Iterable[str],
+    field_name: str = "file",
+) -> ReceivedImage:
+    """Stream the image in field_name of a multipart request into sink"""
+    image = None
+    async for _, _, image in stream_images(request, lambda: sink, max_bytes, allowed_extensions, field_name):
+        pass
+    return image
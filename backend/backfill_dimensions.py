@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Record pixel dimensions for image records that lack them, reading image headers only"""
+import argparse
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from app.core import cache, content_versions
+from app.core.database import SessionLocal, engine
+from app.services import site_content  # noqa: F401  (registers every content model)
+from app.models.home_content import HomeContent
+from app.models.wedding_info_section import WeddingInfoSection
+from app.services.image_metadata import (
+    IMAGE_MODELS, LOCAL_PREFIX, fetch_image, indexed_images, info_section_urls, set_info_sizes,
+)
+from app.services.image_variants import InvalidImage, image_size
+
+# Enough of a remote file for the header (and EXIF) of nearly every photo
+HEADER_BYTES = 64 * 1024
+
+
+def measure(url: str) -> Tuple[str, Optional[Tuple[int, int]], Optional[str]]:
+    """(url, (width, height) or None, error)"""
+    try:
+        try:
+            return url, image_size(fetch_image(url, HEADER_BYTES)), None
+        except InvalidImage:
+            if url.startswith(LOCAL_PREFIX):
+                raise
+            # Header beyond the first block (e.g. a large embedded thumbnail), or
+            # WebP, which Pillow only opens from the whole file
+            return url, image_size(fetch_image(url)), None
+    except Exception as e:
+        return url, None, str(e)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=16, help="concurrent reads/downloads")
+    parser.add_argument("--force", action="store_true", help="re-measure images that already have dimensions")
+    args = parser.parse_args()
+
+    if SessionLocal is None:
+        print("Database not initialized", file=sys.stderr)
+        return 1
+
+    # The commit then bumps the shared content versions, so running servers
+    # drop cached payloads and ETags from before the backfill
+    content_versions.start(engine, cache.tracked_tables())
+    db = SessionLocal()
+    try:
+        rows = [
+            row for model in IMAGE_MODELS
+            for row in db.query(model).filter(model.image_url.isnot(None), model.image_url != "").all()
+            if args.force or row.width is None
+        ]
+        homes = [
+            home for home in db.query(HomeContent).filter(HomeContent.hero_image_url.isnot(None)).all()
+            if home.hero_image_url and (args.force or home.hero_image_width is None)
+        ]
+        sections = db.query(WeddingInfoSection).all()
+        urls = {row.image_url for row in rows} | {home.hero_image_url for home in homes}
+        for section in sections:
+            known = set() if args.force or not section.image_sizes else set(json.loads(section.image_sizes))
+            urls.update(url for url in info_section_urls(section) if url not in known)
+
+        found: Dict[str, Dict[str, Any]] = {} if args.force else {
+            url: info for url, info in indexed_images(db, urls).items() if info["width"] and info["height"]
+        }
+        missing = sorted(urls - set(found))
+        print(f"{len(urls)} image URLs need dimensions; {len(found)} from the upload index, "
+              f"{len(missing)} to read with {args.workers} workers", file=sys.stdout)
+
+        failed = 0
+        with ThreadPoolExecutor(args.workers) as pool:
+            for url, size, error in pool.map(measure, missing):
+                if size:
+                    found[url] = {"width": size[0], "height": size[1]}
+                else:
+                    failed += 1
+                    print(f"  skipped {url}: {error}", file=sys.stderr)
+
+        for row in rows:
+            if row.image_url in found:
+                row.width, row.height = found[row.image_url]["width"], found[row.image_url]["height"]
+        for home in homes:
+            if home.hero_image_url in found:
+                home.hero_image_width = found[home.hero_image_url]["width"]
+                home.hero_image_height = found[home.hero_image_url]["height"]
+        for section in sections:
+            set_info_sizes(section, found)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"Error backfilling dimensions: {e}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        return 1
+    finally:
+        db.close()
+        content_versions.stop()
+
+    print(f"Measured {len(found)} image URLs ({failed} failed)", file=sys.stdout)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Compute placeholder previews and dominant colours for image records that lack them"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from app.core import cache, content_versions
+from app.core.database import SessionLocal, engine
+from app.services import site_content  # noqa: F401  (registers every content model)
+from app.models.uploaded_file import UploadedFile
+from app.models.wedding_info_section import WeddingInfoSection
+from app.services.image_metadata import (
+    IMAGE_MODELS, fetch_image, image_name, indexed_images, info_section_urls, set_info_placeholders,
+)
+from app.services.image_variants import build_placeholder
+
+
+def compute(url: str) -> Tuple[str, Optional[Dict[str, Any]], Optional[str]]:
+    """(url, {placeholder, dominant_color} or None, error) -- runs in a worker process"""
+    try:
+        result = build_placeholder(fetch_image(url))
+        return url, {"placeholder": result["placeholder"], "dominant_color": result["dominant_color"]}, None
+    except Exception as e:
+        return url, None, str(e)
+
+
+def apply(row, info: Dict[str, Any]) -> None:
+    row.placeholder, row.dominant_color = info["placeholder"], info["dominant_color"]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="decoding processes")
+    parser.add_argument("--force", action="store_true", help="recompute placeholders that are already set")
+    args = parser.parse_args()
+
+    if SessionLocal is None:
+        print("Database not initialized", file=sys.stderr)
+        return 1
+
+    # The commit then bumps the shared content versions, so running servers
+    # drop cached payloads and ETags from before the backfill
+    content_versions.start(engine, cache.tracked_tables())
+    db = SessionLocal()
+    try:
+        rows = [
+            row for model in IMAGE_MODELS
+            for row in db.query(model).filter(model.image_url.isnot(None), model.image_url != "").all()
+            if args.force or row.placeholder is None
+        ]
+        sections = db.query(WeddingInfoSection).all()
+        urls = {row.image_url for row in rows}
+        for section in sections:
+            known = set() if args.force or not section.image_placeholders else set(json.loads(section.image_placeholders))
+            urls.update(url for url in info_section_urls(section) if url not in known)
+
+        found: Dict[str, Dict[str, Any]] = {} if args.force else {
+            url: info for url, info in indexed_images(db, urls).items() if info["placeholder"]
+        }
+        missing = sorted(urls - set(found))
+        print(f"{len(urls)} image URLs need placeholders; {len(found)} from the upload index, "
+              f"{len(missing)} to decode with {args.workers} workers", file=sys.stdout)
+
+        failed = 0
+        if missing:
+            with ProcessPoolExecutor(args.workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+                for url, placeholder, error in pool.map(compute, missing, chunksize=4):
+                    if placeholder:
+                        found[url] = placeholder
+                    else:
+                        failed += 1
+                        print(f"  skipped {url}: {error}", file=sys.stderr)
+
+        for row in rows:
+            if row.image_url in found:
+                apply(row, found[row.image_url])
+        for section in sections:
+            set_info_placeholders(section, found)
+        for upload in db.query(UploadedFile).filter(UploadedFile.name.in_([image_name(url) for url in found])).all():
+            if upload.url in found and (args.force or upload.placeholder is None):
+                apply(upload, found[upload.url])
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"Error backfilling placeholders: {e}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        return 1
+    finally:
+        db.close()
+        content_versions.stop()
+
+    print(f"Filled {len(found)} image URLs ({failed} failed)", file=sys.stdout)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Latency of the public GETs and RSVP submission under high concurrency, with
+the database reached from threadpool handlers vs awaited on the async engine.
+
+"threadpool" mounts the previous handler style (sync def + get_db, so every
+request holds one of the threadpool's worker threads for its database round
+trip); "async" is the app's real routers on get_async_db. The benchmark
+sets ASYNC_DB_ROUTES=on so that the async routes also run on SQLite; with
+ASYNC_DB_ROUTES=off the second row measures the real routers on a Session
+instead, as the app serves SQLite by default. The response cache is
+disabled (CACHE_MAX_ENTRIES=0) so every GET reaches the database.
+
+The server runs in its own process with one uvicorn worker; --concurrency
+clients keep a request in flight each; non-200 answers (e.g. connection
+pool timeouts) are counted as errors. Under each row, the pool that served
+it reports its checkout waits (p99 is the histogram bucket it falls in),
+peak connections in use and timeouts, from /debug/pool. Runs against a temporary SQLite
+database unless DATABASE_URL is set (e.g. a scratch Postgres database; its
+tables are created and rows added to them). aiosqlite runs every statement
+on a helper thread, so on SQLite the async routes do more work per request
+than the threadpool ones; the comparison that matters is on PostgreSQL.
+
+Usage (from backend/):
+    python benchmarks/bench_async_db.py [--rows 50] [--concurrency 100] [--requests 2000]
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+_db_dir = tempfile.mkdtemp(prefix="wedding-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/bench.db")
+os.environ["CACHE_MAX_ENTRIES"] = "0"
+os.environ.setdefault("ASYNC_DB_ROUTES", "on")
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+from fastapi import APIRouter, Depends, FastAPI, Response  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+from app.core import database, db_pool  # noqa: E402
+from app.core.database import Base, SessionLocal, engine, get_db  # noqa: E402
+from app.core.responses import json_bytes_response  # noqa: E402
+from app.models.gallery_image import GalleryImage  # noqa: E402
+from app.models.rsvp import RSVP  # noqa: E402
+from app.routers import gallery, rsvp  # noqa: E402
+from app.schemas.rsvp import RSVP as RSVPSchema, RSVPCreate  # noqa: E402
+from app.services.site_content import gallery_images_json  # noqa: E402
+
+RSVP_BODY = {"guest_name": "Bench Guest", "email": "bench@example.com", "num_attendees": 2, "message": "See you there"}
+
+
+def seed(rows: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        for i in range(rows):
+            db.add(GalleryImage(image_url=f"https://example.blob.core.windows.net/photos/{i:05d}.jpg",
+                                caption=f"Photo {i}", order=i))
+        db.commit()
+    finally:
+        db.close()
+
+
+def threadpool_router() -> APIRouter:
+    """The handlers as they were before the async port"""
+    router = APIRouter(prefix="/threadpool")
+
+    @router.get("/api/gallery")
+    def get_gallery(response: Response, db: Session = Depends(get_db)):
+        return json_bytes_response(gallery_images_json(db), response)
+
+    @router.post("/api/rsvp", response_model=RSVPSchema)
+    def create_rsvp(body: RSVPCreate, db: Session = Depends(get_db)):
+        data = body.model_dump(exclude={"attendance", "guest_invitation_id"})
+        db_rsvp = RSVP(**data)
+        db.add(db_rsvp)
+        db.commit()
+        db.refresh(db_rsvp)
+        return db_rsvp
+
+    return router
+
+
+def run_server(port: int) -> None:
+    app = FastAPI()
+    app.include_router(threadpool_router())
+    app.include_router(gallery.router)
+    app.include_router(rsvp.router)
+    app.get("/debug/pool")(db_pool.stats)
+    # Queued clients can sit idle for seconds; keep their connections open
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning", timeout_keep_alive=120)
+
+
+async def burst(http: httpx.AsyncClient, url: str, post: bool, requests: int, concurrency: int) -> Tuple[List[float], List[str]]:
+    """Latencies (seconds) of requests sent by concurrency clients at once, and the failures"""
+    latencies: List[float] = []
+    failed: List[str] = []
+    remaining = iter(range(requests))
+
+    async def client() -> None:
+        for _ in remaining:
+            start = time.perf_counter()
+            r = await (http.post(url, json=RSVP_BODY) if post else http.get(url))
+            latencies.append(time.perf_counter() - start)
+            if r.status_code != 200:
+                failed.append(f"{r.status_code} {r.text[:120]}")
+
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return latencies, failed
+
+
+async def load(url: str, post: bool, requests: int, concurrency: int) -> Tuple[List[float], List[str], float]:
+    """Sorted latencies and failures after a warm-up that opens every connection, and the wall time"""
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=120) as http:
+        await burst(http, url, post, concurrency, concurrency)
+        start = time.perf_counter()
+        latencies, failed = await burst(http, url, post, requests, concurrency)
+        elapsed = time.perf_counter() - start
+    return sorted(latencies), failed, elapsed
+
+
+def percentile(latencies: List[float], p: float) -> float:
+    return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+
+def pool_summary(before: dict, after: dict) -> str:
+    """Checkout waits and timeouts between two /debug/pool snapshots of one engine"""
+    if "wait_ms" not in after:
+        return f"  pool ({after['pool']}): {after['checkouts'] - before['checkouts']} checkouts"
+    buckets = {bound: count - before["wait_ms"]["buckets"][bound] for bound, count in after["wait_ms"]["buckets"].items()}
+    total, seen, p99 = sum(buckets.values()), 0, "+Inf"
+    for bound, count in buckets.items():
+        seen += count
+        if seen >= total * 0.99:
+            p99 = bound
+            break
+    return (f"  pool: wait p99 <= {p99} ms, max {after['wait_ms']['max']:.0f} ms; "
+            f"peak {after['peak_in_use']}/{after['size'] + after['max_overflow']} in use; "
+            f"{after['timeouts'] - before['timeouts']} timeouts, {after['invalidations'] - before['invalidations']} invalidations")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50, help="gallery rows returned by each GET")
+    parser.add_argument("--concurrency", type=int, default=100, help="requests in flight at once")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per scenario")
+    args = parser.parse_args()
+
+    if database.AsyncSessionLocal is None and os.environ["ASYNC_DB_ROUTES"] == "on":
+        raise SystemExit("No async driver for DATABASE_URL (install asyncpg / aiosqlite)")
+    routes, routes_pool = ("async", "async") if database.AsyncSessionLocal is not None else ("session", "sync")
+    seed(args.rows)
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = multiprocessing.Process(target=run_server, args=(port,), daemon=True)
+    server.start()
+    base = f"http://127.0.0.1:{port}"
+    for _ in range(200):
+        try:
+            httpx.get(f"{base}/api/gallery").raise_for_status()
+            break
+        except httpx.HTTPError:
+            time.sleep(0.05)
+
+    print(f"{engine.url.get_backend_name()}, {args.rows} gallery rows, cache off; "
+          f"{args.requests} requests per row, {args.concurrency} in flight")
+    print(f"{'scenario':<26}{'req/s':>8}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}{'errors':>8}")
+    try:
+        for label, path, post in (("GET /api/gallery", "/api/gallery", False), ("POST /api/rsvp", "/api/rsvp", True)):
+            for variant, prefix, pool in (("threadpool", "/threadpool", "sync"), (routes, "", routes_pool)):
+                before = httpx.get(f"{base}/debug/pool").json()[pool]
+                latencies, failed, elapsed = asyncio.run(
+                    load(f"{base}{prefix}{path}", post, args.requests, args.concurrency)
+                )
+                print(f"{label + ' ' + variant:<26}{args.requests / elapsed:>8.0f}"
+                      f"{percentile(latencies, 0.5):>9.1f}{percentile(latencies, 0.99):>9.1f}"
+                      f"{latencies[-1] * 1000:>9.1f}{len(failed):>8}")
+                print(pool_summary(before, httpx.get(f"{base}/debug/pool").json()[pool]))
+                if failed:
+                    print(f"  first error: {failed[0]}")
+    finally:
+        server.terminate()
+        server.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Time to save the admin guest list, before and after diff-based saving.
+
+"before" is the original replace-all handler: clear RSVP links, delete
+every invitation and db.add() each submitted row. "after" is
+guest_list_sync.replace_invitations. Each is timed, on a fresh database,
+for three saves in a row of an N-household list:
+
+- first: into an empty table
+- resave: the same list again
+- edited: 5% of households get new participants, 5% are dropped, 5% added
+
+Statements counts executemany batches as one. Runs against a temporary
+SQLite file unless DATABASE_URL is set.
+
+Usage (from backend/):
+    python benchmarks/bench_guest_list.py [--sizes 1000,10000]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+_db_dir = tempfile.mkdtemp(prefix="wedding-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/bench.db")
+
+from sqlalchemy import event  # noqa: E402
+from app.core.database import Base, SessionLocal, engine  # noqa: E402
+from app.models.guest_invitation import GuestInvitation  # noqa: E402
+from app.models.rsvp import RSVP  # noqa: E402
+from app.schemas.guest_invitation import InvitationUpsert  # noqa: E402
+from app.services.guest_list_sync import replace_invitations  # noqa: E402
+
+statements = 0
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _count(conn, cursor, statement, parameters, context, executemany):
+    global statements
+    statements += 1
+
+
+def legacy_replace(db, invitations: List[InvitationUpsert]) -> None:
+    db.query(RSVP).filter(RSVP.guest_invitation_id.isnot(None)).update(
+        {RSVP.guest_invitation_id: None},
+        synchronize_session=False,
+    )
+    db.query(GuestInvitation).delete(synchronize_session=False)
+    for inv in invitations:
+        db.add(GuestInvitation(display_label=inv.display_label[:500], participants=json.dumps(inv.participants)))
+    db.commit()
+
+
+def household(i: int, participants: int = 2) -> InvitationUpsert:
+    names = [f"Guest {i:05d}-{n}" for n in range(participants)]
+    return InvitationUpsert(display_label=" & ".join(names), participants=names)
+
+
+def lists(size: int):
+    first = [household(i) for i in range(size)]
+    step = 20  # 5%
+    edited = [
+        household(i, 3) if i % step == 1 else household(i)
+        for i in range(size) if i % step != 0
+    ] + [household(size + i) for i in range(0, size, step)]
+    return [("first", first), ("resave", first), ("edited", edited)]
+
+
+def run(save: Callable, size: int) -> List[tuple]:
+    global statements
+    Base.metadata.drop_all(bind=engine, tables=[RSVP.__table__, GuestInvitation.__table__])
+    Base.metadata.create_all(bind=engine, tables=[GuestInvitation.__table__, RSVP.__table__])
+    results = []
+    for name, invitations in lists(size):
+        db = SessionLocal()
+        try:
+            statements = 0
+            start = time.perf_counter()
+            save(db, invitations)
+            elapsed = time.perf_counter() - start
+            results.append((name, elapsed * 1000, statements, db.query(GuestInvitation.id).count()))
+        finally:
+            db.close()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000", help="households per list")
+    args = parser.parse_args()
+
+    print(f"{engine.url.get_backend_name()}")
+    print(f"{'households':>10} {'save':<8}{'before ms':>11}{'stmts':>8}{'after ms':>11}{'stmts':>8}{'speedup':>9}")
+    for size in (int(size) for size in args.sizes.split(",")):
+        before = run(legacy_replace, size)
+        after = run(replace_invitations, size)
+        for (name, old_ms, old_statements, old_rows), (_, new_ms, new_statements, new_rows) in zip(before, after):
+            assert old_rows == new_rows, (name, old_rows, new_rows)
+            print(f"{size:>10} {name:<8}{old_ms:>11.1f}{old_statements:>8}{new_ms:>11.1f}{new_statements:>8}"
+                  f"{old_ms / new_ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
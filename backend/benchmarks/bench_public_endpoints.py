@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Requests/sec of the public content endpoints, before and after pre-serialization.
+
+"before" mounts the original handler style (ORM rows validated through
+response_model on every request); "after" is the app's real routers, which
+serve cached JSON bytes. Both run against the same seeded SQLite database.
+
+Usage (from backend/):
+    python benchmarks/bench_public_endpoints.py [--rows 200] [--requests 500]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+_db_dir = tempfile.mkdtemp(prefix="wedding-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/bench.db"
+
+from datetime import time as dt_time  # noqa: E402
+from fastapi import APIRouter, Depends, FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+from app.core.database import Base, SessionLocal, engine, get_db  # noqa: E402
+from app.models.home_content import HomeContent  # noqa: E402
+from app.models.story_section import StorySection  # noqa: E402
+from app.models.story_image import StoryImage  # noqa: E402
+from app.models.wedding_info_section import WeddingInfoSection  # noqa: E402
+from app.models.timeline_event import TimelineEvent  # noqa: E402
+from app.models.gallery_image import GalleryImage  # noqa: E402
+from app.models.gift_item import GiftItem  # noqa: E402
+from app.routers import gallery, gifts, home, info, story, timeline  # noqa: E402
+from app.schemas.home_content import HomeContent as HomeContentSchema  # noqa: E402
+from app.schemas.story import StorySection as StorySectionSchema, StoryImage as StoryImageSchema  # noqa: E402
+from app.schemas.wedding_info import WeddingInfoSection as WeddingInfoSectionSchema  # noqa: E402
+from app.schemas.timeline import TimelineEvent as TimelineEventSchema  # noqa: E402
+from app.schemas.gallery import GalleryImage as GalleryImageSchema  # noqa: E402
+from app.schemas.gifts import GiftItem as GiftItemSchema  # noqa: E402
+from app.services import site_content  # noqa: E402
+
+ENDPOINTS = [
+    "/api/home",
+    "/api/story/sections",
+    "/api/story/images",
+    "/api/info",
+    "/api/timeline",
+    "/api/gallery",
+    "/api/gifts",
+]
+
+
+def seed(rows: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        db.add(HomeContent(hero_text="Bianca & Joel", subtitle="Join us for our special day"))
+        for i in range(rows):
+            url = f"https://example.blob.core.windows.net/photos/{i:05d}.jpg"
+            db.add(StorySection(title=f"Chapter {i}", content="Lorem ipsum " * 40, order=i))
+            db.add(StoryImage(image_url=url, caption=f"Moment {i}", order=i))
+            db.add(WeddingInfoSection(
+                sort_order=i, title=f"Info {i}", description="Details " * 20,
+                section_type="ceremony", image_url=url, gallery_urls=f'["{url}", "{url}?2"]',
+            ))
+            db.add(TimelineEvent(time=dt_time(12 + i % 10, 0), title=f"Event {i}", description="Party", order=i))
+            db.add(GalleryImage(image_url=url, caption=f"Photo {i}", order=i))
+            db.add(GiftItem(title=f"Gift {i}", link="https://example.com", item_type="external", order=i))
+        db.commit()
+    finally:
+        db.close()
+
+
+def legacy_app() -> FastAPI:
+    """The pre-serialization handlers: re-query and re-validate per request"""
+    router = APIRouter()
+
+    @router.get("/api/home", response_model=HomeContentSchema)
+    def get_home(db: Session = Depends(get_db)):
+        return site_content.get_home_content(db)
+
+    @router.get("/api/story/sections", response_model=List[StorySectionSchema])
+    def get_sections(db: Session = Depends(get_db)):
+        return site_content.list_story_sections(db)
+
+    @router.get("/api/story/images", response_model=List[StoryImageSchema])
+    def get_images(db: Session = Depends(get_db)):
+        return site_content.list_story_images(db)
+
+    @router.get("/api/info", response_model=List[WeddingInfoSectionSchema])
+    def get_info(db: Session = Depends(get_db)):
+        return site_content.list_info_sections(db)
+
+    @router.get("/api/timeline", response_model=List[TimelineEventSchema])
+    def get_timeline(db: Session = Depends(get_db)):
+        return site_content.list_timeline_events(db)
+
+    @router.get("/api/gallery", response_model=List[GalleryImageSchema])
+    def get_gallery(db: Session = Depends(get_db)):
+        return site_content.list_gallery_images(db)
+
+    @router.get("/api/gifts", response_model=List[GiftItemSchema])
+    def get_gifts(db: Session = Depends(get_db)):
+        return site_content.list_gift_items(db)
+
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+def current_app() -> FastAPI:
+    app = FastAPI()
+    for module in (home, story, info, timeline, gallery, gifts):
+        app.include_router(module.router)
+    return app
+
+
+def measure(client: TestClient, path: str, requests: int) -> float:
+    client.get(path).raise_for_status()  # warm up (fills the cache for "after")
+    start = time.perf_counter()
+    for _ in range(requests):
+        client.get(path)
+    return requests / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200, help="rows seeded per content table")
+    parser.add_argument("--requests", type=int, default=500, help="requests per endpoint")
+    args = parser.parse_args()
+
+    seed(args.rows)
+    before = TestClient(legacy_app())
+    after = TestClient(current_app())
+
+    print(f"{args.rows} rows per table, {args.requests} requests per endpoint")
+    print(f"{'endpoint':<22}{'before req/s':>14}{'after req/s':>14}{'speedup':>10}")
+    for path in ENDPOINTS:
+        rps_before = measure(before, path, args.requests)
+        rps_after = measure(after, path, args.requests)
+        print(f"{path:<22}{rps_before:>14.0f}{rps_after:>14.0f}{rps_after / rps_before:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Time to save a gallery reorder, before and after the shared reorder service.
+
+"before" is the original handler: find each id with next() over the loaded
+rows, assign its order, commit, and SELECT the whole table again.
+"after" is reorder.reorder. Both return the ordered rows serialized the
+way the route's response_model does. Each drag is timed on an N-photo
+gallery that starts in id order:
+
+- swap: two neighbouring photos trade places
+- to-top: the last photo is dragged to the front, shifting every other one
+- reverse: the whole list is reversed
+
+Statements counts executemany batches as one. Runs against a temporary
+SQLite file unless DATABASE_URL is set.
+
+Usage (from backend/):
+    python benchmarks/bench_reorder.py [--sizes 100,1000,5000] [--repeat 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+_db_dir = tempfile.mkdtemp(prefix="wedding-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/bench.db")
+
+from sqlalchemy import event, insert  # noqa: E402
+from app.core.database import Base, SessionLocal, engine  # noqa: E402
+from app.models.gallery_image import GalleryImage  # noqa: E402
+from app.schemas.gallery import GalleryImage as GalleryImageSchema  # noqa: E402
+from app.services.reorder import reorder  # noqa: E402
+
+statements = 0
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _count(conn, cursor, statement, parameters, context, executemany):
+    global statements
+    statements += 1
+
+
+def legacy_reorder(db, image_ids: List[int]):
+    images = db.query(GalleryImage).filter(GalleryImage.id.in_(image_ids)).all()
+    assert len(images) == len(image_ids)
+    for order, image_id in enumerate(image_ids):
+        image = next(img for img in images if img.id == image_id)
+        image.order = order
+    db.commit()
+    return db.query(GalleryImage).order_by(GalleryImage.order).all()
+
+
+def service_reorder(db, image_ids: List[int]):
+    return reorder(db, GalleryImage.order, image_ids)
+
+
+def drags(size: int):
+    ids = list(range(1, size + 1))
+    middle = size // 2
+    swap = ids[:middle] + [ids[middle + 1], ids[middle]] + ids[middle + 2:]
+    return [("swap", swap), ("to-top", ids[-1:] + ids[:-1]), ("reverse", ids[::-1])]
+
+
+def reset(size: int) -> None:
+    Base.metadata.drop_all(bind=engine, tables=[GalleryImage.__table__])
+    Base.metadata.create_all(bind=engine, tables=[GalleryImage.__table__])
+    with engine.begin() as conn:
+        conn.execute(insert(GalleryImage), [
+            {"image_url": f"https://example.blob.core.windows.net/photos/{i:05d}.jpg",
+             "caption": f"Photo {i}", "order": i}
+            for i in range(size)
+        ])
+
+
+def run(save: Callable, size: int, repeat: int) -> List[tuple]:
+    global statements
+    results = []
+    for name, image_ids in drags(size):
+        timings = []
+        for _ in range(repeat):
+            reset(size)
+            db = SessionLocal()
+            try:
+                statements = 0
+                start = time.perf_counter()
+                rows = save(db, image_ids)
+                body = [GalleryImageSchema.model_validate(row).model_dump() for row in rows]
+                timings.append(time.perf_counter() - start)
+            finally:
+                db.close()
+        assert [row["id"] for row in body] == image_ids, name
+        results.append((name, statistics.median(timings) * 1000, statements))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="100,1000,5000", help="photos in the gallery")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per drag; the median is shown")
+    args = parser.parse_args()
+
+    print(f"{engine.url.get_backend_name()}")
+    print(f"{'photos':>7} {'drag':<8}{'before ms':>11}{'stmts':>8}{'after ms':>11}{'stmts':>8}{'speedup':>9}")
+    for size in (int(size) for size in args.sizes.split(",")):
+        before = run(legacy_reorder, size, args.repeat)
+        after = run(service_reorder, size, args.repeat)
+        for (name, old_ms, old_statements), (_, new_ms, new_statements) in zip(before, after):
+            print(f"{size:>7} {name:<8}{old_ms:>11.1f}{old_statements:>8}{new_ms:>11.1f}{new_statements:>8}"
+                  f"{old_ms / new_ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
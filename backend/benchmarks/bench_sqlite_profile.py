@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Mixed read/write traffic against a SQLite file, per SQLITE_PROFILE.
+
+For each profile the real app (app.main:app) is started with uvicorn on a
+fresh database file. The file starts in SQLite's rollback journal mode,
+which "default" keeps and "production" switches to WAL. --concurrency
+clients then send --requests requests between them:
+
+- read: GET /api/site, which reads every content table
+- rsvp: POST /api/rsvp, one insert
+- edit: PUT /api/gallery/{id}, an admin caption change that also bumps the
+  shared content version rows
+
+The response cache is off (CACHE_MAX_ENTRIES=0) so that reads reach the
+database; pass --cache to keep it on. Lock errors are responses failing
+with "database is locked", counted from the client side (the RSVP route
+answers 400 with the message) and from the server log (unhandled errors
+become 500s).
+
+Usage (from backend/):
+    python benchmarks/bench_sqlite_profile.py [--workers 2] [--concurrency 32] [--requests 3000] [--mix 70,20,10]
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+OPERATIONS = ("read", "rsvp", "edit")
+ADMIN = {"username": "bench", "password": "bench-password"}
+LOCKED = "database is locked"
+
+
+def start_server(profile: str, workdir: Path, workers: int, cache: bool, log_name: str) -> Tuple[subprocess.Popen, str]:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{workdir}/bench.db",
+        SQLITE_PROFILE=profile,
+        STATIC_DIR=str(workdir / "uploads"),
+        ADMIN_USERNAME=ADMIN["username"],
+        ADMIN_PASSWORD=ADMIN["password"],
+        AZURE_STORAGE_CONNECTION_STRING="",
+        STORAGE_BACKEND="local",
+    )
+    if not cache:
+        env["CACHE_MAX_ENTRIES"] = "0"
+    log = open(workdir / log_name, "w")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning", "--timeout-keep-alive", "120"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=log,
+    )
+    base = f"http://127.0.0.1:{port}"
+    for _ in range(600):
+        if server.poll() is not None:
+            raise SystemExit(f"server exited; see {workdir / log_name}")
+        try:
+            if httpx.get(f"{base}/api/home").status_code == 200:
+                return server, base
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    server.terminate()
+    raise SystemExit("server did not start")
+
+
+def seed(base: str, rows: int) -> Dict[str, str]:
+    token = httpx.post(f"{base}/auth/login", json=ADMIN).raise_for_status().json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    with httpx.Client(base_url=base, headers=headers) as http:
+        for i in range(rows):
+            http.post("/api/gallery", json={
+                "image_url": f"https://example.blob.core.windows.net/photos/{i:05d}.jpg",
+                "caption": f"Photo {i}", "order": i,
+            }).raise_for_status()
+    return headers
+
+
+async def traffic(base: str, headers: Dict[str, str], rows: int, requests: int, concurrency: int,
+                  weights: List[int]) -> Dict[str, Dict[str, list]]:
+    results = {op: {"latencies": [], "errors": [], "locked": 0} for op in OPERATIONS}
+    remaining = iter(range(requests))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async def client(worker: int, http: httpx.AsyncClient) -> None:
+        rng = random.Random(worker)
+        for i in remaining:
+            op = rng.choices(OPERATIONS, weights)[0]
+            start = time.perf_counter()
+            if op == "read":
+                r = await http.get("/api/site")
+            elif op == "rsvp":
+                r = await http.post("/api/rsvp", json={
+                    "guest_name": f"Guest {i}", "email": f"guest{i}@example.com", "num_attendees": 2,
+                })
+            else:
+                r = await http.put(f"/api/gallery/{rng.randint(1, rows)}", headers=headers,
+                                   json={"caption": f"Edited {i}"})
+            result = results[op]
+            result["latencies"].append(time.perf_counter() - start)
+            if r.status_code != 200:
+                result["errors"].append(r.status_code)
+                if LOCKED in r.text:
+                    result["locked"] += 1
+
+    async with httpx.AsyncClient(base_url=base, limits=limits, timeout=120) as http:
+        await asyncio.gather(*(client(worker, http) for worker in range(concurrency)))
+    return results
+
+
+def p99_ms(latencies: List[float]) -> float:
+    if not latencies:
+        return 0.0
+    latencies = sorted(latencies)
+    return latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=2, help="uvicorn worker processes")
+    parser.add_argument("--concurrency", type=int, default=32, help="requests in flight at once")
+    parser.add_argument("--requests", type=int, default=3000, help="requests per profile")
+    parser.add_argument("--rows", type=int, default=50, help="gallery rows (edits pick one at random)")
+    parser.add_argument("--mix", default="70,20,10", help="read,rsvp,edit weights")
+    parser.add_argument("--cache", action="store_true", help="leave the response cache on")
+    parser.add_argument("--profiles", default="default,production", help="SQLITE_PROFILE values to run, in order")
+    args = parser.parse_args()
+    weights = [int(weight) for weight in args.mix.split(",")]
+    if len(weights) != len(OPERATIONS):
+        raise SystemExit("--mix takes three weights: read,rsvp,edit")
+
+    print(f"{args.workers} workers, {args.concurrency} clients, {args.requests} requests per profile, "
+          f"mix read/rsvp/edit {args.mix}, cache {'on' if args.cache else 'off'}")
+    print(f"{'profile':<12}{'req/s':>8}{'read p99':>10}{'rsvp p99':>10}{'edit p99':>10}{'errors':>8}{'locked':>8}{'lock %':>8}")
+    for profile in args.profiles.split(","):
+        workdir = Path(tempfile.mkdtemp(prefix=f"wedding-bench-{profile}-"))
+        (workdir / "uploads").mkdir()
+        # One worker creates the schema and admin user first; workers starting
+        # together on an empty file race each other to do it
+        server, _ = start_server(profile, workdir, 1, args.cache, "init.log")
+        server.terminate()
+        server.wait()
+        server, base = start_server(profile, workdir, args.workers, args.cache, "server.log")
+        try:
+            headers = seed(base, args.rows)
+            start = time.perf_counter()
+            results = asyncio.run(traffic(base, headers, args.rows, args.requests, args.concurrency, weights))
+            elapsed = time.perf_counter() - start
+        finally:
+            server.terminate()
+            server.wait()
+        errors = sum(len(result["errors"]) for result in results.values())
+        # 500s only name the cause in the server log; the RSVP route's 400s carry it in the body
+        logged = sum(
+            1 for line in (workdir / "server.log").read_text(errors="replace").splitlines()
+            if line.startswith("sqlalchemy.exc.OperationalError") and LOCKED in line
+        )
+        locked = logged + results["rsvp"]["locked"]
+        print(f"{profile:<12}{args.requests / elapsed:>8.0f}"
+              + "".join(f"{p99_ms(results[op]['latencies']):>10.0f}" for op in OPERATIONS)
+              + f"{errors:>8}{locked:>8}{locked / args.requests * 100:>7.1f}%")
+        for op in OPERATIONS:
+            if results[op]["errors"]:
+                statuses = Counter(results[op]["errors"])
+                print(f"  {op} errors: " + ", ".join(f"{count} x {status}" for status, count in sorted(statuses.items())))
+
+
+if __name__ == "__main__":
+    main()
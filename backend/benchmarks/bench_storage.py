@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Upload and serve throughput per storage backend.
+
+Upload: files are received through the same UploadSink as the upload route
+(part file on disk, blocks staged on Azure) and committed to each backend,
+--concurrency at a time. Serve: --concurrency HTTP clients GET the stored
+files whole and as 256 KB byte ranges. Local storage is served twice by one
+uvicorn worker: through the original StaticFiles mount ("local/starlette")
+and through the app's CachedStaticFiles ("local"), which adds ranges and
+hands files to the server when it offers sendfile. Azure blobs are fetched
+from their public URLs. Memory storage has nothing to serve over HTTP.
+
+Azure runs when AZURE_STORAGE_CONNECTION_STRING or AZURITE_CONNECTION_STRING
+is set (e.g. `azurite-blob --loose`).
+
+Usage (from backend/):
+    python benchmarks/bench_storage.py [--files 32] [--size-mb 4] [--concurrency 8] [--requests 400]
+"""
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+_bench_dir = tempfile.mkdtemp(prefix="wedding-bench-")
+os.environ["STATIC_DIR"] = f"{_bench_dir}/uploads"
+if os.environ.get("AZURITE_CONNECTION_STRING"):
+    os.environ.setdefault("AZURE_STORAGE_CONNECTION_STRING", os.environ["AZURITE_CONNECTION_STRING"])
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from fastapi.staticfiles import StaticFiles  # noqa: E402
+from app.core import azure_storage, azure_storage_aio, storage  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.static_files import CachedStaticFiles  # noqa: E402
+from app.services.upload_stream import BLOCK_SIZE, ReceivedImage, UploadSink  # noqa: E402
+
+RANGE_BYTES = 256 * 1024
+
+
+def upload_all(backend: storage.StorageBackend, data: bytes, files: int, concurrency: int) -> Tuple[List[str], float]:
+    """URLs of files stored through an UploadSink, and how long that took"""
+    part_dir = Path(settings.STATIC_DIR)
+
+    async def one(limit: asyncio.Semaphore) -> str:
+        async with limit:
+            stem = str(uuid.uuid4())
+            sink = UploadSink(part_dir / f".{stem}.part", stem, backend)
+            try:
+                await sink.open(ReceivedImage("photo.jpg", "image/jpeg", ".jpg"))
+                for start in range(0, len(data), BLOCK_SIZE):
+                    await sink.write(data[start:start + BLOCK_SIZE])
+                await sink.finish()
+                url = await sink.commit("image/jpeg")
+                if url is None:
+                    raise SystemExit(f"{backend.name} did not store the file")
+                return url
+            finally:
+                sink.discard()
+
+    async def run() -> List[str]:
+        limit = asyncio.Semaphore(concurrency)
+        try:
+            return await asyncio.gather(*(one(limit) for _ in range(files)))
+        finally:
+            await azure_storage_aio.close()
+
+    start = time.perf_counter()
+    urls = asyncio.run(run())
+    return urls, time.perf_counter() - start
+
+
+def serve(app: FastAPI) -> Tuple[uvicorn.Server, threading.Thread]:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread
+
+
+def fetch_all(urls: List[str], requests: int, concurrency: int, size: int, ranged: bool) -> Tuple[float, float]:
+    """(requests/s, MB/s) of GETs spread over urls"""
+    received = [0] * concurrency
+
+    def client(worker: int) -> None:
+        with httpx.Client(timeout=120) as http:
+            for i in range(worker, requests, concurrency):
+                headers = {}
+                if ranged:
+                    offset = (i * RANGE_BYTES) % max(size - RANGE_BYTES, 1)
+                    headers["Range"] = f"bytes={offset}-{offset + RANGE_BYTES - 1}"
+                r = http.get(urls[i % len(urls)], headers=headers)
+                if (r.status_code != 206) if ranged else not r.is_success:
+                    raise SystemExit(f"GET {r.url} returned {r.status_code}")
+                received[worker] += len(r.content)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(client, range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return requests / elapsed, sum(received) / elapsed / 1e6
+
+
+def row(name: str, upload: Optional[Tuple[int, int, float]], full=None, ranged=None) -> None:
+    cells = [f"{name:<18}"]
+    if upload:
+        files, size, elapsed = upload
+        cells.append(f"{files * size / elapsed / 1e6:>10.1f}{files / elapsed:>9.1f}")
+    else:
+        cells.append(f"{'-':>10}{'-':>9}")
+    for result in (full, ranged):
+        cells.append(f"{result[0]:>10.0f}{result[1]:>10.1f}" if result else f"{'-':>10}{'-':>10}")
+    print("".join(cells))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=32, help="files stored per backend")
+    parser.add_argument("--size-mb", type=float, default=4, help="size of each file")
+    parser.add_argument("--concurrency", type=int, default=8, help="uploads / HTTP clients at once")
+    parser.add_argument("--requests", type=int, default=400, help="GETs per serve scenario")
+    args = parser.parse_args()
+
+    Path(settings.STATIC_DIR).mkdir(parents=True, exist_ok=True)
+    size = int(args.size_mb * 1e6)
+    data = os.urandom(size)
+    backends = [storage.MemoryStorage(), storage.LocalStorage()]
+    if settings.AZURE_STORAGE_CONNECTION_STRING:
+        if azure_storage.get_container_client() is None:
+            raise SystemExit("Blob endpoint unreachable; start Azurite or unset the connection string")
+        backends.append(storage.AzureStorage())
+
+    print(f"{args.files} files of {size / 1e6:.1f} MB, {args.concurrency} at a time; "
+          f"{args.requests} GETs per serve column ({RANGE_BYTES // 1024} KB ranges)")
+    print(f"{'backend':<18}{'up MB/s':>10}{'files/s':>9}{'full r/s':>10}{'MB/s':>10}{'range r/s':>10}{'MB/s':>10}")
+
+    for backend in backends:
+        urls, elapsed = upload_all(backend, data, args.files, args.concurrency)
+        upload = (args.files, size, elapsed)
+        if backend.name == "memory":
+            row(backend.name, upload)
+            continue
+        if backend.name == "azure":
+            row(backend.name, upload,
+                fetch_all(urls, args.requests, args.concurrency, size, ranged=False),
+                fetch_all(urls, args.requests, args.concurrency, size, ranged=True))
+            azure_storage.delete_blobs([url.split("/")[-1] for url in urls])
+            continue
+
+        app = FastAPI()
+        app.mount("/baseline", StaticFiles(directory=backend.directory), name="baseline")
+        app.mount(storage.LOCAL_URL_PREFIX.rstrip("/"), CachedStaticFiles(directory=backend.directory), name="static")
+        server, thread = serve(app)
+        base = f"http://127.0.0.1:{server.config.port}"
+        try:
+            baseline = [f"{base}/baseline/{url.split('/')[-1]}" for url in urls]
+            # StaticFiles ignores Range and answers 200 with the whole file
+            row("local/starlette", None, fetch_all(baseline, args.requests, args.concurrency, size, ranged=False))
+            served = [f"{base}{url}" for url in urls]
+            row(backend.name, upload,
+                fetch_all(served, args.requests, args.concurrency, size, ranged=False),
+                fetch_all(served, args.requests, args.concurrency, size, ranged=True))
+        finally:
+            server.should_exit = True
+            thread.join()
+    azure_storage.close()
+
+
+if __name__ == "__main__":
+    main()
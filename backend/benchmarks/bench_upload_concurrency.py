@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Public GET latency while large uploads are in flight, blocking vs async Azure.
+
+"blocking" is the original upload handler: `await file.read()` and then the
+synchronous `upload_to_blob` inside an async route, which holds the event
+loop for the whole transfer. "async" is the app's real upload route
+(streamed body, aio Azure client). A prober thread measures GET /api/gallery
+on the same single-worker server while uploader threads post photos; GET/s
+drops whenever the loop is held.
+
+Needs a Blob endpoint; start Azurite first (`azurite-blob --loose`) or pass
+any connection string.
+
+Usage (from backend/):
+    python benchmarks/bench_upload_concurrency.py [--uploads 8] [--concurrency 4] [--megapixels 12]
+"""
+import argparse
+import io
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Tuple
+
+AZURITE = (
+    "DefaultEndpointsProtocol=http;AccountName=devstoreaccount1;"
+    "AccountKey=Eby8vdM02xNOcqFlqUwJPLlmEtlCDXJ1OUzFT50uSRZ6IFsuFq2UVErCz4I6tq/K1SZFPTOtr/KBHBeksoGMGw==;"
+    "BlobEndpoint=http://127.0.0.1:10000/devstoreaccount1;"
+)
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+_db_dir = tempfile.mkdtemp(prefix="wedding-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/bench.db"
+os.environ["STATIC_DIR"] = f"{_db_dir}/uploads"
+os.environ.setdefault("AZURE_STORAGE_CONNECTION_STRING", os.environ.get("AZURITE_CONNECTION_STRING", AZURITE))
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+from fastapi import APIRouter, FastAPI, File, UploadFile  # noqa: E402
+from PIL import Image  # noqa: E402
+from app.core import azure_storage, azure_storage_aio  # noqa: E402
+from app.core.database import Base, engine  # noqa: E402
+from app.core.dependencies import get_current_user  # noqa: E402
+from app.routers import gallery, upload  # noqa: E402
+from app.services import image_variants  # noqa: E402
+
+
+def bench_app() -> FastAPI:
+    legacy = APIRouter()
+
+    @legacy.post("/legacy/upload")
+    async def legacy_upload(file: UploadFile = File(...)):
+        file_content = await file.read()
+        return {"url": azure_storage.upload_to_blob(file_content, file.filename, file.content_type or "image/jpeg")}
+
+    app = FastAPI()
+    app.include_router(gallery.router)
+    app.include_router(upload.router)
+    app.include_router(legacy)
+    app.dependency_overrides[get_current_user] = lambda: None
+    app.add_event_handler("shutdown", azure_storage_aio.close)
+    app.add_event_handler("shutdown", image_variants.shutdown)
+    return app
+
+
+def photo(megapixels: float) -> bytes:
+    """A noisy JPEG, about the size of a phone photo"""
+    width = int((megapixels * 1_000_000 * 4 / 3) ** 0.5)
+    height = width * 3 // 4
+    buffer = io.BytesIO()
+    Image.frombytes("RGB", (width, height), os.urandom(width * height * 3)).save(buffer, "JPEG", quality=90)
+    return buffer.getvalue()
+
+
+def serve(app: FastAPI) -> Tuple[uvicorn.Server, threading.Thread]:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread
+
+
+def probe_during(base: str, work) -> Tuple[List[float], float]:
+    """GET latencies (ms) sampled until work() returns, and how long that took"""
+    latencies: List[float] = []
+    done = threading.Event()
+
+    def prober():
+        with httpx.Client(base_url=base, timeout=120) as client:
+            while not done.is_set():
+                start = time.perf_counter()
+                client.get("/api/gallery").raise_for_status()
+                latencies.append((time.perf_counter() - start) * 1000)
+                time.sleep(0.01)
+
+    thread = threading.Thread(target=prober)
+    thread.start()
+    start = time.perf_counter()
+    try:
+        work()
+    finally:
+        elapsed = time.perf_counter() - start
+        done.set()
+        thread.join()
+    return latencies, elapsed
+
+
+def upload_all(base: str, path: str, body: bytes, uploads: int, concurrency: int) -> None:
+    def one(_):
+        with httpx.Client(base_url=base, timeout=300) as client:
+            r = client.post(path, files={"file": ("photo.jpg", body, "image/jpeg")})
+            r.raise_for_status()
+            if not r.json()["url"] or "/static/" in r.json()["url"]:
+                raise SystemExit("Uploads are not reaching Azure; is Azurite running?")
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(one, range(uploads)))
+
+
+def summary(name: str, sampled: Tuple[List[float], float]) -> None:
+    latencies, elapsed = sampled
+    q = statistics.quantiles(latencies, n=20, method="inclusive")
+    print(
+        f"{name:<20}{len(latencies) / elapsed:>8.1f}"
+        f"{statistics.median(latencies):>10.1f}{q[18]:>10.1f}{max(latencies):>10.1f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uploads", type=int, default=8, help="uploads per scenario")
+    parser.add_argument("--concurrency", type=int, default=4, help="uploads in flight at once")
+    parser.add_argument("--megapixels", type=float, default=12, help="size of the uploaded photo")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    Path(os.environ["STATIC_DIR"]).mkdir(parents=True, exist_ok=True)
+    if azure_storage.get_container_client() is None:
+        raise SystemExit("No Blob endpoint; start Azurite or set AZURE_STORAGE_CONNECTION_STRING")
+
+    server, server_thread = serve(bench_app())
+    base = f"http://127.0.0.1:{server.config.port}"
+    body = photo(args.megapixels)
+    print(f"{args.uploads} uploads of {len(body) / 1e6:.1f} MB, {args.concurrency} at a time")
+    print(f"{'GET /api/gallery':<20}{'GET/s':>8}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    summary("idle", probe_during(base, lambda: time.sleep(2)))
+    summary("blocking uploads", probe_during(
+        base, lambda: upload_all(base, "/legacy/upload", body, args.uploads, args.concurrency)))
+    summary("async uploads", probe_during(
+        base, lambda: upload_all(base, "/api/upload", body, args.uploads, args.concurrency)))
+    server.should_exit = True
+    server_thread.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""Export public content as static JSON files into frontend_dist/content"""
+import argparse
+import sys
+from pathlib import Path
+
+from app.core.database import SessionLocal
+from app.services.static_export import freeze_site_content
+
+DEFAULT_DIST = Path(__file__).parent / "frontend_dist"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--dist", type=Path, default=DEFAULT_DIST,
+        help=f"frontend build directory (default: {DEFAULT_DIST})",
+    )
+    args = parser.parse_args()
+
+    if SessionLocal is None:
+        print("Database not initialized", file=sys.stderr)
+        return 1
+
+    db = SessionLocal()
+    try:
+        manifest = freeze_site_content(db, args.dist)
+    except Exception as e:
+        print(f"Error freezing content: {e}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        return 1
+    finally:
+        db.close()
+
+    print(f"Froze content version {manifest['version']} into {args.dist / 'content'}", file=sys.stdout)
+    for name, url in manifest["files"].items():
+        print(f"  {name}: {url}", file=sys.stdout)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
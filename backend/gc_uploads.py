@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Delete uploaded files and blobs that no content row refers to any more"""
+import argparse
+import sys
+from datetime import timedelta
+
+from app.core import azure_storage, storage
+from app.core.database import SessionLocal
+from app.services import blob_gc
+from app.services import site_content  # noqa: F401  (registers every content model)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dry-run", action="store_true", help="report what would be deleted without deleting it")
+    parser.add_argument(
+        "--backend", choices=("all", "local", "azure"), default="all",
+        help="storage to collect (default: the configured backend and the local fallback)",
+    )
+    parser.add_argument(
+        "--min-age-hours", type=float, default=blob_gc.DEFAULT_MIN_AGE.total_seconds() / 3600,
+        help="leave objects younger than this alone (default: %(default)s)",
+    )
+    parser.add_argument("--batch-size", type=int, default=blob_gc.DEFAULT_BATCH_SIZE, help="objects per delete batch")
+    parser.add_argument("--page-size", type=int, default=blob_gc.DEFAULT_PAGE_SIZE, help="objects per listing page")
+    args = parser.parse_args()
+
+    if SessionLocal is None:
+        print("Database not initialized", file=sys.stderr)
+        return 1
+
+    if args.backend == "all":
+        backends = storage.storage_chain()
+    else:
+        backends = [storage.get_backend(args.backend)]
+
+    options = {
+        "page_size": args.page_size,
+        "min_age": timedelta(hours=args.min_age_hours),
+        "batch_size": args.batch_size,
+        "dry_run": args.dry_run,
+    }
+    db = SessionLocal()
+    try:
+        for backend in backends:
+            report = blob_gc.collect_storage(db, backend, **options)
+            verb = "would delete" if args.dry_run else f"deleted {report['deleted']} of"
+            print(f"{backend.name}: scanned {report['scanned']}, {verb} {report['orphaned']} orphaned "
+                  f"({report['orphaned_bytes'] / 1024 / 1024:.1f} MB), {report['too_recent']} too recent to collect",
+                  file=sys.stdout)
+            for orphan in report["sample"]:
+                print(f"  {orphan}", file=sys.stdout)
+    except Exception as e:
+        db.rollback()
+        print(f"Error collecting uploads: {e}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        return 1
+    finally:
+        db.close()
+        azure_storage.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
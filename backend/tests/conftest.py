@@ -0,0 +1,27 @@
+import importlib
+import pkgutil
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+import app.models
+from app.core.database import Base
+
+# Every model, so create_all builds the full schema (flush hooks query across tables)
+for _module in pkgutil.iter_modules(app.models.__path__):
+    importlib.import_module(f"{app.models.__name__}.{_module.name}")
+
+
+@pytest.fixture
+def engine():
+    """In-memory SQLite database with every table"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
@@ -0,0 +1,53 @@
+from app.core import azure_storage
+from app.core.config import settings
+
+AZURE = "DefaultEndpointsProtocol=https;AccountName=wedding;AccountKey=a2V5;EndpointSuffix=core.windows.net"
+AZURITE = "DefaultEndpointsProtocol=http;AccountName=devstoreaccount1;AccountKey=a2V5;BlobEndpoint=http://127.0.0.1:10000/devstoreaccount1;"
+
+
+def test_public_blob_url(monkeypatch):
+    monkeypatch.setattr(settings, "AZURE_STORAGE_CONTAINER", "photos")
+    monkeypatch.setattr(settings, "AZURE_STORAGE_CONNECTION_STRING", AZURE)
+    assert azure_storage.public_blob_url("a.jpg") == "https://wedding.blob.core.windows.net/photos/a.jpg"
+    monkeypatch.setattr(settings, "AZURE_STORAGE_CONNECTION_STRING", AZURITE)
+    assert azure_storage.public_blob_url("a.jpg") == "http://127.0.0.1:10000/devstoreaccount1/photos/a.jpg"
+    monkeypatch.setattr(settings, "AZURE_STORAGE_CONNECTION_STRING", "")
+    assert azure_storage.public_blob_url("a.jpg") is None
+
+
+class FakeContainer:
+    exists_calls = 0
+
+    def exists(self):
+        FakeContainer.exists_calls += 1
+        return True
+
+
+class FakeService:
+    created = 0
+
+    def __init__(self):
+        FakeService.created += 1
+
+    def get_container_client(self, name):
+        return FakeContainer()
+
+    def close(self):
+        pass
+
+
+def test_container_client_is_checked_once(monkeypatch):
+    monkeypatch.setattr(settings, "AZURE_STORAGE_CONTAINER", "photos")
+    monkeypatch.setattr(settings, "AZURE_STORAGE_CONNECTION_STRING", AZURE)
+    monkeypatch.setattr(azure_storage.BlobServiceClient, "from_connection_string", lambda conn: FakeService())
+    azure_storage.close()
+    try:
+        container = azure_storage.get_container_client()
+        assert all(azure_storage.get_container_client() is container for _ in range(5))
+        assert (FakeService.created, FakeContainer.exists_calls) == (1, 1)
+
+        monkeypatch.setattr(settings, "AZURE_STORAGE_CONTAINER", "other")
+        assert azure_storage.get_container_client() is not container
+        assert (FakeService.created, FakeContainer.exists_calls) == (2, 2)
+    finally:
+        azure_storage.close()
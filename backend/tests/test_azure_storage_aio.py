@@ -0,0 +1,47 @@
+import asyncio
+import os
+import uuid
+import pytest
+from app.core import azure_storage_aio
+from app.core.config import settings
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("AZURITE_CONNECTION_STRING"),
+    reason="set AZURITE_CONNECTION_STRING to run against the Azurite emulator",
+)
+
+
+@pytest.fixture
+def azurite(monkeypatch):
+    monkeypatch.setattr(settings, "AZURE_STORAGE_CONNECTION_STRING", os.environ["AZURITE_CONNECTION_STRING"])
+    monkeypatch.setattr(settings, "AZURE_STORAGE_CONTAINER", f"test-{uuid.uuid4().hex[:12]}")
+    yield
+
+
+def test_upload_stage_list_and_delete(azurite):
+    async def scenario():
+        try:
+            container = await azure_storage_aio.get_container_client()
+            assert container is not None
+            # One long-lived client per loop
+            assert await azure_storage_aio.get_container_client() is container
+
+            assert await azure_storage_aio.upload_to_blob(b"x" * 10, "a.jpg", blob_name="abc.jpg")
+            staged = await azure_storage_aio.start_staged_upload("abc-640.webp")
+            await staged.stage(b"1" * 1024)
+            await staged.stage(b"2" * 1024)
+            assert await azure_storage_aio.list_blob_names("abc-") == []  # not committed yet
+            await staged.commit("image/webp")
+
+            blob = await container.get_blob_client("abc-640.webp").download_blob()
+            assert await blob.readall() == b"1" * 1024 + b"2" * 1024
+            assert blob.properties.content_settings.content_type == "image/webp"
+
+            assert await azure_storage_aio.list_blob_names("abc-") == ["abc-640.webp"]
+            assert await azure_storage_aio.delete_from_blob("abc.jpg")
+            assert not await azure_storage_aio.delete_from_blob("abc.jpg")
+            await container.delete_container()
+        finally:
+            await azure_storage_aio.close()
+
+    asyncio.run(scenario())
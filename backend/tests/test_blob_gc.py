@@ -0,0 +1,110 @@
+import json
+import os
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy.orm import sessionmaker
+from app.core import azure_storage, database, storage
+from app.core.config import settings
+from app.models.gallery_image import GalleryImage
+from app.models.home_content import HomeContent
+from app.models.uploaded_file import UploadedFile
+from app.models.wedding_info_section import WeddingInfoSection
+from app.services import blob_gc, upload_index
+
+DAY = 24 * 3600
+
+
+@pytest.fixture
+def db(db):
+    db.add_all([
+        GalleryImage(image_url="/static/uploads/kept.jpg"),
+        HomeContent(hero_image_url="https://x.blob.core.windows.net/photos/hero.png?v=2"),
+        WeddingInfoSection(title="Venue", gallery_urls=json.dumps(["/static/uploads/venue.jpg"])),
+        UploadedFile(
+            sha256="0" * 64, name="gone.jpg", url="/static/uploads/gone.jpg", content_type="image/jpeg", size=3,
+            created_at=datetime(2020, 1, 1, tzinfo=timezone.utc),
+        ),
+    ])
+    db.commit()
+    return db
+
+
+def test_referenced_names(db):
+    assert blob_gc.referenced_names(db) == {"kept.jpg", "hero.png", "venue.jpg"}
+
+
+def test_collect_local(db, tmp_path):
+    names = ["kept.jpg", "kept-640.webp", "venue.jpg", "gone.jpg", "gone-320.jpg", "new.jpg", ".old.part", ".gitkeep"]
+    for name in names:
+        (tmp_path / name).write_bytes(b"abc")
+    old = time.time() - 2 * DAY
+    for name in names:
+        if name != "new.jpg":
+            os.utime(tmp_path / name, (old, old))
+
+    local = storage.LocalStorage(tmp_path)
+    report = blob_gc.collect_storage(db, local, page_size=3, dry_run=True)
+    assert (report["scanned"], report["orphaned"], report["orphaned_bytes"], report["too_recent"]) == (7, 3, 9, 1)
+    assert sorted(report["sample"]) == [".old.part", "gone-320.jpg", "gone.jpg"]
+    assert len(list(tmp_path.iterdir())) == len(names)
+
+    report = blob_gc.collect_storage(db, local, page_size=3, batch_size=2, min_age=timedelta(hours=1))
+    assert report["deleted"] == 3
+    assert sorted(path.name for path in tmp_path.iterdir()) == [".gitkeep", "kept-640.webp", "kept.jpg", "new.jpg", "venue.jpg"]
+    assert db.query(UploadedFile).count() == 0
+
+
+def test_batch_is_rechecked_before_deleting(db, monkeypatch):
+    pages = [[("late.jpg", 1, datetime(2020, 1, 1, tzinfo=timezone.utc))]]
+    real = blob_gc.referenced_names
+    calls = []
+
+    def referenced_later(session):
+        calls.append(1)
+        # The row pointing at late.jpg is saved while the listing is walked
+        return real(session) | ({"late.jpg"} if len(calls) > 1 else set())
+
+    def delete(names):
+        raise AssertionError(f"deleted {names}")
+
+    monkeypatch.setattr(blob_gc, "referenced_names", referenced_later)
+    report = blob_gc.collect(db, pages, delete)
+    assert (report["orphaned"], report["deleted"]) == (1, 0)
+
+
+def test_dedup_hit_keeps_an_old_orphan(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(database, "SessionLocal", sessionmaker(bind=db.get_bind()))
+    old = time.time() - 30 * DAY
+    for name in ("gone.jpg", "gone-320.jpg"):
+        (tmp_path / name).write_bytes(b"abc")
+        os.utime(tmp_path / name, (old, old))
+
+    # The URL is handed out again; the client has not saved a row with it yet
+    assert upload_index.lookup("0" * 64)["url"] == "/static/uploads/gone.jpg"
+    report = blob_gc.collect_storage(db, storage.LocalStorage(tmp_path))
+    assert (report["orphaned"], report["too_recent"], report["deleted"]) == (0, 2, 0)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["gone-320.jpg", "gone.jpg"]
+    assert db.query(UploadedFile).count() == 1
+
+
+@pytest.mark.skipif(not os.getenv("AZURITE_CONNECTION_STRING"), reason="AZURITE_CONNECTION_STRING not set")
+def test_collect_azure(db, monkeypatch):
+    monkeypatch.setattr(settings, "AZURE_STORAGE_CONNECTION_STRING", os.environ["AZURITE_CONNECTION_STRING"])
+    monkeypatch.setattr(settings, "AZURE_STORAGE_CONTAINER", f"gc-{uuid.uuid4().hex[:12]}")
+    azure_storage.close()
+    try:
+        for name in ("kept.jpg", "kept-320.jpg", "gone.jpg", "gone-320.webp"):
+            assert azure_storage.upload_to_blob(b"abc", name, blob_name=name)
+
+        report = blob_gc.collect_storage(db, storage.AzureStorage(), page_size=2, min_age=timedelta(0), dry_run=True)
+        assert (report["scanned"], report["orphaned"]) == (4, 2)
+
+        report = blob_gc.collect_storage(db, storage.AzureStorage(), page_size=2, min_age=timedelta(0))
+        assert report["deleted"] == 2
+        remaining = [name for page in azure_storage.list_blob_pages() for name, _, _ in page]
+        assert sorted(remaining) == ["kept-320.jpg", "kept.jpg"]
+        azure_storage.get_container_client().delete_container()
+    finally:
+        azure_storage.close()
@@ -0,0 +1,119 @@
+import asyncio
+import time
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core import content_versions
+from app.core.cache import TTLCache, cached, _MISSING
+from app.core.database import Base
+from app.models.gallery_image import GalleryImage
+from app.models.gift_item import GiftItem
+from app.models.uploaded_file import UploadedFile
+
+
+def test_lru_evicts_least_recently_used():
+    cache = TTLCache("t", maxsize=2, ttl=60)
+    cache.set("a", 1, cache.generation)
+    cache.set("b", 2, cache.generation)
+    cache.get("a")
+    cache.set("c", 3, cache.generation)
+    assert cache.get("b") is _MISSING
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expires_entries():
+    cache = TTLCache("t", maxsize=10, ttl=0.01)
+    cache.set("a", 1, cache.generation)
+    time.sleep(0.02)
+    assert cache.get("a") is _MISSING
+    assert cache.stats()["expirations"] == 1
+
+
+def test_stale_generation_is_not_stored():
+    cache = TTLCache("t", maxsize=10, ttl=60)
+    generation = cache.generation
+    cache.clear()
+    cache.set("a", 1, generation)
+    assert cache.get("a") is _MISSING
+
+
+def test_commit_invalidates_caches_for_changed_model(db):
+    calls = []
+
+    @cached(GalleryImage)
+    def handler(db):
+        calls.append(1)
+        return db.query(GalleryImage).count()
+
+    assert handler(db=db) == 0
+    assert handler(db=db) == 0
+    assert len(calls) == 1
+
+    version = content_versions.current(GalleryImage.__tablename__)
+    db.add(GalleryImage(image_url="a.jpg"))
+    db.commit()
+    assert content_versions.current(GalleryImage.__tablename__) != version
+    assert handler(db=db) == 1
+    assert len(calls) == 2
+
+
+def test_unrelated_and_rolled_back_changes_keep_cache(db):
+    calls = []
+
+    @cached(GalleryImage)
+    def handler(db):
+        calls.append(1)
+        return db.query(GalleryImage).count()
+
+    handler(db=db)
+    db.add(GiftItem(title="t", link="", item_type="card"))
+    db.commit()
+    db.add(GalleryImage(image_url="a.jpg"))
+    db.flush()
+    db.rollback()
+    handler(db=db)
+    assert len(calls) == 1
+
+
+def test_bulk_delete_invalidates(db):
+    db.add(GalleryImage(image_url="a.jpg"))
+    db.commit()
+
+    @cached(GalleryImage)
+    def handler(db):
+        return db.query(GalleryImage).count()
+
+    assert handler(db=db) == 1
+    db.query(GalleryImage).delete()
+    db.commit()
+    assert handler(db=db) == 0
+
+
+def test_run_async_shares_the_cache(tmp_path):
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    url = f"sqlite:///{tmp_path}/cache.db"
+    Base.metadata.create_all(bind=create_engine(url), tables=[GalleryImage.__table__, UploadedFile.__table__])
+    sync_db = sessionmaker(bind=create_engine(url))()
+    calls = []
+
+    @cached(GalleryImage)
+    def handler(db):
+        calls.append(1)
+        return db.query(GalleryImage).count()
+
+    async def count():
+        engine = create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://"))
+        async with async_sessionmaker(engine)() as db:
+            value = await handler.run_async(db)
+        await engine.dispose()
+        return value
+
+    assert asyncio.run(count()) == 0
+    assert handler(db=sync_db) == 0
+    assert len(calls) == 1
+    sync_db.add(GalleryImage(image_url="a.jpg"))
+    sync_db.commit()
+    assert asyncio.run(count()) == 1
+    assert len(calls) == 2
+    sync_db.close()
@@ -0,0 +1,158 @@
+import os
+import time
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from app.core import content_versions
+from app.core.cache import cached
+from app.core.database import Base
+from app.models.content_version import ContentVersion
+from app.models.gallery_image import GalleryImage
+from app.models.uploaded_file import UploadedFile
+
+TABLES = [GalleryImage.__table__, ContentVersion.__table__, UploadedFile.__table__]
+
+
+def _shared_engine(url):
+    engine = create_engine(url)
+    Base.metadata.drop_all(bind=engine, tables=TABLES)
+    Base.metadata.create_all(bind=engine, tables=TABLES)
+    content_versions.start(engine, [GalleryImage.__tablename__])
+    return engine
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = _shared_engine(f"sqlite:///{tmp_path}/versions.db")
+    yield engine
+    content_versions.stop()
+    engine.dispose()
+
+
+def _row_version(engine, table_name):
+    with engine.connect() as conn:
+        return conn.execute(
+            text("SELECT version FROM content_versions WHERE table_name = :t"), {"t": table_name}
+        ).scalar()
+
+
+def _other_worker_edit(engine):
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO gallery_images (image_url, \"order\") VALUES ('other.jpg', 0)"))
+        conn.execute(text(
+            "UPDATE content_versions SET version = version + 1 WHERE table_name IN ('*', 'gallery_images')"
+        ))
+
+
+def test_commit_bumps_version_rows_in_same_transaction(engine):
+    db = sessionmaker(bind=engine)()
+    db.add(GalleryImage(image_url="a.jpg"))
+    db.commit()
+    assert _row_version(engine, "gallery_images") == 1
+    assert _row_version(engine, "*") == 1
+    assert content_versions.current("gallery_images") == (1,)
+
+    db.add(GalleryImage(image_url="b.jpg"))
+    db.flush()
+    db.rollback()
+    assert _row_version(engine, "gallery_images") == 1
+    db.close()
+
+
+def test_start_tolerates_rows_seeded_by_another_worker(engine, monkeypatch):
+    real_seed = content_versions._seed
+
+    def seed_after_other_worker(conn, names):
+        # Another worker booting at the same time inserted the rows first
+        with engine.begin() as other:
+            real_seed(other, names)
+        real_seed(conn, names)
+
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM content_versions WHERE table_name = 'gallery_images'"))
+    monkeypatch.setattr(content_versions, "_seed", seed_after_other_worker)
+    content_versions.start(engine, [GalleryImage.__tablename__])
+    assert content_versions.is_shared()
+    assert _row_version(engine, "gallery_images") == 0
+
+
+def test_start_survives_an_unreachable_database(engine, monkeypatch):
+    content_versions.stop()
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM content_versions"))
+    real_seed_missing = content_versions._seed_missing
+
+    def unreachable(conn):
+        raise ConnectionError("database is starting up")
+
+    monkeypatch.setattr(content_versions, "_seed_missing", unreachable)
+    content_versions.start(engine, [GalleryImage.__tablename__])
+    assert content_versions.is_shared()
+    local_tag = content_versions.etag("gallery_images")
+
+    # Once the database answers, a commit seeds the rows it bumps and the
+    # sync it triggers moves to shared ETags
+    monkeypatch.setattr(content_versions, "_seed_missing", real_seed_missing)
+    db = sessionmaker(bind=engine)()
+    db.add(GalleryImage(image_url="a.jpg"))
+    db.commit()
+    db.close()
+    assert _row_version(engine, "gallery_images") == 1
+    assert content_versions.etag("gallery_images") != local_tag
+    assert content_versions.current("gallery_images") == (1,)
+
+
+def test_sync_drops_entries_changed_by_other_workers(engine):
+    db = sessionmaker(bind=engine)()
+
+    @cached(GalleryImage)
+    def handler(db):
+        return db.query(GalleryImage).count()
+
+    assert handler(db=db) == 0
+    tag = content_versions.etag("gallery_images")
+    _other_worker_edit(engine)
+    content_versions.sync(force=True)
+    assert content_versions.etag("gallery_images") != tag
+    assert handler(db=db) == 1
+    db.close()
+
+
+def test_sync_is_rate_limited(engine, monkeypatch):
+    monkeypatch.setattr(content_versions.settings, "CONTENT_VERSION_POLL_SECONDS", 60.0)
+    content_versions.sync(force=True)
+    _other_worker_edit(engine)
+    content_versions.sync()
+    assert content_versions.current("gallery_images") == (0,)
+    content_versions.sync(force=True)
+    assert content_versions.current("gallery_images") == (1,)
+
+
+@pytest.mark.skipif(
+    not os.environ.get("TEST_POSTGRES_URL"),
+    reason="set TEST_POSTGRES_URL to run against a local Postgres",
+)
+def test_postgres_notify_triggers_immediate_sync(monkeypatch):
+    monkeypatch.setattr(content_versions.settings, "CONTENT_VERSION_POLL_SECONDS", 60.0)
+    engine = _shared_engine(os.environ["TEST_POSTGRES_URL"])
+    try:
+        deadline = time.monotonic() + 5
+        while not content_versions._listening and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert content_versions._listening
+
+        db = sessionmaker(bind=engine)()
+        db.add(GalleryImage(image_url="a.jpg"))
+        db.commit()
+        db.close()
+
+        _other_worker_edit(engine)
+        deadline = time.monotonic() + 5
+        while content_versions.current("gallery_images") != (2,) and time.monotonic() < deadline:
+            time.sleep(0.05)
+            content_versions.sync()
+        assert content_versions.current("gallery_images") == (2,)
+    finally:
+        content_versions.stop()
+        Base.metadata.drop_all(bind=engine, tables=TABLES)
+        engine.dispose()
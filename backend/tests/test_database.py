@@ -0,0 +1,21 @@
+from app.core.config import settings
+from app.core.database import async_database_url, async_routes_enabled
+
+
+def test_async_database_url():
+    assert async_database_url("sqlite:///./wedding.db") == "sqlite+aiosqlite:///./wedding.db"
+    assert (
+        async_database_url("postgresql://u:p@db.example.com:5432/wedding?sslmode=require")
+        == "postgresql+asyncpg://u:p@db.example.com:5432/wedding?ssl=require"
+    )
+    assert async_database_url("postgresql+psycopg2://u:p@localhost/wedding").startswith("postgresql+asyncpg://")
+    assert async_database_url("mysql://u:p@localhost/wedding") is None
+
+
+def test_async_routes_only_for_asyncpg_unless_configured(monkeypatch):
+    assert async_routes_enabled("postgresql://u:p@localhost/wedding")
+    assert not async_routes_enabled("sqlite:///./wedding.db")
+    monkeypatch.setattr(settings, "ASYNC_DB_ROUTES", "on")
+    assert async_routes_enabled("sqlite:///./wedding.db")
+    monkeypatch.setattr(settings, "ASYNC_DB_ROUTES", "off")
+    assert not async_routes_enabled("postgresql://u:p@localhost/wedding")
@@ -0,0 +1,62 @@
+import time
+import pytest
+from sqlalchemy import create_engine, exc, text
+from app.core import db_pool
+from app.core.config import settings
+
+
+@pytest.fixture
+def pooled(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 1)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 0)
+    monkeypatch.setattr(settings, "DB_POOL_TIMEOUT", 0.05)
+    url = f"sqlite:///{tmp_path}/pool.db"
+    engine = create_engine(url, **db_pool.engine_options(url))
+    yield engine
+    engine.dispose()
+
+
+def test_engine_options():
+    assert "poolclass" not in db_pool.engine_options("sqlite://")
+    options = db_pool.engine_options("postgresql+asyncpg://u@db/wedding", is_async=True)
+    assert options["poolclass"] is db_pool.InstrumentedAsyncQueuePool
+    assert (options["pool_size"], options["pool_pre_ping"]) == (settings.DB_POOL_SIZE, False)
+
+
+def test_pre_ping_only_after_idle(pooled):
+    metrics = db_pool.instrument(pooled, "test", pre_ping_idle=0.05)
+    for _ in range(3):
+        with pooled.connect() as connection:
+            connection.execute(text("SELECT 1"))
+    assert (metrics.checkouts, metrics.pre_pings) == (3, 0)
+
+    time.sleep(0.06)
+    with pooled.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    stats = metrics.stats()
+    assert (stats["pre_pings"], stats["connects"]) == (1, 1)
+    assert stats["wait_ms"]["count"] == 4
+    assert (stats["size"], stats["in_use"], stats["peak_in_use"]) == (1, 0, 1)
+
+
+def test_failed_pre_ping_replaces_connection(pooled, monkeypatch):
+    metrics = db_pool.instrument(pooled, "test", pre_ping_idle=0)
+    with pooled.connect():
+        pass
+
+    def broken(dbapi_connection):
+        # Only the idle connection is pinged; its fresh replacement is not
+        raise RuntimeError("server closed the connection")
+
+    monkeypatch.setattr(pooled.dialect, "do_ping", broken)
+    with pooled.connect() as connection:
+        assert connection.execute(text("SELECT 1")).scalar() == 1
+    assert (metrics.pre_ping_failures, metrics.invalidations, metrics.connects) == (1, 1, 2)
+
+
+def test_timeouts_are_counted(pooled):
+    metrics = db_pool.instrument(pooled, "test")
+    with pooled.connect():
+        with pytest.raises(exc.TimeoutError):
+            pooled.connect()
+    assert metrics.stats()["timeouts"] == 1
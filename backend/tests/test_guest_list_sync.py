@@ -0,0 +1,48 @@
+import json
+from app.models.guest_invitation import GuestInvitation
+from app.models.rsvp import RSVP
+from app.schemas.guest_invitation import InvitationUpsert
+from app.services.guest_list_sync import replace_invitations
+
+
+def guests(*rows):
+    return [InvitationUpsert(display_label=label, participants=participants) for label, participants in rows]
+
+
+def stored(db):
+    return [
+        (inv.id, inv.display_label, json.loads(inv.participants))
+        for inv in db.query(GuestInvitation).order_by(GuestInvitation.id)
+    ]
+
+
+def test_first_save_inserts_everything(db):
+    changes = replace_invitations(db, guests(("Ana Lima", ["Ana"]), ("Bia & Caio", ["Bia", "Caio"])))
+    assert changes == {"inserted": 2, "updated": 0, "deleted": 0, "unchanged": 0}
+    assert stored(db) == [(1, "Ana Lima", ["Ana"]), (2, "Bia & Caio", ["Bia", "Caio"])]
+
+
+def test_resave_keeps_ids_and_applies_the_diff(db):
+    replace_invitations(db, guests(
+        ("Ana Lima", ["Ana"]),
+        ("Bia & Caio", ["Bia", "Caio"]),
+        ("Duda Reis", ["Duda"]),
+        ("Ana Lima", ["Ana Lima Jr"]),
+    ))
+    db.add(RSVP(guest_name="Duda Reis", email="d@example.com", num_attendees=1, guest_invitation_id=3))
+    db.commit()
+
+    changes = replace_invitations(db, guests(
+        (" ana  LIMA", ["Ana"]),              # respelled: same household, same id
+        ("Bia & Caio", ["Bia", "Caio", "Lia"]),
+        ("Eva Sá", ["Eva"]),
+    ))
+    assert changes == {"inserted": 1, "updated": 2, "deleted": 2, "unchanged": 0}
+    assert stored(db)[:2] == [(1, " ana  LIMA", ["Ana"]), (2, "Bia & Caio", ["Bia", "Caio", "Lia"])]
+    assert [label for _, label, _ in stored(db)[2:]] == ["Eva Sá"]
+    assert db.query(RSVP).one().guest_invitation_id is None
+
+    unchanged = replace_invitations(db, guests(
+        (" ana  LIMA", ["Ana"]), ("Bia & Caio", ["Bia", "Caio", "Lia"]), ("Eva Sá", ["Eva"]),
+    ))
+    assert unchanged == {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 3}
@@ -0,0 +1,43 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core import database
+from app.core.database import Base
+from app.models.home_content import HomeContent
+from app.routers import home
+from app.services import site_content
+
+
+@pytest.fixture
+def sessions(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path}/home.db")
+    Base.metadata.create_all(bind=engine, tables=[HomeContent.__table__])
+    factory = sessionmaker(bind=engine)
+    with factory() as db:
+        site_content.ensure_home_content(db)
+        db.commit()
+    opened = []
+
+    def session_local():
+        opened.append(True)
+        return factory()
+
+    monkeypatch.setattr(database, "SessionLocal", session_local)
+    site_content.home_content_json.cache.clear()
+    yield opened
+    site_content.home_content_json.cache.clear()
+    engine.dispose()
+
+
+def test_cached_home_is_served_without_a_session(sessions):
+    app = FastAPI()
+    app.include_router(home.router)
+    client = TestClient(app)
+    first = client.get("/api/home")
+    second = client.get("/api/home")
+    assert first.status_code == second.status_code == 200
+    assert first.json()["hero_text"] == site_content.DEFAULT_HOME_CONTENT["hero_text"]
+    assert second.content == first.content
+    assert len(sessions) == 1
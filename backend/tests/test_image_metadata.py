@@ -0,0 +1,47 @@
+import json
+import pytest
+from app.models.gallery_image import GalleryImage
+from app.models.home_content import HomeContent
+from app.models.uploaded_file import UploadedFile
+from app.models.wedding_info_section import WeddingInfoSection
+from app.services import image_metadata  # noqa: F401
+
+URL = "https://wedding.blob.core.windows.net/photos/abc.jpg"
+
+
+@pytest.fixture
+def db(db):
+    db.add(UploadedFile(
+        sha256="0" * 64, name="abc.jpg", url=URL, placeholder="data:x", dominant_color="#102030", width=800, height=600,
+    ))
+    db.commit()
+    return db
+
+
+def test_placeholders_follow_the_image_url(db):
+    image = GalleryImage(image_url=URL)
+    db.add(image)
+    db.commit()
+    assert (image.placeholder, image.dominant_color, image.width, image.height) == ("data:x", "#102030", 800, 600)
+
+    image.caption = "unchanged url"
+    image.placeholder = "data:backfilled"
+    db.commit()
+    assert image.placeholder == "data:backfilled"
+
+    image.image_url = "https://example.com/other.jpg"
+    db.commit()
+    assert (image.placeholder, image.dominant_color, image.width) == (None, None, None)
+
+    home = HomeContent(hero_text="Hi", hero_image_url=URL)
+    db.add(home)
+    db.commit()
+    assert (home.hero_image_width, home.hero_image_height) == (800, 600)
+
+
+def test_info_sections_get_one_placeholder_per_url(db):
+    section = WeddingInfoSection(title="Dress code", section_type="dress_code", gallery_urls=json.dumps([URL, "/x.jpg"]))
+    db.add(section)
+    db.commit()
+    assert json.loads(section.image_placeholders) == {URL: {"placeholder": "data:x", "dominant_color": "#102030"}}
+    assert json.loads(section.image_sizes) == {URL: [800, 600]}
@@ -0,0 +1,65 @@
+import io
+import pytest
+from PIL import Image
+from app.services.image_variants import InvalidImage, build_placeholder, build_variants, image_size, is_variant_of
+
+
+def _encode(image, fmt, **kwargs):
+    buffer = io.BytesIO()
+    image.save(buffer, fmt, **kwargs)
+    return buffer.getvalue()
+
+
+def test_widths_are_capped_at_the_original():
+    result = build_variants(_encode(Image.new("RGB", (1500, 1000)), "JPEG"))
+    assert (result["width"], result["height"]) == (1500, 1000)
+    assert sorted({v["width"] for v in result["variants"]}) == [320, 640, 1280, 1500]
+    for variant in result["variants"]:
+        decoded = Image.open(io.BytesIO(variant["data"]))
+        assert decoded.size == (variant["width"], variant["height"])
+        assert decoded.format == {"webp": "WEBP", "jpg": "JPEG"}[variant["ext"]]
+
+
+def test_exif_rotation_is_applied():
+    exif = Image.Exif()
+    exif[0x0112] = 6  # rotated 90 degrees
+    result = build_variants(_encode(Image.new("RGB", (800, 400)), "JPEG", exif=exif))
+    assert (result["width"], result["height"]) == (400, 800)
+    assert {(v["width"], v["height"]) for v in result["variants"]} == {(320, 640), (400, 800)}
+
+
+def test_transparent_png_and_invalid_bytes():
+    result = build_variants(_encode(Image.new("RGBA", (100, 50), (0, 0, 0, 0)), "PNG"))
+    assert {v["ext"] for v in result["variants"]} == {"webp", "jpg"}
+    with pytest.raises(InvalidImage):
+        build_variants(b"not an image")
+
+
+def test_variant_names():
+    assert is_variant_of("abc-def-640.webp", "abc-def")
+    assert not is_variant_of("abc-def-640.webp", "abc")
+    assert not is_variant_of("abc-def.jpg", "abc")
+
+
+def test_placeholder_and_dominant_colour():
+    image = Image.new("RGB", (1200, 800), (200, 30, 30))
+    image.paste((20, 20, 200), (0, 0, 300, 800))
+    result = build_variants(_encode(image, "PNG"))
+    assert result["dominant_color"] == "#c81e1e"
+    assert result["placeholder"].startswith("data:image/webp;base64,")
+    assert len(result["placeholder"]) < 400
+
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    small = build_placeholder(_encode(image, "JPEG", exif=exif))
+    assert (small["width"], small["height"]) == (800, 1200)
+
+
+def test_image_size_reads_headers_only():
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    assert image_size(_encode(Image.new("RGB", (4000, 3000)), "JPEG", exif=exif)[:4096]) == (3000, 4000)
+    assert image_size(_encode(Image.new("RGB", (300, 200)), "PNG")[:64]) == (300, 200)
+    assert image_size(_encode(Image.new("RGB", (300, 200)), "WEBP")) == (300, 200)
+    with pytest.raises(InvalidImage):
+        image_size(b"not an image")
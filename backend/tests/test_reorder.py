@@ -0,0 +1,52 @@
+import pytest
+from sqlalchemy import event
+from app.models.timeline_event import TimelineEvent
+from app.models.wedding_info_section import WeddingInfoSection
+from app.services.reorder import reorder
+
+
+@pytest.fixture
+def db(db):
+    db.add_all([TimelineEvent(title=f"Event {i}", order=i) for i in range(5)])
+    db.commit()
+    return db
+
+
+def capture(engine):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+def stored(db):
+    return [(row.id, row.order) for row in db.query(TimelineEvent).order_by(TimelineEvent.id)]
+
+
+def test_moves_only_changed_rows_in_one_update(engine, db):
+    statements = capture(engine)
+    events = reorder(db, TimelineEvent.order, [1, 2, 4, 3, 5])
+    assert [(e.id, e.order) for e in events] == [(1, 0), (2, 1), (4, 2), (3, 3), (5, 4)]
+    writes = [s for s in statements if s.startswith("UPDATE")]
+    assert len(writes) == 1 and "CASE" in writes[0]
+    assert [s for s in statements if s.startswith("SELECT")] == [statements[0]]
+    assert stored(db) == [(1, 0), (2, 1), (3, 3), (4, 2), (5, 4)]
+
+
+def test_rows_left_out_keep_their_position(db):
+    events = reorder(db, TimelineEvent.order, [5, 4])
+    # ties in position fall back to id, so a partial list can leave them interleaved
+    assert [(e.id, e.order) for e in events] == [(1, 0), (5, 0), (2, 1), (4, 1), (3, 2)]
+    assert stored(db) == [(1, 0), (2, 1), (3, 2), (4, 1), (5, 0)]
+
+
+def test_unknown_or_repeated_ids_change_nothing(db):
+    assert reorder(db, TimelineEvent.order, [1, 99]) is None
+    assert reorder(db, TimelineEvent.order, [2, 2]) is None
+    assert stored(db) == [(i, i - 1) for i in range(1, 6)]
+
+
+def test_sort_order_column(db):
+    db.add_all([WeddingInfoSection(title=t, sort_order=i) for i, t in enumerate("abc")])
+    db.commit()
+    sections = reorder(db, WeddingInfoSection.sort_order, [3, 1, 2])
+    assert [s.title for s in sections] == ["c", "a", "b"]
@@ -0,0 +1,32 @@
+import pytest
+from sqlalchemy import create_engine, text
+from app.core import sqlite_profile
+from app.core.config import settings
+
+
+def pragma(engine, name):
+    with engine.connect() as connection:
+        return connection.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_production_profile(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "SQLITE_PROFILE", "production")
+    engine = create_engine(f"sqlite:///{tmp_path}/site.db")
+    assert sqlite_profile.apply(engine)
+    assert pragma(engine, "journal_mode") == "wal"
+    assert pragma(engine, "synchronous") == 1  # NORMAL
+    assert pragma(engine, "busy_timeout") == settings.SQLITE_BUSY_TIMEOUT_MS
+    assert pragma(engine, "cache_size") == -settings.SQLITE_CACHE_SIZE_KB
+    engine.dispose()
+
+
+def test_default_profile_and_memory_databases_are_left_alone(tmp_path, monkeypatch):
+    assert not sqlite_profile.apply(create_engine("sqlite://"))
+    monkeypatch.setattr(settings, "SQLITE_PROFILE", "default")
+    engine = create_engine(f"sqlite:///{tmp_path}/site.db")
+    assert not sqlite_profile.apply(engine)
+    assert pragma(engine, "journal_mode") == "delete"
+    engine.dispose()
+    monkeypatch.setattr(settings, "SQLITE_PROFILE", "fast")
+    with pytest.raises(ValueError):
+        sqlite_profile.pragmas()
@@ -0,0 +1,43 @@
+import json
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.models.gallery_image import GalleryImage
+from app.services.static_export import CONTENT_DIRNAME, MANIFEST_NAME, content_files, freeze_site_content
+
+
+def _gallery_file(manifest):
+    return manifest["files"]["gallery_images"].split("/")[-1]
+
+
+def test_previous_version_survives_one_more_freeze(db, tmp_path):
+    content = tmp_path / CONTENT_DIRNAME
+    first = freeze_site_content(db, tmp_path)
+    assert first["previous"] == []
+
+    db.add(GalleryImage(image_url="/static/uploads/a.jpg"))
+    db.commit()
+    second = freeze_site_content(db, tmp_path)
+    assert (content / _gallery_file(first)).exists()
+    assert f"/{CONTENT_DIRNAME}/{_gallery_file(first)}" in second["previous"]
+
+    # Nothing changed: the previous version is still kept
+    assert freeze_site_content(db, tmp_path)["previous"] == second["previous"]
+    assert (content / _gallery_file(first)).exists()
+
+    db.add(GalleryImage(image_url="/static/uploads/b.jpg"))
+    db.commit()
+    third = freeze_site_content(db, tmp_path)
+    assert not (content / _gallery_file(first)).exists()
+    assert (content / _gallery_file(second)).exists()
+    assert json.loads((content / MANIFEST_NAME).read_text()) == third
+
+
+def test_manifest_is_404_until_the_first_freeze(db, tmp_path):
+    app = FastAPI()
+    app.mount("/content", content_files(tmp_path), name="content")
+    client = TestClient(app)
+    assert client.get(f"/content/{MANIFEST_NAME}").status_code == 404
+
+    manifest = freeze_site_content(db, tmp_path)
+    response = client.get(f"/content/{MANIFEST_NAME}")
+    assert (response.status_code, response.json()) == (200, manifest)
@@ -0,0 +1,66 @@
+import gzip
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.core.static_files import IMMUTABLE, CachedStaticFiles
+
+BUNDLE = b"console.log('hello wedding');\n" * 200
+
+
+def _client(tmp_path, **kwargs):
+    (tmp_path / "index-BxK3v9aZ.js").write_bytes(BUNDLE)
+    (tmp_path / "tiny.css").write_bytes(b"body{}")
+    app = FastAPI()
+    app.mount("/assets", CachedStaticFiles(directory=tmp_path, **kwargs), name="assets")
+    return TestClient(app)
+
+
+def test_precompressed_variant_chosen_by_accept_encoding(tmp_path):
+    client = _client(tmp_path, precompress=True)
+
+    r = client.get("/assets/index-BxK3v9aZ.js", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["content-encoding"] == "gzip"
+    assert r.headers["cache-control"] == IMMUTABLE
+    assert r.headers["vary"] == "Accept-Encoding"
+    assert r.content == BUNDLE  # decoded by the client
+
+    r2 = client.get("/assets/index-BxK3v9aZ.js", headers={"Accept-Encoding": "gzip", "If-None-Match": r.headers["etag"]})
+    assert r2.status_code == 304
+
+    r3 = client.get("/assets/index-BxK3v9aZ.js", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in r3.headers
+    assert r3.headers["etag"] != r.headers["etag"]
+
+    small = client.get("/assets/tiny.css", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+    assert small.headers["cache-control"] == "no-cache"
+
+
+def test_build_time_sibling_served_without_precompress(tmp_path):
+    (tmp_path / "index-BxK3v9aZ.js.gz").write_bytes(gzip.compress(BUNDLE))
+    client = _client(tmp_path)
+
+    r = client.get("/assets/index-BxK3v9aZ.js", headers={"Accept-Encoding": "br;q=0, gzip"})
+    assert r.headers["content-encoding"] == "gzip"
+    assert r.headers["content-type"].startswith("text/javascript")
+    assert r.content == BUNDLE
+
+
+def test_byte_ranges(tmp_path):
+    client = _client(tmp_path)
+    url = "/assets/index-BxK3v9aZ.js"
+
+    full = client.get(url, headers={"Accept-Encoding": "identity"})
+    assert full.headers["accept-ranges"] == "bytes"
+
+    r = client.get(url, headers={"Range": "bytes=10-19"})
+    assert r.status_code == 206
+    assert r.headers["content-range"] == f"bytes 10-19/{len(BUNDLE)}"
+    assert r.content == BUNDLE[10:20]
+
+    assert client.get(url, headers={"Range": "bytes=-5"}).content == BUNDLE[-5:]
+    assert client.get(url, headers={"Range": f"bytes={len(BUNDLE)}-"}).status_code == 416
+
+    stale = client.get(url, headers={"Range": "bytes=0-9", "If-Range": '"stale"'})
+    assert (stale.status_code, stale.content) == (200, BUNDLE)
+    fresh = client.get(url, headers={"Range": "bytes=0-9", "If-Range": full.headers["etag"]})
+    assert (fresh.status_code, fresh.content) == (206, BUNDLE[:10])
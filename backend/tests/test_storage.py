@@ -0,0 +1,95 @@
+import asyncio
+import pytest
+from starlette.concurrency import run_in_threadpool
+from app.core import storage
+from app.core.config import settings
+
+
+def test_backend_follows_settings(monkeypatch):
+    monkeypatch.setattr(settings, "STORAGE_BACKEND", "")
+    monkeypatch.setattr(settings, "AZURE_STORAGE_CONNECTION_STRING", "")
+    assert storage.get_storage() is storage.get_backend("local")
+    assert storage.storage_chain() == [storage.get_backend("local")]
+
+    monkeypatch.setattr(settings, "AZURE_STORAGE_CONNECTION_STRING", "AccountName=wedding")
+    assert storage.get_storage().name == "azure"
+
+    monkeypatch.setattr(settings, "STORAGE_BACKEND", "memory")
+    assert [backend.name for backend in storage.storage_chain()] == ["memory", "local"]
+
+    monkeypatch.setattr(settings, "STORAGE_BACKEND", "ftp")
+    with pytest.raises(ValueError):
+        storage.get_storage()
+
+
+@pytest.mark.parametrize("make", [storage.MemoryStorage, storage.LocalStorage])
+def test_backend_round_trip(make, tmp_path):
+    backend = make() if make is storage.MemoryStorage else make(tmp_path / "uploads")
+    if make is storage.LocalStorage:
+        backend.directory.mkdir()
+    part = tmp_path / ".abc.part"
+    part.write_bytes(b"original")
+
+    async def scenario():
+        url = await backend.save_part(part, "abc.jpg", "image/jpeg")
+        assert url == backend.url("abc.jpg")
+        await backend.put("abc-320.webp", b"variant", "image/webp")
+        await backend.put("abd.jpg", b"other", "image/jpeg")
+        assert sorted(await backend.list_names("abc")) == ["abc-320.webp", "abc.jpg"]
+        assert await backend.delete("abc.jpg")
+        assert not await backend.delete("abc.jpg")
+
+    asyncio.run(scenario())
+    pages = list(backend.list_pages(1))
+    assert sorted(name for page in pages for name, _, _ in page) == ["abc-320.webp", "abd.jpg"]
+    assert all(len(page) == 1 for page in pages)
+    assert backend.delete_many(["abd.jpg"]) == 1
+    assert [name for page in backend.list_pages(10) for name, _, _ in page] == ["abc-320.webp"]
+
+
+def test_backends_must_implement_the_core_methods():
+    class Incomplete(storage.StorageBackend):
+        def url(self, name):
+            return name
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_default_bulk_operations_use_list_names_and_delete():
+    class Minimal(storage.StorageBackend):
+        def __init__(self):
+            self.files = {"a.jpg", "b.jpg", "c.jpg"}
+
+        def url(self, name):
+            return name
+
+        async def save_part(self, part_path, name, content_type, staged=None):
+            return None
+
+        async def put(self, name, data, content_type):
+            return None
+
+        async def delete(self, name):
+            if name not in self.files:
+                return False
+            self.files.remove(name)
+            return True
+
+        async def list_names(self, prefix):
+            return [name for name in self.files if name.startswith(prefix)]
+
+    backend = Minimal()
+    pages = list(backend.list_pages(2))
+    assert [[name for name, _, _ in page] for page in pages] == [["a.jpg", "b.jpg"], ["c.jpg"]]
+    assert backend.delete_many(["a.jpg", "c.jpg"]) == 2
+    assert backend.files == {"b.jpg"}
+
+    async def from_the_event_loop():
+        with pytest.raises(RuntimeError):
+            backend.delete_many(["b.jpg"])
+        # Off the loop, as async callers are meant to
+        return await run_in_threadpool(backend.delete_many, ["b.jpg"])
+
+    assert asyncio.run(from_the_event_loop()) == 1
+    assert backend.files == set()
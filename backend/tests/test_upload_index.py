@@ -0,0 +1,211 @@
+import asyncio
+import hashlib
+import io
+import httpx
+import pytest
+from fastapi import FastAPI
+from PIL import Image
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core import database, storage
+from app.core.config import settings
+from app.core.database import Base
+from app.core.dependencies import get_current_user
+from app.models.gallery_image import GalleryImage
+from app.models.story_image import StoryImage
+from app.models.uploaded_file import UploadedFile
+from app.routers import upload
+from app.services import image_variants, upload_index
+
+
+def _jpeg(color: str) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 48), color).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def memory(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path}/index.db")
+    Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(database, "SessionLocal", sessionmaker(bind=engine))
+    monkeypatch.setattr(settings, "STORAGE_BACKEND", "memory")
+    monkeypatch.setattr(storage, "_backends", {"local": storage.LocalStorage(tmp_path)})
+    monkeypatch.setattr(upload, "UPLOAD_DIR", tmp_path)
+
+    async def generate_in_process(source):
+        return image_variants.build_variants(source)
+
+    monkeypatch.setattr(image_variants, "generate_variants", generate_in_process)
+    yield storage.get_storage()
+    engine.dispose()
+
+
+@pytest.fixture
+def app():
+    app = FastAPI()
+    app.include_router(upload.router)
+    app.dependency_overrides[get_current_user] = lambda: None
+    return app
+
+
+def _post(http: httpx.AsyncClient, data: bytes):
+    return http.post("/api/upload", files={"file": ("photo.jpg", data, "image/jpeg")})
+
+
+def _originals(memory: storage.MemoryStorage):
+    return [name for name in memory.files if not image_variants.VARIANT_NAME.match(name)]
+
+
+def _run(app, requests):
+    async def main():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            return await requests(http)
+    return asyncio.run(main())
+
+
+def test_same_bytes_are_stored_once(memory, app):
+    photo = _jpeg("red")
+
+    async def requests(http):
+        return [await _post(http, photo), await _post(http, photo)]
+
+    first, second = _run(app, requests)
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json()
+    assert _originals(memory) == [first.json()["url"].split("/")[-1]]
+
+
+def test_concurrent_identical_uploads_coalesce(memory, app, monkeypatch):
+    both_arrived = asyncio.Event()
+    arrived = []
+    lookups = []
+    real_publish, real_generate, real_lookup = upload._publish, image_variants.generate_variants, upload_index.lookup
+
+    async def publish(sink, received):
+        arrived.append(received)
+        if len(arrived) == 2:
+            both_arrived.set()
+        return await real_publish(sink, received)
+
+    async def generate(source):
+        # Hold the first upload until the second one is in _publish too
+        await asyncio.wait_for(both_arrived.wait(), 5)
+        return await real_generate(source)
+
+    def lookup(digest):
+        lookups.append(digest)
+        return real_lookup(digest)
+
+    monkeypatch.setattr(upload, "_publish", publish)
+    monkeypatch.setattr(image_variants, "generate_variants", generate)
+    monkeypatch.setattr(upload_index, "lookup", lookup)
+    photo = _jpeg("blue")
+
+    async def requests(http):
+        return await asyncio.gather(_post(http, photo), _post(http, photo))
+
+    first, second = _run(app, requests)
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json()
+    assert len(lookups) == 1
+    assert len(_originals(memory)) == 1
+
+
+def test_record_race_returns_the_winner(memory):
+    winner = {"url": "memory://winner.jpg", "width": 64, "height": 48, "variants": []}
+    loser = {"url": "memory://loser.jpg", "width": 64, "height": 48, "variants": []}
+    digest = "a" * 64
+    assert upload_index.record(digest, "winner.jpg", "image/jpeg", 10, winner)["url"] == winner["url"]
+    # The same bytes stored concurrently: the insert hits the primary key
+    assert upload_index.record(digest, "loser.jpg", "image/jpeg", 10, loser)["url"] == winner["url"]
+    db = database.SessionLocal()
+    try:
+        row = db.get(UploadedFile, digest)
+        assert (row.name, row.last_used_at is not None) == ("winner.jpg", True)
+    finally:
+        db.close()
+
+
+def test_lookup_route_and_delete_forget_the_file(memory, app):
+    photo = _jpeg("green")
+    digest = hashlib.sha256(photo).hexdigest()
+
+    async def flow(http):
+        stored = (await _post(http, photo)).json()
+        found = await http.get(f"/api/upload/sha256/{digest}")
+        name = stored["url"].split("/")[-1]
+        deleted = await http.delete(f"/api/upload/{name}")
+        missing = await http.get(f"/api/upload/sha256/{digest}")
+        return stored, found, name, deleted, missing
+
+    stored, found, name, deleted, missing = _run(app, flow)
+    assert (found.status_code, found.json()) == (200, stored)
+    assert deleted.status_code == 200
+    assert name not in memory.files
+    assert missing.status_code == 404
+    assert upload_index.lookup(digest) is None
+
+
+def test_delete_keeps_a_file_other_rows_still_show(memory, app):
+    photo = _jpeg("purple")
+
+    def batch(http, target):
+        files = {"files": ("photo.jpg", photo, "image/jpeg")}
+        return http.post("/api/upload/batch", files=files, params={"target": target})
+
+    async def flow(http):
+        return [(await batch(http, target)).json() for target in ("gallery", "story")]
+
+    gallery, story = _run(app, flow)
+    url = gallery["results"][0]["url"]
+    assert story["results"][0]["url"] == url
+    name = url.split("/")[-1]
+
+    db = database.SessionLocal()
+    try:
+        db.query(GalleryImage).delete()
+        db.commit()
+        kept = _run(app, lambda http: http.delete(f"/api/upload/{name}"))
+        assert kept.status_code == 200
+        assert name in memory.files
+        assert any(image_variants.is_variant_of(other, name.rsplit(".", 1)[0]) for other in memory.files)
+        assert [image.image_url for image in db.query(StoryImage)] == [url]
+
+        db.query(StoryImage).delete()
+        db.commit()
+        deleted = _run(app, lambda http: http.delete(f"/api/upload/{name}"))
+        assert deleted.status_code == 200
+        assert memory.files == {}
+    finally:
+        db.close()
+
+
+def test_batch_entries_sent_by_digest_reuse_stored_files(memory, app):
+    stored_photo, new_photo = _jpeg("orange"), _jpeg("navy")
+    digest = hashlib.sha256(stored_photo).hexdigest()
+
+    async def flow(http):
+        stored = (await _post(http, stored_photo)).json()
+        found = await http.post("/api/upload/sha256", json=[digest, "b" * 64, "not-a-digest"])
+        parts = [
+            ("sha256", (None, digest)),
+            ("files", ("new.jpg", new_photo, "image/jpeg")),
+            ("sha256", (None, "c" * 64)),
+        ]
+        return stored, found, await http.post("/api/upload/batch", files=parts)
+
+    stored, found, batch = _run(app, flow)
+    assert found.json() == {"known": [digest]}
+    results = batch.json()["results"]
+    assert [result["status_code"] for result in results] == [200, 200, 404]
+    assert results[0]["url"] == stored["url"]
+    assert batch.json()["created"] == 2
+    assert len(_originals(memory)) == 2
+    db = database.SessionLocal()
+    try:
+        rows = db.query(GalleryImage).order_by(GalleryImage.order)
+        assert [row.image_url for row in rows] == [stored["url"], results[1]["url"]]
+    finally:
+        db.close()
@@ -0,0 +1,28 @@
+import pytest
+from app.models.story_image import StoryImage
+from app.models.story_section import StorySection
+from app.routers.upload import _create_rows
+
+
+@pytest.mark.parametrize("with_section", [True, False])
+def test_story_batches_append_after_each_other(db, with_section):
+    section_id = None
+    if with_section:
+        section = StorySection(title="Us")
+        db.add(section)
+        db.commit()
+        section_id = section.id
+    # Images of the other grouping do not affect the order
+    db.add(StoryImage(image_url="/static/uploads/other.jpg", order=7, section_id=None if with_section else 99))
+    db.commit()
+
+    first = _create_rows(db, "story", section_id, ["/static/uploads/a.jpg", "/static/uploads/b.jpg"])
+    second = _create_rows(db, "story", section_id, ["/static/uploads/c.jpg"])
+    assert [row["order"] for row in first + second] == [0, 1, 2]
+    assert {row["section_id"] for row in first + second} == {section_id}
+
+
+def test_gallery_batches_append_after_each_other(db):
+    _create_rows(db, "gallery", None, ["/static/uploads/a.jpg"])
+    second = _create_rows(db, "gallery", None, ["/static/uploads/b.jpg", "/static/uploads/c.jpg"])
+    assert [row["order"] for row in second] == [1, 2]
@@ -0,0 +1,105 @@
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+from app.services.upload_stream import UploadRejected, receive_image, sniff_image_type, stream_images
+
+JPEG = b"\xff\xd8\xff\xe0" + b"\x00" * 5000
+
+
+class MemorySink:
+    def __init__(self):
+        self.chunks = []
+
+    async def open(self, image):
+        self.image = image
+
+    async def write(self, chunk):
+        self.chunks.append(chunk)
+
+    async def finish(self):
+        pass
+
+
+def _client(max_bytes):
+    app = FastAPI()
+    sinks = []
+
+    @app.post("/upload")
+    async def upload(request: Request):
+        sink = MemorySink()
+        sinks.append(sink)
+        try:
+            image = await receive_image(request, sink, max_bytes, {".jpg"})
+        except UploadRejected as e:
+            raise HTTPException(status_code=e.status_code, detail=e.detail)
+        return {"type": image.content_type, "size": image.size}
+
+    return TestClient(app), sinks
+
+
+def test_sniff_image_type():
+    assert sniff_image_type(JPEG) == ("image/jpeg", ".jpg")
+    assert sniff_image_type(b"RIFF\x00\x00\x00\x00WEBPVP8 ") == ("image/webp", ".webp")
+    assert sniff_image_type(b"<svg xmlns=") is None
+
+
+def test_streams_file_part_and_enforces_limits():
+    client, sinks = _client(max_bytes=10_000)
+    r = client.post("/upload", data={"note": "x"}, files={"file": ("a.jpg", JPEG, "image/jpeg")})
+    assert r.json() == {"type": "image/jpeg", "size": len(JPEG)}
+    assert b"".join(sinks[-1].chunks) == JPEG
+
+    assert client.post("/upload", files={"file": ("a.jpg", b"GIF89a" + b"0" * 10, "image/jpeg")}).status_code == 200
+    assert client.post("/upload", files={"file": ("a.jpg", b"not an image!", "image/jpeg")}).status_code == 400
+    assert client.post("/upload", files={"file": ("a.png", JPEG, "image/png")}).status_code == 400
+
+    big = JPEG * 3
+    r = client.post("/upload", files={"file": ("a.jpg", big, "image/jpeg")})
+    assert r.status_code == 413
+
+
+def test_declared_length_rejected_before_reading():
+    client, sinks = _client(max_bytes=10_000)
+
+    def body():
+        raise AssertionError("body should not be read")
+        yield b""
+
+    r = client.post(
+        "/upload",
+        content=body(),
+        headers={"Content-Type": "multipart/form-data; boundary=x", "Content-Length": str(10**9)},
+    )
+    assert r.status_code == 413
+    assert sinks[-1].chunks == []
+
+
+def test_batch_streams_each_file_and_reports_per_file_errors():
+    app = FastAPI()
+
+    @app.post("/batch")
+    async def batch(request: Request):
+        results = []
+        try:
+            async for filename, sink, image in stream_images(
+                request, MemorySink, 10_000, {".jpg"}, max_files=4, max_body=100_000
+            ):
+                if isinstance(image, UploadRejected):
+                    results.append([filename, image.status_code])
+                else:
+                    results.append([filename, len(b"".join(sink.chunks))])
+        except UploadRejected as e:
+            raise HTTPException(status_code=e.status_code, detail=e.detail)
+        return results
+
+    client = TestClient(app)
+    files = [
+        ("files", ("a.jpg", JPEG, "image/jpeg")),
+        ("files", ("b.png", JPEG, "image/png")),
+        ("files", ("c.jpg", JPEG * 3, "image/jpeg")),
+        ("files", ("d.jpg", JPEG[:100], "image/jpeg")),
+    ]
+    r = client.post("/batch", files=files)
+    assert r.json() == [["a.jpg", len(JPEG)], ["b.png", 400], ["c.jpg", 413], ["d.jpg", 100]]
+
+    assert client.post("/batch", files=files + files[:1]).status_code == 400
+    assert client.post("/batch", data={"note": "x"}, files={"other": ("a.jpg", JPEG)}).status_code == 400
@@ -5,6 +5,7 @@ import {
   createGalleryImage,
   deleteGalleryImage,
   uploadFile,
+  uploadBatch,
   reorderGalleryImages,
 } from '../../services/content'
 import { Plus, Trash2, Upload, Save, X, Image as ImageIcon, CheckCircle2, AlertCircle, GripVertical } from 'lucide-react'
@@ -107,6 +108,26 @@ const GalleryTab = () => {
     }
   }
 
+  const handleBatchUpload = async (e) => {
+    const files = Array.from(e.target.files || [])
+    e.target.value = ''
+    if (!files.length) return
+    setUploading(true)
+    try {
+      const response = await uploadBatch(files)
+      const failed = response.data.results.filter((r) => r.status_code !== 200)
+      if (failed.length) {
+        alert(`Some images were not uploaded:\n${failed.map((r) => `${r.filename}: ${r.detail}`).join('\n')}`)
+      }
+      fetchData()
+    } catch (error) {
+      console.error('Error uploading images:', error)
+      alert('Error uploading images')
+    } finally {
+      setUploading(false)
+    }
+  }
+
   if (loading) return <div>Loading...</div>
 
   return (
@@ -119,13 +140,29 @@ const GalleryTab = () => {
             Maximum 5MB per image. Images will be uploaded to Azure Blob Storage.
           </p>
         </div>
-        <button
-          onClick={() => setShowForm(true)}
-          className="flex items-center gap-2 px-4 py-2 bg-gold/20 text-gold rounded-lg hover:bg-gold/30 transition-colors"
-        >
-          <Plus size={20} />
-          Add Image
-        </button>
+        <div className="flex gap-2">
+          <label
+            className={`flex items-center gap-2 px-4 py-2 bg-gold/20 text-gold rounded-lg hover:bg-gold/30 transition-colors ${uploading ? 'opacity-50 pointer-events-none' : 'cursor-pointer'}`}
+          >
+            <Upload size={20} className={uploading ? 'animate-pulse' : ''} />
+            {uploading ? 'Uploading...' : 'Upload Many'}
+            <input
+              type="file"
+              accept="image/*"
+              multiple
+              className="hidden"
+              onChange={handleBatchUpload}
+              disabled={uploading}
+            />
+          </label>
+          <button
+            onClick={() => setShowForm(true)}
+            className="flex items-center gap-2 px-4 py-2 bg-gold/20 text-gold rounded-lg hover:bg-gold/30 transition-colors"
+          >
+            <Plus size={20} />
+            Add Image
+          </button>
+        </div>
       </div>
 
       {showForm && (
@@ -2,6 +2,8 @@ import { useState } from 'react'
 import { motion, AnimatePresence } from 'framer-motion'
 import Lightbox from './Lightbox'
 import { normalizeImageUrl } from '../utils/imageUrl'
+import { placeholderStyle } from '../utils/placeholder'
+import { sizeAttributes } from '../utils/imageSize'
 
 const GalleryGrid = ({ images }) => {
   const [selectedImage, setSelectedImage] = useState(null)
@@ -27,10 +29,16 @@ const GalleryGrid = ({ images }) => {
             className="cursor-pointer group"
             onClick={() => setSelectedImage(index)}
           >
-            <div className="relative overflow-hidden rounded-2xl shadow-lg hover:shadow-2xl transition-all duration-300 aspect-[4/3] bg-black/5">
+            <div
+              className="relative overflow-hidden rounded-2xl shadow-lg hover:shadow-2xl transition-all duration-300 aspect-[4/3] bg-black/5"
+              style={placeholderStyle(image)}
+            >
               <img
                 src={normalizeImageUrl(image.image_url)}
                 alt={image.caption || 'Gallery image'}
+                {...sizeAttributes(image.width, image.height)}
+                loading="lazy"
+                decoding="async"
                 className="absolute inset-0 w-full h-full object-cover transition-transform duration-500 ease-out group-hover:scale-105"
                 onError={(e) => {
                   console.error('Image failed to load:', image.image_url)
@@ -2,6 +2,8 @@ import { useState, useEffect } from 'react'
 import { motion, AnimatePresence } from 'framer-motion'
 import { X, ChevronLeft, ChevronRight } from 'lucide-react'
 import { normalizeImageUrl } from '../utils/imageUrl'
+import { placeholderStyle } from '../utils/placeholder'
+import { sizeAttributes } from '../utils/imageSize'
 
 const Lightbox = ({ images, initialIndex, onClose }) => {
   const [currentIndex, setCurrentIndex] = useState(initialIndex)
@@ -48,9 +50,12 @@ const Lightbox = ({ images, initialIndex, onClose }) => {
           onClick={(e) => e.stopPropagation()}
         >
           <img
+            key={currentImage.image_url}
             src={normalizeImageUrl(currentImage.image_url)}
             alt={currentImage.caption || 'Gallery image'}
+            {...sizeAttributes(currentImage.width, currentImage.height)}
             className="max-h-[90vh] w-auto rounded-lg shadow-2xl"
+            style={placeholderStyle(currentImage)}
             onError={(e) => {
               console.error('Image failed to load:', currentImage.image_url)
             }}
@@ -1,5 +1,6 @@
 import { createContext, useContext, useState, useEffect } from 'react'
 import { getHomeContent } from '../services/content'
+import { takeBootstrap } from '../services/bootstrap'
 
 const CARD_BG_DEFAULT = '#F5E6D3' // champagne
 
@@ -53,33 +54,40 @@ const setCssVariables = (theme) => {
   root.style.setProperty('--theme-card-bg-rsvp', theme.cardBgRsvp || CARD_BG_DEFAULT)
 }
 
+const toTheme = (data) => ({
+  textColor: data.text_color ?? DEFAULTS.textColor,
+  navbarColor: data.navbar_color ?? DEFAULTS.navbarColor,
+  navbarTextColor: data.navbar_text_color ?? DEFAULTS.navbarTextColor,
+  logoTextColor: data.logo_text_color ?? DEFAULTS.logoTextColor,
+  accentColor: data.accent_color ?? DEFAULTS.accentColor,
+  bodyBgColor: data.body_bg_color ?? DEFAULTS.bodyBgColor,
+  bodyHeadingColor: data.body_heading_color ?? DEFAULTS.bodyHeadingColor,
+  bodyTextColor: data.body_text_color ?? DEFAULTS.bodyTextColor,
+  footerBgColor: data.footer_bg_color ?? DEFAULTS.footerBgColor,
+  footerTextColor: data.footer_text_color ?? DEFAULTS.footerTextColor,
+  cardBgTimeline: data.card_bg_timeline ?? CARD_BG_DEFAULT,
+  cardBgInfo: data.card_bg_info ?? CARD_BG_DEFAULT,
+  cardBgRsvp: data.card_bg_rsvp ?? CARD_BG_DEFAULT,
+})
+
+const toHeroContent = (data) => ({
+  heroText: data.hero_text ?? HERO_DEFAULTS.heroText,
+  heroImageUrl: data.hero_image_url ?? HERO_DEFAULTS.heroImageUrl,
+  subtitle: data.subtitle ?? HERO_DEFAULTS.subtitle,
+  weddingDate: data.wedding_date ?? HERO_DEFAULTS.weddingDate,
+})
+
+// Home content inlined into index.html: apply it before the first render
+const bootHome = takeBootstrap('home')
+if (bootHome) setCssVariables(toTheme(bootHome))
+
 const fetchAndApply = async (setTheme, setHeroContent, setLoading) => {
   try {
     const response = await getHomeContent()
-    const data = response.data
-    const next = {
-      textColor: data.text_color ?? DEFAULTS.textColor,
-      navbarColor: data.navbar_color ?? DEFAULTS.navbarColor,
-      navbarTextColor: data.navbar_text_color ?? DEFAULTS.navbarTextColor,
-      logoTextColor: data.logo_text_color ?? DEFAULTS.logoTextColor,
-      accentColor: data.accent_color ?? DEFAULTS.accentColor,
-      bodyBgColor: data.body_bg_color ?? DEFAULTS.bodyBgColor,
-      bodyHeadingColor: data.body_heading_color ?? DEFAULTS.bodyHeadingColor,
-      bodyTextColor: data.body_text_color ?? DEFAULTS.bodyTextColor,
-      footerBgColor: data.footer_bg_color ?? DEFAULTS.footerBgColor,
-      footerTextColor: data.footer_text_color ?? DEFAULTS.footerTextColor,
-      cardBgTimeline: data.card_bg_timeline ?? CARD_BG_DEFAULT,
-      cardBgInfo: data.card_bg_info ?? CARD_BG_DEFAULT,
-      cardBgRsvp: data.card_bg_rsvp ?? CARD_BG_DEFAULT,
-    }
+    const next = toTheme(response.data)
     setTheme(next)
     setCssVariables(next)
-    setHeroContent({
-      heroText: data.hero_text ?? HERO_DEFAULTS.heroText,
-      heroImageUrl: data.hero_image_url ?? HERO_DEFAULTS.heroImageUrl,
-      subtitle: data.subtitle ?? HERO_DEFAULTS.subtitle,
-      weddingDate: data.wedding_date ?? HERO_DEFAULTS.weddingDate,
-    })
+    setHeroContent(toHeroContent(response.data))
   } catch (error) {
     console.error('Error fetching theme:', error)
     setCssVariables(DEFAULTS)
@@ -89,14 +97,14 @@ const fetchAndApply = async (setTheme, setHeroContent, setLoading) => {
 }
 
 export const ThemeProvider = ({ children }) => {
-  const [theme, setTheme] = useState(DEFAULTS)
-  const [heroContent, setHeroContent] = useState(HERO_DEFAULTS)
-  const [loading, setLoading] = useState(true)
+  const [theme, setTheme] = useState(() => (bootHome ? toTheme(bootHome) : DEFAULTS))
+  const [heroContent, setHeroContent] = useState(() => (bootHome ? toHeroContent(bootHome) : HERO_DEFAULTS))
+  const [loading, setLoading] = useState(!bootHome)
 
   const refreshTheme = () => fetchAndApply(setTheme, setHeroContent, null)
 
   useEffect(() => {
-    fetchAndApply(setTheme, setHeroContent, setLoading)
+    if (!bootHome) fetchAndApply(setTheme, setHeroContent, setLoading)
   }, [])
 
   // Keep CSS variables in sync when theme updates (e.g. after admin save from another tab)
@@ -5,6 +5,8 @@ import BlockColorEdit from '../components/BlockColorEdit'
 import Lightbox from '../components/Lightbox'
 import { getInfoSections } from '../services/content'
 import { normalizeImageUrl } from '../utils/imageUrl'
+import { placeholderStyle, sectionPlaceholder } from '../utils/placeholder'
+import { sectionImageSize } from '../utils/imageSize'
 import {
   Calendar, MapPin, Shirt, Car, Hotel, Heart, Cake, Music,
   UtensilsCrossed, Clock, Gift, Camera, Users, Home, Navigation,
@@ -76,9 +78,13 @@ const InfoPage = () => {
     fetchData()
   }, [])
 
-  const openDressCodeLightbox = (galleryUrls, index) => {
+  const openDressCodeLightbox = (section, galleryUrls, index) => {
     const images = Array.isArray(galleryUrls) ? galleryUrls : []
-    setLightboxImages(images.map((url) => ({ image_url: url })))
+    setLightboxImages(images.map((url) => ({
+      image_url: url,
+      ...sectionPlaceholder(section, url),
+      ...sectionImageSize(section, url),
+    })))
     setLightboxIndex(index)
     setLightboxOpen(true)
   }
@@ -129,8 +135,9 @@ const InfoPage = () => {
                       <button
                         key={`${url}-${index}`}
                         type="button"
-                        onClick={() => openDressCodeLightbox(galleryUrls, index)}
+                        onClick={() => openDressCodeLightbox(section, galleryUrls, index)}
                         className="aspect-square w-full rounded-lg overflow-hidden border-2 border-gold/40 shadow-md hover:shadow-lg hover:scale-105 transition-all focus:outline-none focus:ring-2 focus:ring-gold/50"
+                        style={placeholderStyle(sectionPlaceholder(section, url))}
                       >
                         <img
                           src={normalizeImageUrl(url)}
@@ -2,6 +2,8 @@ import { useState, useEffect } from 'react'
 import { motion } from 'framer-motion'
 import { getStorySections, getStoryImages } from '../services/content'
 import { normalizeImageUrl } from '../utils/imageUrl'
+import { placeholderStyle } from '../utils/placeholder'
+import { sizeAttributes } from '../utils/imageSize'
 
 const StoryPage = () => {
   const [sections, setSections] = useState([])
@@ -78,6 +80,9 @@ const StoryPage = () => {
                         <img
                           src={normalizeImageUrl(image.image_url)}
                           alt={image.caption || 'Story image'}
+                          {...sizeAttributes(image.width, image.height)}
+                          loading="lazy"
+                          style={placeholderStyle(image)}
                           className="w-full h-auto block min-w-0"
                           onError={(e) => { e.target.style.display = 'none' }}
                         />
@@ -113,6 +118,9 @@ const StoryPage = () => {
                     <img
                       src={normalizeImageUrl(image.image_url)}
                       alt={image.caption || 'Story image'}
+                      {...sizeAttributes(image.width, image.height)}
+                      loading="lazy"
+                      style={placeholderStyle(image)}
                       className="w-full h-auto block"
                       onError={(e) => { e.target.style.display = 'none' }}
                     />
@@ -1,4 +1,5 @@
 import axios from 'axios'
+import { discardBootstrap } from './bootstrap'
 
 // Se VITE_API_URL estiver definida, usa ela. Senão, usa o mesmo domínio (produção)
 const API_BASE_URL = import.meta.env.VITE_API_URL || ''
@@ -16,6 +17,9 @@ api.interceptors.request.use((config) => {
   if (token) {
     config.headers.Authorization = `Bearer ${token}`
   }
+  if (config.method && config.method.toLowerCase() !== 'get') {
+    discardBootstrap()
+  }
   return config
 })
 
@@ -0,0 +1,37 @@
+// Public site content inlined into index.html by the backend
+// (<script id="site-bootstrap">), so the first render needs no API calls.
+let bootstrap
+
+const load = () => {
+  if (bootstrap === undefined) {
+    const el = document.getElementById('site-bootstrap')
+    try {
+      bootstrap = el ? JSON.parse(el.textContent) : null
+    } catch (error) {
+      console.error('Error reading bootstrap data:', error)
+      bootstrap = null
+    }
+  }
+  return bootstrap
+}
+
+// Each section is handed out once: it is only current as of page load, so
+// later calls (e.g. after an admin edit) fall through to the API.
+export const takeBootstrap = (key) => {
+  const data = load()
+  if (!data || data[key] == null) return null
+  const value = data[key]
+  delete data[key]
+  return value
+}
+
+// Wrap a GET so its first call resolves from the bootstrap data when present
+export const withBootstrap = (key, request) => (...args) => {
+  const data = takeBootstrap(key)
+  return data != null ? Promise.resolve({ data }) : request(...args)
+}
+
+// Any write makes the inlined data stale
+export const discardBootstrap = () => {
+  bootstrap = null
+}
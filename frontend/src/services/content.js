@@ -1,45 +1,49 @@
 import api from './api'
+import { withBootstrap } from './bootstrap'
+
+// Aggregated public content (home, story, info, timeline, gallery, gifts) in one request
+export const getSiteContent = () => api.get('/api/site')
 
 // Home Content
-export const getHomeContent = () => api.get('/api/home')
+export const getHomeContent = withBootstrap('home', () => api.get('/api/home'))
 export const updateHomeContent = (data) => api.put('/api/home', data)
 
 // Story
-export const getStorySections = () => api.get('/api/story/sections')
+export const getStorySections = withBootstrap('story_sections', () => api.get('/api/story/sections'))
 export const createStorySection = (data) => api.post('/api/story/sections', data)
 export const updateStorySection = (id, data) => api.put(`/api/story/sections/${id}`, data)
 export const deleteStorySection = (id) => api.delete(`/api/story/sections/${id}`)
 export const reorderStorySections = (sectionIds) => api.put('/api/story/sections/reorder', sectionIds)
 
-export const getStoryImages = () => api.get('/api/story/images')
+export const getStoryImages = withBootstrap('story_images', () => api.get('/api/story/images'))
 export const createStoryImage = (data) => api.post('/api/story/images', data)
 export const updateStoryImage = (id, data) => api.put(`/api/story/images/${id}`, data)
 export const deleteStoryImage = (id) => api.delete(`/api/story/images/${id}`)
 export const reorderStoryImages = (imageIds) => api.put('/api/story/images/reorder', imageIds)
 
 // Wedding Info
-export const getInfoSections = () => api.get('/api/info')
+export const getInfoSections = withBootstrap('info_sections', () => api.get('/api/info'))
 export const createInfoSection = (data) => api.post('/api/info', data)
 export const updateInfoSection = (id, data) => api.put(`/api/info/${id}`, data)
 export const deleteInfoSection = (id) => api.delete(`/api/info/${id}`)
 export const reorderInfoSections = (sectionIds) => api.put('/api/info/reorder', sectionIds)
 
 // Timeline
-export const getTimelineEvents = () => api.get('/api/timeline')
+export const getTimelineEvents = withBootstrap('timeline_events', () => api.get('/api/timeline'))
 export const createTimelineEvent = (data) => api.post('/api/timeline', data)
 export const updateTimelineEvent = (id, data) => api.put(`/api/timeline/${id}`, data)
 export const deleteTimelineEvent = (id) => api.delete(`/api/timeline/${id}`)
 export const reorderTimelineEvents = (eventIds) => api.put('/api/timeline/reorder', eventIds)
 
 // Gallery
-export const getGalleryImages = () => api.get('/api/gallery')
+export const getGalleryImages = withBootstrap('gallery_images', () => api.get('/api/gallery'))
 export const createGalleryImage = (data) => api.post('/api/gallery', data)
 export const updateGalleryImage = (id, data) => api.put(`/api/gallery/${id}`, data)
 export const deleteGalleryImage = (id) => api.delete(`/api/gallery/${id}`)
 export const reorderGalleryImages = (imageIds) => api.put('/api/gallery/reorder', imageIds)
 
 // Gifts
-export const getGiftItems = () => api.get('/api/gifts')
+export const getGiftItems = withBootstrap('gift_items', () => api.get('/api/gifts'))
 export const createGiftItem = (data) => api.post('/api/gifts', data)
 export const updateGiftItem = (id, data) => api.put(`/api/gifts/${id}`, data)
 export const deleteGiftItem = (id) => api.delete(`/api/gifts/${id}`)
@@ -57,8 +61,24 @@ export const replaceGuestInvitations = (data) =>
   api.put('/api/guest-invitations/admin/replace-all', data)
 export const getGuestInvitations = () => api.get('/api/guest-invitations/admin/all')
 
+// SHA-256 of a file as hex (null where Web Crypto is unavailable, e.g. plain http)
+const sha256Hex = async (file) => {
+  if (!window.crypto?.subtle || !file.arrayBuffer) return null
+  const digest = await window.crypto.subtle.digest('SHA-256', await file.arrayBuffer())
+  return Array.from(new Uint8Array(digest), (b) => b.toString(16).padStart(2, '0')).join('')
+}
+
 // Upload (auth required: ensure Bearer token is always sent)
-export const uploadFile = (file) => {
+// Files the server already has are not sent again
+export const uploadFile = async (file) => {
+  const digest = await sha256Hex(file).catch(() => null)
+  if (digest) {
+    try {
+      return await api.get(`/api/upload/sha256/${digest}`)
+    } catch (error) {
+      if (error.response?.status !== 404) console.warn('Upload lookup failed:', error)
+    }
+  }
   const formData = new FormData()
   formData.append('file', file)
   const token = localStorage.getItem('token')
@@ -71,6 +91,47 @@ export const uploadFile = (file) => {
   return api.post('/api/upload', formData, { headers })
 }
 
+// Digests of files, and which of them the server has (empty if the lookup fails)
+const knownDigests = async (files) => {
+  // One at a time, so only one file is held in memory
+  const digests = []
+  for (const file of files) digests.push(await sha256Hex(file).catch(() => null))
+  const wanted = digests.filter(Boolean)
+  if (!wanted.length) return { digests, known: new Set() }
+  try {
+    const response = await api.post('/api/upload/sha256', wanted)
+    return { digests, known: new Set(response.data.known) }
+  } catch (error) {
+    console.warn('Upload lookup failed:', error)
+    return { digests, known: new Set() }
+  }
+}
+
+// Many files at once; rows are added to the gallery (or a story section,
+// with { target: 'story', section_id }) and results come back per file.
+// Files the server already has are sent by digest instead of in full
+export const uploadBatch = async (files, params = {}) => {
+  const { digests, known } = await knownDigests(files)
+  const formData = new FormData()
+  files.forEach((file, i) => {
+    if (known.has(digests[i])) formData.append('sha256', digests[i])
+    else formData.append('files', file)
+  })
+  const token = localStorage.getItem('token')
+  const headers = {
+    'Content-Type': 'multipart/form-data',
+  }
+  if (token) {
+    headers.Authorization = `Bearer ${token}`
+  }
+  const response = await api.post('/api/upload/batch', formData, { headers, params })
+  // Entries sent by digest come back named by it
+  response.data.results.forEach((result, i) => {
+    result.filename = files[i].name
+  })
+  return response
+}
+
 export const deleteFile = (filename) => api.delete(`/api/upload/${filename}`)
 
 // Seed Data
@@ -0,0 +1,12 @@
+/**
+ * width/height attributes for an <img> from the stored pixel size, so the
+ * browser reserves the right space before the image downloads
+ */
+export const sizeAttributes = (width, height) =>
+  width && height ? { width, height } : {}
+
+/** Pixel size of one URL of an info section ({ url: [width, height] }) */
+export const sectionImageSize = (section, url) => {
+  const size = section?.image_sizes && section.image_sizes[url]
+  return size ? { width: size[0], height: size[1] } : {}
+}
@@ -0,0 +1,20 @@
+/**
+ * Background style showing an image's placeholder until it loads:
+ * its dominant colour, with the tiny blurred preview on top
+ * (placeholder and dominant_color come from the API).
+ */
+export const placeholderStyle = (image) => {
+  if (!image) return undefined
+  const style = {}
+  if (image.dominant_color) style.backgroundColor = image.dominant_color
+  if (image.placeholder) {
+    style.backgroundImage = `url("${image.placeholder}")`
+    style.backgroundSize = 'cover'
+    style.backgroundPosition = 'center'
+  }
+  return style
+}
+
+/** Placeholder of one URL of an info section ({ url: { placeholder, dominant_color } }) */
+export const sectionPlaceholder = (section, url) =>
+  (section?.image_placeholders && section.image_placeholders[url]) || undefined